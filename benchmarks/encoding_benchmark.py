@@ -0,0 +1,86 @@
+"""
+Measures action throughput between the engine and a local runner returning 1 MB responses with each runner encoding
+
+Usage:
+    python benchmarks/encoding_benchmark.py
+"""
+import time
+from concurrent import futures
+from unittest.mock import patch
+
+import grpc
+
+from cicada2.engine import messaging
+from cicada2.protos import runner_pb2, runner_pb2_grpc
+from cicada2.shared.encoding import (
+    ENCODINGS,
+    SUPPORTED_ENCODINGS,
+    create_action_reply,
+)
+
+
+# Roughly 1 MB when encoded as JSON, similar to a large REST response body
+RESPONSE = {
+    "status_code": 200,
+    "headers": {"Content-Type": "application/json"},
+    "body": [
+        {
+            "id": i,
+            "name": f"member-{i}",
+            "email": f"member-{i}@example.com",
+            "score": i * 0.5,
+            "active": i % 2 == 0,
+            "tags": ["new", "gold"],
+        }
+        for i in range(8500)
+    ],
+}
+
+
+class BenchmarkRunnerServer(runner_pb2_grpc.RunnerServicer):
+    def Action(self, request, context):
+        return create_action_reply(RESPONSE, request.encoding)
+
+    def Healthcheck(self, request, context):
+        return runner_pb2.HealthcheckReply(ready=True, encodings=SUPPORTED_ENCODINGS)
+
+
+def time_actions(runner_address: str, encoding: str, number: int) -> float:
+    with patch("cicada2.engine.messaging.RUNNER_ENCODING", encoding):
+        messaging.runner_healthcheck(runner_address)
+
+    with messaging.get_action_sender(runner_address) as send_action:
+        start = time.perf_counter()
+
+        for _ in range(number):
+            send_action({"type": "GET", "params": {}})
+
+        return (time.perf_counter() - start) / number
+
+
+def main(number: int = 50):
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=1),
+        options=[("grpc.max_send_message_length", -1)],
+    )
+    runner_pb2_grpc.add_RunnerServicer_to_server(BenchmarkRunnerServer(), server)
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+
+    runner_address = f"localhost:{port}"
+
+    for encoding in ["json", "msgpack", "struct"]:
+        reply_size = create_action_reply(RESPONSE, ENCODINGS[encoding]).ByteSize()
+        action_time = time_actions(runner_address, encoding, number)
+
+        print(
+            f"{encoding:<8} {reply_size / 1e6:.2f} MB reply: {action_time * 1000:.2f} ms "
+            f"per action ({1 / action_time:.1f} actions/s)"
+        )
+
+    messaging.close_channel(runner_address)
+    server.stop(None)
+
+
+if __name__ == "__main__":
+    main()
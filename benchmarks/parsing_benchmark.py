@@ -0,0 +1,109 @@
+"""
+Measures render_section on a realistic action with nested params
+
+Usage:
+    python benchmarks/parsing_benchmark.py
+"""
+import timeit
+from unittest.mock import patch
+
+import jinja2
+
+from cicada2.engine import parsing
+
+
+ACTION = {
+    "type": "POST",
+    "name": "create_member",
+    "executionsPerCycle": 10,
+    "params": {
+        "url": "http://api:8080/members",
+        "headers": {
+            "Content-Type": "application/json",
+            "Authorization": "Bearer {{ state['globals']['token'] }}",
+        },
+        "body": {
+            "name": "member-{{ state['globals']['index'] }}",
+            "email": "member-{{ state['globals']['index'] }}@example.com",
+            "address": {
+                "street": "123 Main St",
+                "city": "Springfield",
+                "tags": ["new", "{{ state['globals']['tier'] }}"],
+            },
+        },
+    },
+    "asserts": [
+        {
+            "type": "StatusCode",
+            "template": "expected: {{ 200 if state['globals']['tier'] else 201 }}",
+        }
+    ],
+    "outputs": [{"name": "id", "template": "value: {{ results[-1]['body']['id'] }}"}],
+}
+
+STATE = {
+    "globals": {"token": "abc123", "index": 42, "tier": "gold"},
+    "payload": [
+        {"id": i, "name": f"member-{i}", "tags": ["new", "gold"], "active": True}
+        for i in range(1000)
+    ],
+}
+
+PAYLOAD_ACTION = {
+    "type": "POST",
+    "params": {"url": "http://api:8080/members", "body": "{{ state['payload'] }}"},
+}
+
+
+def compile_uncached(template_string):
+    # Previous behavior, creating an environment and compiling each template on every render
+    return jinja2.Environment(
+        loader=jinja2.BaseLoader, extensions=["jinja2.ext.do"]
+    ).from_string(template_string)
+
+
+def time_render(number: int, action: dict = None) -> float:
+    action = action or ACTION
+
+    return (
+        timeit.timeit(lambda: parsing.render_section(action, STATE), number=number)
+        / number
+    )
+
+
+def main(number: int = 1000):
+    with patch("cicada2.engine.parsing.compile_template", compile_uncached):
+        uncached_time = time_render(number)
+
+    parsing.compile_template.cache_clear()
+    cached_time = time_render(number)
+    static_time = time_render(number, parsing.mark_static_sections(ACTION))
+
+    print(f"uncached: {uncached_time * 1000:.3f} ms per render")
+    print(
+        f"cached: {cached_time * 1000:.3f} ms per render "
+        f"({uncached_time / cached_time:.1f}x)"
+    )
+    print(
+        f"cached with static sections marked: {static_time * 1000:.3f} ms per render "
+        f"({uncached_time / static_time:.1f}x)"
+    )
+    print(parsing.get_template_cache_info())
+
+    payload_number = max(number // 100, 1)
+
+    with patch("cicada2.engine.parsing.TEMPLATE_MODE", "yaml"):
+        yaml_time = time_render(payload_number, PAYLOAD_ACTION)
+
+    with patch("cicada2.engine.parsing.TEMPLATE_MODE", "native"):
+        native_time = time_render(payload_number, PAYLOAD_ACTION)
+
+    print(f"1000 item payload, yaml mode: {yaml_time * 1000:.3f} ms per render")
+    print(
+        f"1000 item payload, native mode: {native_time * 1000:.3f} ms per render "
+        f"({yaml_time / native_time:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
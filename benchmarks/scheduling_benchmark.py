@@ -0,0 +1,111 @@
+"""
+Compares wall time of the event driven test scheduler against the previous 1 second polling loop on synthetic
+dependency graphs
+
+Usage:
+    python benchmarks/scheduling_benchmark.py
+"""
+import random
+import time
+from typing import Callable, Dict, List
+
+from dask.distributed import Client, Future
+
+from cicada2.engine import scheduling
+
+
+def create_runner(test_name: str, seconds: float) -> Callable[[dict], dict]:
+    def runner(state):
+        time.sleep(seconds)
+
+        return {
+            **state,
+            test_name: {"summary": {"error": None, "remaining_asserts": []}},
+        }
+
+    return runner
+
+
+def chain_dag(size: int) -> Dict[str, List[str]]:
+    return {f"test-{i}": [f"test-{i - 1}"] if i else [] for i in range(size)}
+
+
+def fan_out_dag(size: int) -> Dict[str, List[str]]:
+    return {f"test-{i}": ["test-0"] if i else [] for i in range(size)}
+
+
+def random_dag(size: int, max_dependencies: int = 3) -> Dict[str, List[str]]:
+    rand = random.Random(size)
+
+    return {
+        f"test-{i}": [
+            f"test-{dep}"
+            for dep in rand.sample(range(i), min(i, rand.randint(0, max_dependencies)))
+        ]
+        for i in range(size)
+    }
+
+
+def poll_tests(
+    client: Client,
+    test_configs: dict,
+    test_runners: dict,
+    test_dependencies: Dict[str, List[str]],
+    initial_state: dict,
+) -> Dict[str, Future]:
+    # Reference copy of the polling loop previously used in run_tests
+    test_statuses: Dict[str, Future] = {test_name: None for test_name in test_runners}
+
+    while not scheduling.all_tests_finished(test_statuses):
+        for test_name in test_statuses:
+            if scheduling.test_is_ready(test_name, test_statuses, test_dependencies):
+                test_statuses[test_name] = scheduling.submit_test(
+                    client,
+                    test_name,
+                    test_configs,
+                    test_runners,
+                    test_dependencies,
+                    test_statuses,
+                    initial_state,
+                )
+
+        time.sleep(1)
+
+    return test_statuses
+
+
+def time_schedule(schedule_fn, client: Client, dag: Dict[str, List[str]]) -> float:
+    test_configs = {test_name: {"name": test_name} for test_name in dag}
+    test_runners = {test_name: create_runner(test_name, 0.05) for test_name in dag}
+
+    start = time.perf_counter()
+    test_statuses = schedule_fn(client, test_configs, test_runners, dag, {})
+
+    for test_future in test_statuses.values():
+        test_future.result()
+
+    return time.perf_counter() - start
+
+
+def main():
+    client = Client(processes=False)
+
+    dags = {
+        "chain (10 tests)": chain_dag(10),
+        "fan out (100 tests)": fan_out_dag(100),
+        "random (100 tests)": random_dag(100),
+    }
+
+    print(f"{'DAG':<24}{'polling (s)':>14}{'event driven (s)':>20}")
+
+    for dag_name, dag in dags.items():
+        polling_time = time_schedule(poll_tests, client, dag)
+        event_time = time_schedule(scheduling.schedule_tests, client, dag)
+
+        print(f"{dag_name:<24}{polling_time:>14.2f}{event_time:>20.2f}")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
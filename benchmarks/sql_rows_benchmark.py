@@ -0,0 +1,94 @@
+"""
+Compares the hash indexed ContainsRows and unordered EqualsRows matching in the SQL runner against the previous
+nested loop matching, using synthetic result sets of up to 100k rows
+
+Usage:
+    python benchmarks/sql_rows_benchmark.py
+"""
+import random
+import time
+from typing import List, Tuple
+
+from cicada2.runners.sql_runner import runner
+from cicada2.shared.asserts import assert_dicts
+
+
+def create_rows(count: int) -> List[dict]:
+    return [
+        {"id": i, "name": f"member-{i}", "email": f"member-{i}@example.com"}
+        for i in range(count)
+    ]
+
+
+def nested_loop_contains_rows(
+    expected_rows: List[dict], actual_rows: List[dict]
+) -> Tuple[bool, str]:
+    # Reference copy of the previous contains_rows
+    remaining_rows = expected_rows[:]
+
+    for actual_row in actual_rows:
+        for i, expected_row in enumerate(remaining_rows):
+            row_matches, _ = assert_dicts(expected_row, actual_row, all_required=False)
+
+            if row_matches:
+                del remaining_rows[i]
+
+    return not remaining_rows, ""
+
+
+def time_fn(fn, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    passed, _ = fn(*args, **kwargs)
+    runtime = time.perf_counter() - start
+
+    assert passed
+
+    return runtime
+
+
+def main():
+    actual_rows = create_rows(100_000)
+    shuffled_rows = actual_rows[:]
+    random.Random(0).shuffle(shuffled_rows)
+
+    print(
+        f"{'expected rows':<16}{'actual rows':>12}{'nested loop (s)':>18}{'indexed (s)':>14}"
+    )
+
+    for expected_count, nested_loop_actual_count in [
+        (100, 100_000),
+        (1_000, 10_000),
+        (100_000, None),
+    ]:
+        # Match on a subset of columns, like a typical ContainsRows assert
+        expected_rows = [
+            {"id": row["id"], "name": row["name"]}
+            for row in shuffled_rows[:expected_count]
+        ]
+
+        if nested_loop_actual_count:
+            nested_actual_rows = sorted(
+                shuffled_rows[:nested_loop_actual_count], key=lambda row: row["id"]
+            )
+            nested_time = f"{time_fn(nested_loop_contains_rows, expected_rows, nested_actual_rows):.3f}"
+            indexed_time = time_fn(
+                runner.contains_rows, expected_rows, nested_actual_rows
+            )
+            actual_count = nested_loop_actual_count
+        else:
+            nested_time = "too slow"
+            indexed_time = time_fn(runner.contains_rows, expected_rows, actual_rows)
+            actual_count = len(actual_rows)
+
+        print(
+            f"{expected_count:<16}{actual_count:>12}{nested_time:>18}{indexed_time:>14.3f}"
+        )
+
+    unordered_time = time_fn(
+        runner.equals_rows, actual_rows, shuffled_rows, ordered=False
+    )
+    print(f"EqualsRows unordered, 100000 rows: {unordered_time:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@ import time
 from collections import defaultdict, OrderedDict
 from typing import List
 
-from cicada2.engine.messaging import get_action_sender
+from cicada2.engine.messaging import get_action_sender, get_action_stream_sender
 from cicada2.engine.parsing import render_section
 from cicada2.engine.state import (
     combine_keys,
@@ -44,7 +44,9 @@ def run_actions(
         (action["name"], infinite_defaultdict()) for action in actions
     )
 
-    with get_action_sender(hostname) as send_action:
+    with get_action_sender(hostname) as send_action, get_action_stream_sender(
+        hostname
+    ) as stream_action:
         for i, action in enumerate(actions):
             rendered_action: Action = render_section(action, state)
 
@@ -61,8 +63,17 @@ def run_actions(
                 (asrt["name"], []) for asrt in rendered_action.get("asserts", [])
             )
 
-            for _ in range(executions_per_cycle):
-                execution_output: ActionResult = send_action(rendered_action)
+            if executions_per_cycle > 1:
+                # Runner executes action and waits between executions
+                execution_outputs = stream_action(
+                    rendered_action,
+                    executions_per_cycle,
+                    rendered_action.get("secondsBetweenExecutions", 0),
+                )
+            else:
+                execution_outputs = [send_action(rendered_action)]
+
+            for execution_output in execution_outputs:
                 action_results.append(execution_output)
 
                 for asrt in get_remaining_asserts(
@@ -83,8 +94,6 @@ def run_actions(
                     else:
                         assert_results[assert_name] = assert_result
 
-                time.sleep(rendered_action.get("secondsBetweenExecutions", 0))
-
             store_action_versions = rendered_action.get("storeVersions", True)
 
             if not store_action_versions and action_results:
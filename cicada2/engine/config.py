@@ -1,6 +1,8 @@
 import os
 
 
+CHANNEL_KEEPALIVE_TIME_MS = int(os.getenv("CHANNEL_KEEPALIVE_TIME_MS", "300000"))
+CHANNEL_KEEPALIVE_TIMEOUT_MS = int(os.getenv("CHANNEL_KEEPALIVE_TIMEOUT_MS", "20000"))
 CONTAINER_NETWORK = os.getenv(
     "CONTAINER_NETWORK", "cicada"
 )  # NOTE: possibly default to engine's network
@@ -8,10 +10,18 @@ CREATE_NETWORK = os.getenv("CREATE_NETWORK", "true").lower() in ["true", "y", "y
 EXIT_CODE_OVERRIDE = os.getenv("EXIT_CODE_OVERRIDE")
 HEALTHCHECK_INITIAL_WAIT = int(os.getenv("HEALTHCHECK_INITIAL_WAIT", "2"))
 HEALTHCHECK_MAX_RETRIES = int(os.getenv("HEALTHCHECK_MAX_RETRIES", "5"))
+HEALTHCHECK_MODE = os.getenv("HEALTHCHECK_MODE", "watch")
+HEALTHCHECK_TIMEOUT = float(os.getenv("HEALTHCHECK_TIMEOUT", "60"))
 INITIAL_STATE_FILE = os.getenv("INITIAL_STATE_FILE")
 POD_NAMESPACE = os.getenv("POD_NAMESPACE", "default")
 POD_SERVICE_ACCOUNT = os.getenv("POD_SERVICE_ACCOUNT", "default")
 REPORTS_FOLDER = os.getenv("REPORTS_FOLDER", "/reports")
 RUN_ID = os.getenv("RUN_ID")
+RUNNER_ENCODING = os.getenv("RUNNER_ENCODING", "msgpack")
+RUNNER_POOL_IDLE_TTL = float(os.getenv("RUNNER_POOL_IDLE_TTL", "60"))
+RUNNER_POOL_MAX_SIZE = int(os.getenv("RUNNER_POOL_MAX_SIZE", "10"))
+RUNNER_STARTUP_CONCURRENCY = int(os.getenv("RUNNER_STARTUP_CONCURRENCY", "5"))
 TASK_TYPE = os.getenv("TASK_TYPE", "docker")
+TEMPLATE_CACHE_SIZE = int(os.getenv("TEMPLATE_CACHE_SIZE", "1024"))
+TEMPLATE_MODE = os.getenv("TEMPLATE_MODE", "yaml")
 TESTS_FOLDER = os.getenv("TESTS_FOLDER", "/tests")
@@ -1,10 +1,12 @@
 import os
 import re
-from typing import Dict, List, Iterable
+from typing import Any, Callable, Dict, List, Iterable, Optional, Tuple
 import yaml
 
 from cicada2.shared.errors import ValidationError
+from cicada2.engine.parsing import mark_static_sections
 from cicada2.engine.runners import (
+    RunnerPool,
     run_test,
     create_docker_container,
     create_kube_pod,
@@ -16,8 +18,44 @@ from cicada2.engine.runners import (
 from cicada2.shared.types import TestConfig, FileTestsConfig, RunnerClosure, TestRunners
 
 
+def get_runner_functions(
+    task_type: str,
+) -> Tuple[Callable[..., Any], Callable[[Any], None], Callable[[Any], str]]:
+    """
+    Get functions to create, remove and address runners for a runner service
+
+    Args:
+        task_type: Type of runner service
+
+    Returns:
+        Functions to create runners, remove runners and get runner hostnames
+    """
+    if task_type == "docker":
+        return create_docker_container, stop_docker_container, get_docker_hostname
+    elif task_type == "kube":
+        return create_kube_pod, stop_kube_pod, get_pod_hostname
+    else:
+        raise ValidationError(f"Task type '{task_type}' not found")
+
+
+def create_runner_pool(task_type: str) -> RunnerPool:
+    """
+    Create run scoped pool of runners for a runner service
+
+    Args:
+        task_type: Type of runner service
+
+    Returns:
+        Runner pool for runner service
+    """
+    return RunnerPool(*get_runner_functions(task_type))
+
+
 def create_test_task(
-    test_config: TestConfig, task_type: str, run_id: str
+    test_config: TestConfig,
+    task_type: str,
+    run_id: str,
+    runner_pool: Optional[RunnerPool] = None,
 ) -> RunnerClosure:
     """
     Create runner closure for test
@@ -26,28 +64,29 @@ def create_test_task(
         test_config: Test config to create closure for
         task_type: Type of runner service
         run_id: cicada run ID
+        runner_pool: Pool to lease runners from instead of creating new runners for each test
 
     Returns:
         Runner closure for test
     """
-    if task_type == "docker":
-        return run_test(
-            create_docker_container,
-            stop_docker_container,
-            get_docker_hostname,
-            test_config,
-            run_id,
-        )
-    elif task_type == "kube":
-        return run_test(
-            create_kube_pod, stop_kube_pod, get_pod_hostname, test_config, run_id
-        )
-    else:
-        raise ValidationError(f"Task type '{task_type}' not found")
+    create_runner_fn, remove_runner_fn, get_runner_hostname_fn = get_runner_functions(
+        task_type
+    )
+
+    if runner_pool is not None:
+        create_runner_fn = runner_pool.lease_runner
+        remove_runner_fn = runner_pool.release_runner
+
+    return run_test(
+        create_runner_fn, remove_runner_fn, get_runner_hostname_fn, test_config, run_id
+    )
 
 
 def create_test_runners(
-    test_configs: Iterable[TestConfig], task_type: str, run_id: str
+    test_configs: Iterable[TestConfig],
+    task_type: str,
+    run_id: str,
+    runner_pool: Optional[RunnerPool] = None,
 ) -> Dict[str, RunnerClosure]:
     """
     Creates runner closures for multiple tests
@@ -56,12 +95,15 @@ def create_test_runners(
         test_configs: Tests to create runners for
         task_type: Runner service type
         run_id: cicada run ID
+        runner_pool: Pool to lease runners from
 
     Returns:
         Map of runner closures by test name
     """
     return {
-        test_config["name"]: create_test_task(test_config, task_type, run_id)
+        test_config["name"]: create_test_task(
+            test_config, task_type, run_id, runner_pool
+        )
         for test_config in test_configs
     }
 
@@ -75,7 +117,12 @@ def create_test_dependencies(
     }
 
 
-def load_test_config(test_filename: str, task_type: str, run_id: str) -> TestRunners:
+def load_test_config(
+    test_filename: str,
+    task_type: str,
+    run_id: str,
+    runner_pool: Optional[RunnerPool] = None,
+) -> TestRunners:
     """
     Loads test config for a file and loads test configs, creates runner_closures, and determines dependencies
 
@@ -83,6 +130,7 @@ def load_test_config(test_filename: str, task_type: str, run_id: str) -> TestRun
         test_filename: Path to test file
         task_type: Runner service type
         run_id: cicada run ID
+        runner_pool: Pool to lease runners from
 
     Returns:
         Test configs, runners and dependencies for test file
@@ -106,9 +154,11 @@ def load_test_config(test_filename: str, task_type: str, run_id: str) -> TestRun
 
             test_config["filename"] = test_filename
 
-            test_configs[test_config["name"]] = test_config
+            test_configs[test_config["name"]] = mark_static_sections(test_config)
 
-        test_runners = create_test_runners(test_configs.values(), task_type, run_id)
+        test_runners = create_test_runners(
+            test_configs.values(), task_type, run_id, runner_pool
+        )
         test_dependencies = create_test_dependencies(test_configs.values())
 
         return TestRunners(
@@ -118,7 +168,12 @@ def load_test_config(test_filename: str, task_type: str, run_id: str) -> TestRun
         )
 
 
-def load_tests_tree(tests_folder: str, task_type: str, run_id: str) -> TestRunners:
+def load_tests_tree(
+    tests_folder: str,
+    task_type: str,
+    run_id: str,
+    runner_pool: Optional[RunnerPool] = None,
+) -> TestRunners:
     """
     Loads tests recursively given a directory containing test files
 
@@ -126,6 +181,7 @@ def load_tests_tree(tests_folder: str, task_type: str, run_id: str) -> TestRunne
         tests_folder: Path to folder containing test files
         task_type: Runner service type
         run_id: cicada run ID
+        runner_pool: Pool to lease runners from
 
     Returns:
         Test configs, runners and dependencies for test files under test directory
@@ -141,7 +197,7 @@ def load_tests_tree(tests_folder: str, task_type: str, run_id: str) -> TestRunne
                 test_file_configs,
                 test_file_runners,
                 test_file_dependencies,
-            ) = load_test_config(test_filepath, task_type, run_id)
+            ) = load_test_config(test_filepath, task_type, run_id, runner_pool)
 
             test_configs.update(test_file_configs)
             test_runners.update(test_file_runners)
@@ -1,10 +1,18 @@
-import json
-from typing import Optional
+import time
+from threading import Lock
+from typing import Callable, Dict, Iterable, Iterator, Optional, Set
 from contextlib import contextmanager
 
 import grpc
 from google.protobuf.empty_pb2 import Empty
 
+from cicada2.engine.config import (
+    CHANNEL_KEEPALIVE_TIME_MS,
+    CHANNEL_KEEPALIVE_TIMEOUT_MS,
+    RUNNER_ENCODING,
+)
+from cicada2.shared.encoding import ENCODINGS, decode_action_reply, encode_params
+from cicada2.shared.errors import ValidationError
 from cicada2.shared.logs import get_logger
 from cicada2.protos import runner_pb2, runner_pb2_grpc
 from cicada2.shared.types import ActionResult, AssertResult
@@ -12,80 +20,290 @@ from cicada2.shared.types import ActionResult, AssertResult
 
 LOGGER = get_logger("messaging")
 
-# NOTE: stream action requests and results for multiple executions?
-# NOTE: support for non-json types with encoding param?
+CHANNEL_OPTIONS = [
+    ("grpc.keepalive_time_ms", CHANNEL_KEEPALIVE_TIME_MS),
+    ("grpc.keepalive_timeout_ms", CHANNEL_KEEPALIVE_TIMEOUT_MS),
+    # Retry connecting quickly while a runner is starting up
+    ("grpc.initial_reconnect_backoff_ms", 100),
+    ("grpc.min_reconnect_backoff_ms", 100),
+    ("grpc.max_reconnect_backoff_ms", 1000),
+]
+
+CHANNELS: Dict[str, grpc.Channel] = {}
+CHANNELS_LOCK = Lock()
+
+# Runners that returned UNIMPLEMENTED for ActionStream
+UNARY_ONLY_RUNNERS: Set[str] = set()
+
+# Encoding negotiated with each runner during healthchecks, runners not in here use JSON
+RUNNER_ENCODINGS: Dict[str, int] = {}
+
+
+def get_channel(runner_address: str) -> grpc.Channel:
+    """
+    Gets the channel to a runner, opening it if this is the first time the runner is contacted. Channels are
+    shared by every test and cycle until the runner is removed
+
+    Args:
+        runner_address: Address of runner
+
+    Returns:
+        Channel to runner
+    """
+    with CHANNELS_LOCK:
+        channel = CHANNELS.get(runner_address)
+
+        if channel is None:
+            channel = grpc.insecure_channel(runner_address, options=CHANNEL_OPTIONS)
+            CHANNELS[runner_address] = channel
+
+        return channel
+
+
+def close_channel(runner_address: str):
+    """
+    Closes the channel to a runner if one is open
+
+    Args:
+        runner_address: Address of runner
+    """
+    with CHANNELS_LOCK:
+        channel = CHANNELS.pop(runner_address, None)
+
+    UNARY_ONLY_RUNNERS.discard(runner_address)
+    RUNNER_ENCODINGS.pop(runner_address, None)
+
+    if channel is not None:
+        channel.close()
+
+
+def select_encoding(runner_encodings: Iterable[int]) -> int:
+    """
+    Picks the encoding to use with a runner based on the encodings it reported in a healthcheck
+
+    Args:
+        runner_encodings: Encodings besides JSON that the runner accepts
+
+    Returns:
+        RUNNER_ENCODING if the runner accepts it, otherwise JSON
+    """
+    if RUNNER_ENCODING not in ENCODINGS:
+        raise ValidationError(
+            f"Runner encoding must be one of {list(ENCODINGS)}, got '{RUNNER_ENCODING}'"
+        )
+
+    encoding = ENCODINGS[RUNNER_ENCODING]
+
+    if encoding in runner_encodings:
+        return encoding
+
+    return runner_pb2.JSON
+
+
+def parse_action_reply(response: runner_pb2.ActionReply) -> Optional[ActionResult]:
+    if response.error:
+        LOGGER.warning("Runner returned error during action: %s", response.error)
+        return None
+
+    try:
+        return decode_action_reply(response)
+    except ValueError as err:
+        # Raised for invalid JSON and msgpack data
+        LOGGER.warning("Runner did not return a valid action response: %s", err)
+
+    return None
 
 
 @contextmanager
 def get_action_sender(runner_address: str) -> Optional[ActionResult]:
-    with grpc.insecure_channel(runner_address) as channel:
-        stub = runner_pb2_grpc.RunnerStub(channel)
+    channel = get_channel(runner_address)
+    stub = runner_pb2_grpc.RunnerStub(channel)
+
+    def call(action: dict):
+        request = runner_pb2.ActionRequest(
+            type=action["type"],
+            **encode_params(
+                action["params"], RUNNER_ENCODINGS.get(runner_address, runner_pb2.JSON)
+            ),
+        )
+
+        try:
+            response: runner_pb2.ActionReply = stub.Action(request)
+            return parse_action_reply(response)
+        except grpc.RpcError as err:
+            LOGGER.warning("Received %s during send_action: %s", err.code(), err)
+
+        # TODO: unit test for None return
+        # TODO: include more information for API failures in report
+        return None
+
+    try:
+        yield call
+    finally:
+        pass
+
 
-        def call(action: dict):
-            request = runner_pb2.ActionRequest(
-                type=action["type"], params=json.dumps(action["params"])
+@contextmanager
+def get_action_stream_sender(
+    runner_address: str,
+) -> Callable[..., Iterator[Optional[ActionResult]]]:
+    """
+    Sends an action to be executed multiple times in a single ActionStream call, yielding each result as the runner
+    streams it back. Falls back to one Action call per execution if the runner does not implement ActionStream
+    """
+    channel = get_channel(runner_address)
+    stub = runner_pb2_grpc.RunnerStub(channel)
+
+    def call(
+        action: dict, executions: int, seconds_between_executions: float = 0
+    ) -> Iterator[Optional[ActionResult]]:
+        params = encode_params(
+            action["params"], RUNNER_ENCODINGS.get(runner_address, runner_pb2.JSON)
+        )
+        completed_executions = 0
+
+        if runner_address not in UNARY_ONLY_RUNNERS:
+            request = runner_pb2.ActionStreamRequest(
+                type=action["type"],
+                executions=executions,
+                seconds_between_executions=seconds_between_executions,
+                **params,
             )
 
             try:
-                response: runner_pb2.ActionReply = stub.Action(request)
-                return json.loads(response.outputs)
-            except json.JSONDecodeError as err:
-                LOGGER.warning(
-                    "Runner did not return JSON encoded action response: %s", err
-                )
+                for response in stub.ActionStream(request):
+                    completed_executions += 1
+                    yield parse_action_reply(response)
+            except grpc.RpcError as err:
+                if err.code() != grpc.StatusCode.UNIMPLEMENTED or completed_executions:
+                    LOGGER.warning(
+                        "Received %s during stream_action: %s", err.code(), err
+                    )
+                else:
+                    LOGGER.info(
+                        "Runner %s does not support ActionStream, using Action",
+                        runner_address,
+                    )
+                    UNARY_ONLY_RUNNERS.add(runner_address)
+
+            if runner_address not in UNARY_ONLY_RUNNERS:
+                # Executions the runner did not return a result for have failed
+                for _ in range(executions - completed_executions):
+                    yield None
+
+                return
+
+        request = runner_pb2.ActionRequest(type=action["type"], **params)
+
+        for i in range(executions):
+            try:
+                yield parse_action_reply(stub.Action(request))
             except grpc.RpcError as err:
                 LOGGER.warning("Received %s during send_action: %s", err.code(), err)
+                yield None
 
-            # TODO: unit test for None return
-            # TODO: include more information for API failures in report
-            return None
+            if i != executions - 1:
+                time.sleep(seconds_between_executions)
 
-        try:
-            yield call
-        finally:
-            pass
+    try:
+        yield call
+    finally:
+        pass
 
 
 @contextmanager
 def get_assert_sender(runner_address: str) -> AssertResult:
-    with grpc.insecure_channel(runner_address) as channel:
-        stub = runner_pb2_grpc.RunnerStub(channel)
+    channel = get_channel(runner_address)
+    stub = runner_pb2_grpc.RunnerStub(channel)
 
-        def call(asrt: dict):
-            request = runner_pb2.AssertRequest(
-                type=asrt["type"], params=json.dumps(asrt["params"])
-            )
+    def call(asrt: dict):
+        request = runner_pb2.AssertRequest(
+            type=asrt["type"],
+            **encode_params(
+                asrt["params"], RUNNER_ENCODINGS.get(runner_address, runner_pb2.JSON)
+            ),
+        )
 
-            try:
-                response: runner_pb2.AssertReply = stub.Assert(request)
-
-                return AssertResult(
-                    passed=response.passed,
-                    actual=response.actual,
-                    expected=response.expected,
-                    description=response.description,
-                )
-            except grpc.RpcError as err:
-                LOGGER.warning("Received %s during send_assert: %s", err.code(), err)
+        try:
+            response: runner_pb2.AssertReply = stub.Assert(request)
 
-                return AssertResult(
-                    passed=False, actual=None, expected=None, description=err.details()
-                )
+            return AssertResult(
+                passed=response.passed,
+                actual=response.actual,
+                expected=response.expected,
+                description=response.description,
+            )
+        except grpc.RpcError as err:
+            LOGGER.warning("Received %s during send_assert: %s", err.code(), err)
 
-        try:
-            yield call
-        finally:
-            pass
+            return AssertResult(
+                passed=False, actual=None, expected=None, description=err.details()
+            )
 
+    try:
+        yield call
+    finally:
+        pass
 
-def runner_healthcheck(runner_address: str) -> bool:
-    # NOTE: possibly use built in grpc health check
-    with grpc.insecure_channel(runner_address) as channel:
-        stub = runner_pb2_grpc.RunnerStub(channel)
 
+@contextmanager
+def get_healthcheck_sender(runner_address: str) -> Callable[..., bool]:
+    channel = get_channel(runner_address)
+    stub = runner_pb2_grpc.RunnerStub(channel)
+
+    def call(wait_for_ready: bool = False, timeout: float = None) -> bool:
         try:
-            response = stub.Healthcheck(Empty())
+            response = stub.Healthcheck(
+                Empty(), wait_for_ready=wait_for_ready, timeout=timeout
+            )
+
+            if response.ready:
+                RUNNER_ENCODINGS[runner_address] = select_encoding(response.encodings)
+
             return response.ready
         except grpc.RpcError as err:
             LOGGER.warning("Received %s during healthcheck: %s", err.code(), err)
             return False
+
+    try:
+        yield call
+    finally:
+        pass
+
+
+def runner_healthcheck(runner_address: str) -> bool:
+    # NOTE: possibly use built in grpc health check
+    with get_healthcheck_sender(runner_address) as send_healthcheck:
+        return send_healthcheck()
+
+
+def wait_for_runner_ready(
+    runner_address: str, timeout: float, poll_interval: float = 0.1
+) -> bool:
+    """
+    Waits for a runner to serve healthchecks over a single channel, returning as soon as it is ready
+
+    Healthchecks wait for the channel to connect instead of failing immediately, so the runner is detected the
+    moment it starts listening
+
+    Args:
+        runner_address: Address of runner
+        timeout: Seconds to wait for runner to become ready
+        poll_interval: Seconds to wait before checking again if runner is serving but not ready
+
+    Returns:
+        If the runner became ready before the timeout
+    """
+    deadline = time.monotonic() + timeout
+
+    with get_healthcheck_sender(runner_address) as send_healthcheck:
+        while True:
+            remaining = deadline - time.monotonic()
+
+            if remaining <= 0:
+                return False
+
+            if send_healthcheck(wait_for_ready=True, timeout=remaining):
+                return True
+
+            time.sleep(min(poll_interval, max(deadline - time.monotonic(), 0)))
@@ -1,20 +1,169 @@
 import json
 import base64
+from functools import lru_cache
 from os import getenv
-from typing import Any
+from typing import Any, Callable, Optional
 
 import jinja2
 import yaml
+from jinja2 import nodes
 
+from cicada2.engine.config import TEMPLATE_CACHE_SIZE, TEMPLATE_MODE
 from cicada2.shared.errors import ValidationError
 
 
+TEMPLATE_ENVIRONMENT = jinja2.Environment(
+    loader=jinja2.BaseLoader, extensions=["jinja2.ext.do"]
+)
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(template_string: str) -> jinja2.Template:
+    """
+    Compiles a template string using the shared environment, caching the most recently used templates
+
+    Args:
+        template_string: Jinja2 template source
+
+    Returns:
+        Compiled template
+    """
+    return TEMPLATE_ENVIRONMENT.from_string(template_string)
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_native_expression(template_string: str) -> Optional[Callable[..., Any]]:
+    """
+    Compiles a template made of a single expression, such as "{{ state['foo'] }}", into a function returning the
+    Python value of the expression instead of a string
+
+    Args:
+        template_string: Jinja2 template source
+
+    Returns:
+        Compiled expression or None if the template is not a single expression
+    """
+    source = template_string.strip()
+
+    if not (source.startswith("{{") and source.endswith("}}")):
+        return None
+
+    body = TEMPLATE_ENVIRONMENT.parse(source).body
+
+    if not (
+        len(body) == 1
+        and isinstance(body[0], nodes.Output)
+        and len(body[0].nodes) == 1
+        and not isinstance(body[0].nodes[0], nodes.TemplateData)
+    ):
+        return None
+
+    # Remove delimiters and whitespace control characters
+    return TEMPLATE_ENVIRONMENT.compile_expression(source[2:-2].strip("-+"))
+
+
+def get_template_cache_info():
+    """
+    Returns hits, misses, max size and current size of the compiled template cache
+    """
+    return compile_template.cache_info()
+
+
+TEMPLATE_SYNTAX = ("{{", "{%", "{#")
+
+
+class StaticSection(dict):
+    """
+    Section without any template syntax that render_section returns as-is
+    """
+
+
+class StaticString(str):
+    """
+    String without any template syntax that render_section returns as-is
+    """
+
+
+def is_static_string(value: str) -> bool:
+    """
+    Checks if rendering a string would return the string unchanged
+
+    Args:
+        value: String to check
+
+    Returns:
+        True if string has no template syntax and is loaded by YAML as itself
+    """
+    if any(syntax in value for syntax in TEMPLATE_SYNTAX):
+        return False
+
+    try:
+        return yaml.safe_load(value) == value
+    except yaml.YAMLError:
+        return False
+
+
+def is_static_section(section: Any) -> bool:
+    # NOTE: lists are not rendered by render_section so they are always static
+    return isinstance(section, (StaticSection, StaticString, list)) or not isinstance(
+        section, (dict, str)
+    )
+
+
+def mark_static_sections(section: Any) -> Any:
+    """
+    Marks dicts and strings that would render to themselves so render_section can skip Jinja and YAML for them.
+    Lists are traversed so the actions, asserts and outputs inside them are marked too
+
+    Example:
+        Before:
+            type: POST
+            params:
+                url: http://api:8080/members
+                body:
+                    name: {{ state['name'] }}
+
+        After (static sections marked with *):
+            type: POST*
+            params:
+                url: http://api:8080/members*
+                body:
+                    name: {{ state['name'] }}
+
+    Args:
+        section: Section to mark, presumably a test config loaded from a test file
+
+    Returns:
+        Copy of section with static dicts and strings marked
+    """
+    if isinstance(section, dict):
+        marked_section = {
+            key: mark_static_sections(value) for key, value in section.items()
+        }
+
+        if "template" not in marked_section and all(
+            is_static_section(value) for value in marked_section.values()
+        ):
+            return StaticSection(marked_section)
+
+        return marked_section
+    elif isinstance(section, list):
+        return [mark_static_sections(item) for item in section]
+    elif isinstance(section, str) and is_static_string(section):
+        return StaticString(section)
+
+    return section
+
+
 def render_section(section: Any, state: dict, **kwargs: dict) -> Any:
     """
     Renders the 'template' section of a config block and replaces the key with the rendered yaml
     Section can also be a jinja2 string
     If the section is anything else, it is just returned without rendering
 
+    If TEMPLATE_MODE is 'native', strings made of a single expression return the expression's value directly
+    instead of loading the rendered string as yaml
+
     Example:
         Before:
             foo: bar
@@ -36,7 +185,9 @@ def render_section(section: Any, state: dict, **kwargs: dict) -> Any:
         Current section combined with rendered template data (will retain template string for future use)
     """
     try:
-        if isinstance(section, dict) and "template" in section:
+        if isinstance(section, (StaticSection, StaticString)):
+            return section
+        elif isinstance(section, dict) and "template" in section:
             template_string = section.get("template", "")
         elif isinstance(section, dict):
             return {
@@ -44,12 +195,18 @@ def render_section(section: Any, state: dict, **kwargs: dict) -> Any:
             }
         elif isinstance(section, str):
             template_string = section
+
+            if TEMPLATE_MODE == "native":
+                expression = compile_native_expression(template_string)
+
+                if expression is not None:
+                    return expression(
+                        state=state, json=json, getenv=getenv, base64=base64, **kwargs
+                    )
         else:
             return section
 
-        template = jinja2.Environment(
-            loader=jinja2.BaseLoader, extensions=["jinja2.ext.do"]
-        ).from_string(template_string)
+        template = compile_template(template_string)
 
         rendered_template_string = template.render(
             state=state, json=json, getenv=getenv, base64=base64, **kwargs
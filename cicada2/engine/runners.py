@@ -1,6 +1,8 @@
 import uuid
 import time
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, Timer
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import docker
 from docker.errors import APIError
@@ -13,12 +15,22 @@ from cicada2.engine.config import (
     CREATE_NETWORK,
     HEALTHCHECK_INITIAL_WAIT,
     HEALTHCHECK_MAX_RETRIES,
+    HEALTHCHECK_MODE,
+    HEALTHCHECK_TIMEOUT,
     POD_NAMESPACE,
     POD_SERVICE_ACCOUNT,
+    RUNNER_POOL_IDLE_TTL,
+    RUNNER_POOL_MAX_SIZE,
+    RUNNER_STARTUP_CONCURRENCY,
 )
 from cicada2.shared.errors import ValidationError
 from cicada2.shared.logs import get_logger
-from cicada2.engine.messaging import runner_healthcheck
+from cicada2.engine.messaging import (
+    close_channel,
+    get_healthcheck_sender,
+    runner_healthcheck,
+    wait_for_runner_ready,
+)
 from cicada2.engine.parsing import render_section
 from cicada2.engine.testing import run_test_with_timeout
 from cicada2.shared.types import TestConfig, RunnerClosure, TestSummary, Volume
@@ -68,31 +80,46 @@ def container_is_healthy(
     hostname: str,
     initial_wait_time: int = HEALTHCHECK_INITIAL_WAIT,
     max_retries: int = HEALTHCHECK_MAX_RETRIES,
+    mode: str = HEALTHCHECK_MODE,
+    timeout: float = HEALTHCHECK_TIMEOUT,
 ) -> bool:
     """
-    Determines if a container is ready to accept messages using an exponential backoff
+    Determines if a container is ready to accept messages
+
+    * watch: Waits for the runner's channel to connect and returns as soon as it serves a healthcheck
+    * backoff: Checks the runner using an exponential backoff
 
     Args:
         hostname: Address of runner
-        initial_wait_time: Amount of seconds to wait before checking runner
-        max_retries: Number of times to check runner
+        initial_wait_time: Amount of seconds to wait before checking runner (backoff only)
+        max_retries: Number of times to check runner (backoff only)
+        mode: Readiness detection mode ('watch' or 'backoff')
+        timeout: Seconds to wait for runner to become ready (watch only)
 
     Returns:
         If the runner is ready
     """
+    if mode == "watch":
+        return wait_for_runner_ready(hostname, timeout)
+    elif mode != "backoff":
+        raise ValidationError(
+            f"Healthcheck mode must be 'watch' or 'backoff', got '{mode}'"
+        )
+
     retries = 0
     wait_time = initial_wait_time
 
-    while retries < max_retries:
-        time.sleep(wait_time)
-        ready = runner_healthcheck(hostname)
+    with get_healthcheck_sender(hostname) as send_healthcheck:
+        while retries < max_retries:
+            time.sleep(wait_time)
+            ready = send_healthcheck()
 
-        if not ready:
-            retries += 1
-            # NOTE: make multiplier configurable too?
-            wait_time *= 2
-        else:
-            return True
+            if not ready:
+                retries += 1
+                # NOTE: make multiplier configurable too?
+                wait_time *= 2
+            else:
+                return True
 
     return False
 
@@ -173,6 +200,7 @@ def create_docker_container(
 
 def stop_docker_container(container):
     LOGGER.debug("Stopping container %s", container.name)
+    close_channel(get_docker_hostname(container))
     container.stop(timeout=3)
 
 
@@ -185,6 +213,7 @@ def clean_docker_containers(run_id):
         containers = client.containers.list(filters={"label": run_id})
 
         for container in containers:
+            close_channel(get_docker_hostname(container))
             container.stop()
     except APIError as err:
         raise RuntimeError(f"Unable to stop containers for run ID {run_id}: {err}")
@@ -290,6 +319,7 @@ def stop_kube_pod(container_id: str, namespace: str = POD_NAMESPACE):
     v1 = k8s_client.CoreV1Api()
 
     LOGGER.debug("Stopping pod and service %s", container_id)
+    close_channel(get_pod_hostname(container_id))
 
     try:
         v1.delete_namespaced_pod(namespace=namespace, name=container_id)
@@ -328,6 +358,265 @@ def get_pod_hostname(container_id: str):
     return f"{container_id}:50051"
 
 
+RunnerKey = Tuple[str, Tuple[Tuple[str, str], ...], Tuple[Tuple[str, str], ...]]
+
+
+def get_runner_key(
+    image: str, env_map: Dict[str, str], volumes: List[Volume] = None
+) -> RunnerKey:
+    """
+    Creates a hashable key identifying runners that can be used interchangeably
+
+    Args:
+        image: Docker image of runner
+        env_map: Rendered env vars provided to runner
+        volumes: Volumes mounted to runner
+
+    Returns:
+        Key of runner
+    """
+    return (
+        image,
+        tuple(sorted(env_map.items())),
+        tuple(sorted((vol["source"], vol["destination"]) for vol in volumes or [])),
+    )
+
+
+class RunnerPool:
+    """
+    Run scoped pool of healthy runners that can be leased by tests with the same image, config and volumes
+
+    Runners are returned to the pool when a test finishes instead of being stopped. Idle runners are stopped
+    when they have been idle longer than idle_ttl seconds, by a timer that runs while the pool holds idle runners,
+    when the pool holds more than max_size idle runners or when the pool is closed at the end of the run.
+    """
+
+    def __init__(
+        self,
+        create_runner_fn: Callable[..., Any],
+        remove_runner_fn: Callable[[Any], None],
+        get_runner_hostname_fn: Callable[[Any], str],
+        max_size: int = RUNNER_POOL_MAX_SIZE,
+        idle_ttl: float = RUNNER_POOL_IDLE_TTL,
+    ):
+        self.create_runner_fn = create_runner_fn
+        self.remove_runner_fn = remove_runner_fn
+        self.get_runner_hostname_fn = get_runner_hostname_fn
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        # Idle runners are stored with the time they were released, oldest first
+        self.idle_runners: List[Tuple[RunnerKey, Any, float]] = []
+        self.leased_runners: Dict[int, RunnerKey] = {}
+        self.reap_timer: Optional[Timer] = None
+        self.lock = Lock()
+
+    def lease_runner(
+        self,
+        image: str,
+        env_map: Dict[str, str],
+        run_id: str,
+        volumes: List[Volume] = None,
+    ):
+        """
+        Leases a healthy idle runner matching the image, env and volumes or creates a new one
+
+        Args:
+            image: Docker image of runner
+            env_map: env vars to provide to runner
+            run_id: cicada run ID
+            volumes: Volumes to mount to runner
+
+        Returns:
+            Runner object created by create_runner_fn
+        """
+        runner_key = get_runner_key(image, env_map, volumes)
+
+        while True:
+            with self.lock:
+                expired_runners = self._pop_expired_runners()
+                runner = self._pop_idle_runner(runner_key)
+
+            self._remove_runners(expired_runners)
+
+            if runner is None:
+                break
+
+            if runner_healthcheck(self.get_runner_hostname_fn(runner)):
+                LOGGER.debug(
+                    "Leased pooled runner %s", self.get_runner_hostname_fn(runner)
+                )
+
+                with self.lock:
+                    self.leased_runners[id(runner)] = runner_key
+
+                return runner
+
+            LOGGER.debug(
+                "Pooled runner %s is unhealthy", self.get_runner_hostname_fn(runner)
+            )
+            self._remove_runners([runner])
+
+        runner = self.create_runner_fn(image, env_map, run_id, volumes=volumes)
+
+        with self.lock:
+            self.leased_runners[id(runner)] = runner_key
+
+        return runner
+
+    def release_runner(self, runner):
+        """
+        Returns a leased runner to the pool, stopping it if the pool is disabled or it was not leased
+
+        Args:
+            runner: Runner object returned by lease_runner
+        """
+        with self.lock:
+            runner_key = self.leased_runners.pop(id(runner), None)
+
+            if runner_key is None or self.max_size <= 0:
+                evicted_runners = [runner]
+            else:
+                self.idle_runners.append((runner_key, runner, time.monotonic()))
+                evicted_runners = self._pop_expired_runners()
+
+                # Evict least recently released runners if pool is full
+                while len(self.idle_runners) > self.max_size:
+                    evicted_runners.append(self.idle_runners.pop(0)[1])
+
+                self._schedule_reap()
+
+        self._remove_runners(evicted_runners)
+
+    def close(self):
+        """
+        Stops all idle runners in the pool
+        """
+        with self.lock:
+            idle_runners = [runner for _, runner, _ in self.idle_runners]
+            self.idle_runners = []
+
+            if self.reap_timer is not None:
+                self.reap_timer.cancel()
+                self.reap_timer = None
+
+        self._remove_runners(idle_runners)
+
+    def _pop_idle_runner(self, runner_key: RunnerKey):
+        # Prefer most recently released runner
+        for i in range(len(self.idle_runners) - 1, -1, -1):
+            if self.idle_runners[i][0] == runner_key:
+                return self.idle_runners.pop(i)[1]
+
+        return None
+
+    def _pop_expired_runners(self) -> List[Any]:
+        now = time.monotonic()
+
+        expired_runners = [
+            runner
+            for _, runner, released_at in self.idle_runners
+            if now - released_at > self.idle_ttl
+        ]
+        self.idle_runners = [
+            idle_runner
+            for idle_runner in self.idle_runners
+            if now - idle_runner[2] <= self.idle_ttl
+        ]
+
+        return expired_runners
+
+    def _schedule_reap(self):
+        # Must be called with lock held. Runs when the oldest idle runner expires
+        if self.reap_timer is not None or not self.idle_runners:
+            return
+
+        delay = max(self.idle_runners[0][2] + self.idle_ttl - time.monotonic(), 0)
+        self.reap_timer = Timer(delay, self._reap)
+        self.reap_timer.daemon = True
+        self.reap_timer.start()
+
+    def _reap(self):
+        with self.lock:
+            self.reap_timer = None
+            expired_runners = self._pop_expired_runners()
+            self._schedule_reap()
+
+        self._remove_runners(expired_runners)
+
+    def _remove_runners(self, runners: List[Any]):
+        for runner in runners:
+            try:
+                self.remove_runner_fn(runner)
+            except RuntimeError as err:
+                LOGGER.warning("Unable to remove runner: %s", err)
+
+
+def create_runners(
+    create_runner_fn: Callable[..., Any],
+    remove_runner_fn: Callable[[Any], None],
+    image: str,
+    env_map: Dict[str, str],
+    run_id: str,
+    runner_count: int = 1,
+    volumes: List[Volume] = None,
+    max_concurrency: int = RUNNER_STARTUP_CONCURRENCY,
+) -> Tuple[List[Any], List[float]]:
+    """
+    Creates and healthchecks runners concurrently. If any runner fails to start, the runners that did start are
+    removed
+
+    Args:
+        create_runner_fn: Function to create a single runner
+        remove_runner_fn: Function to remove a single runner
+        image: Docker image of runners
+        env_map: env vars to provide to runners
+        run_id: cicada run ID
+        runner_count: Number of runners to create
+        volumes: Volumes to mount to runners
+        max_concurrency: Maximum number of runners to create at the same time
+
+    Returns:
+        Created runners and the time in seconds each one took to start
+    """
+
+    def timed_create_runner():
+        start = time.monotonic()
+        runner = create_runner_fn(image, env_map, run_id, volumes=volumes)
+
+        return runner, round(time.monotonic() - start, 3)
+
+    runners = []
+    startup_times = []
+    errors = []
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(runner_count, max_concurrency))
+    ) as executor:
+        runner_futures = [
+            executor.submit(timed_create_runner) for _ in range(runner_count)
+        ]
+
+        for runner_future in runner_futures:
+            try:
+                runner, startup_time = runner_future.result()
+            except (AssertionError, ValueError, TypeError, RuntimeError) as err:
+                errors.append(err)
+                continue
+
+            runners.append(runner)
+            startup_times.append(startup_time)
+
+    if errors:
+        for runner in runners:
+            remove_runner_fn(runner)
+
+        raise RuntimeError(
+            f"Unable to create {len(errors)} of {runner_count} runners: {errors[0]}"
+        )
+
+    return runners, startup_times
+
+
 def run_test(
     create_runner_fn,
     remove_runner_fn,
@@ -360,13 +649,15 @@ def run_test(
                 render_section(rendered_test_config.get("config", {}), state)
             )
 
-            runners = []
-
-            for _ in range(rendered_test_config.get("runnerCount", 1)):
-                runner = create_runner_fn(
-                    image, env, run_id, volumes=rendered_test_config.get("volumes")
-                )
-                runners.append(runner)
+            runners, startup_times = create_runners(
+                create_runner_fn,
+                remove_runner_fn,
+                image,
+                env,
+                run_id,
+                runner_count=rendered_test_config.get("runnerCount", 1),
+                volumes=rendered_test_config.get("volumes"),
+            )
 
             try:
                 new_state = run_test_with_timeout(
@@ -381,9 +672,6 @@ def run_test(
                     "Error running test %s: %s", test_config["name"], err, exc_info=True
                 )
 
-                for runner in runners:
-                    remove_runner_fn(runner)
-
                 new_state = {
                     test_config["name"]: {
                         "summary": TestSummary(
@@ -399,6 +687,10 @@ def run_test(
 
             for runner in runners:
                 remove_runner_fn(runner)
+
+            new_state[test_config["name"]]["summary"][
+                "runner_startup_times"
+            ] = startup_times
         except (AssertionError, ValueError, TypeError, RuntimeError) as err:
             LOGGER.error(
                 "Error creating test %s: %s", test_config["name"], err, exc_info=True
@@ -1,10 +1,9 @@
 import os
-import time
 import json
 import uuid
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from dask.distributed import Client, Future
+from dask.distributed import Client, Future, as_completed
 
 from cicada2.engine.config import (
     INITIAL_STATE_FILE,
@@ -13,11 +12,12 @@ from cicada2.engine.config import (
     REPORTS_FOLDER,
     TESTS_FOLDER,
 )
-from cicada2.engine.loading import load_tests_tree
+from cicada2.engine.loading import create_runner_pool, load_tests_tree
+from cicada2.shared.errors import ValidationError
 from cicada2.shared.logs import get_logger
 from cicada2.engine.reporting import test_succeeded, render_report
 from cicada2.engine.runners import clean_docker_containers
-from cicada2.shared.types import TestSummary
+from cicada2.shared.types import RunnerClosure, TestConfig, TestSummary
 
 
 LOGGER = get_logger("scheduling")
@@ -60,6 +60,191 @@ def all_tests_finished(test_statuses: Dict[str, Optional[Future]]) -> bool:
     )
 
 
+def get_test_dependents(
+    test_dependencies: Dict[str, List[str]]
+) -> Dict[str, List[str]]:
+    """
+    Inverts the dependency map so each test maps to the tests that depend on it
+
+    Args:
+        test_dependencies: Map of test names to the names of the tests they depend on
+
+    Returns:
+        Map of test names to the names of tests that depend on them
+    """
+    test_dependents: Dict[str, List[str]] = {
+        test_name: [] for test_name in test_dependencies
+    }
+
+    for test_name, dependency_names in test_dependencies.items():
+        for dependency_name in dependency_names:
+            test_dependents.setdefault(dependency_name, []).append(test_name)
+
+    return test_dependents
+
+
+def create_test_state(
+    test_name: str,
+    test_statuses: Dict[str, Optional[Future]],
+    test_dependencies: Dict[str, List[str]],
+    initial_state: dict,
+) -> Tuple[dict, bool]:
+    """
+    Combines initial state with the state of each finished dependency of a test
+
+    Args:
+        test_name: Name of test to create state for
+        test_statuses: Futures of tests that have been submitted
+        test_dependencies: Map of test names to the names of the tests they depend on
+        initial_state: State loaded at the start of the run
+
+    Returns:
+        State to run test with and whether any of the test's dependencies failed
+    """
+    # NOTE: possibly have globals in separate section
+    state = {**{"globals": {}}, **initial_state}
+    has_failed_dependencies = False
+
+    for test_dependency in test_dependencies[test_name]:
+        # NOTE: dependencies may need ordering in future
+        dependency_result = test_statuses[test_dependency].result()
+
+        dependency_summary = dependency_result[test_dependency]["summary"]
+
+        if not test_succeeded(dependency_summary):
+            has_failed_dependencies = True
+        else:
+            state.update(dependency_result)
+
+    return state, has_failed_dependencies
+
+
+def skip_test(state: dict, test_name: str, test_config: TestConfig) -> dict:
+    """
+    Creates the final state of a test that was skipped because of a failed dependency
+
+    Args:
+        state: Incoming state of test
+        test_name: Name of skipped test
+        test_config: Config of skipped test
+
+    Returns:
+        Incoming state with a skipped summary for the test
+    """
+    test_summary = TestSummary(
+        description=test_config.get("description"),
+        error="skipped",
+        remaining_asserts=[],
+        completed_cycles=0,
+        duration=0,
+    )
+
+    return {**state, **{test_name: {"summary": test_summary}}}
+
+
+def submit_test(
+    client: Client,
+    test_name: str,
+    test_configs: Dict[str, TestConfig],
+    test_runners: Dict[str, RunnerClosure],
+    test_dependencies: Dict[str, List[str]],
+    test_statuses: Dict[str, Optional[Future]],
+    initial_state: dict,
+) -> Future:
+    """
+    Submits a test whose dependencies have finished, skipping it if a dependency failed
+
+    Args:
+        client: Dask client to submit test to
+        test_name: Name of test to submit
+        test_configs: Map of test names to test configs
+        test_runners: Map of test names to runner closures
+        test_dependencies: Map of test names to the names of the tests they depend on
+        test_statuses: Futures of tests that have been submitted
+        initial_state: State loaded at the start of the run
+
+    Returns:
+        Future for the final state of the test
+    """
+    state, has_failed_dependencies = create_test_state(
+        test_name, test_statuses, test_dependencies, initial_state
+    )
+
+    if has_failed_dependencies and not test_configs[test_name].get(
+        "runIfFailedDependency", False
+    ):
+        LOGGER.info("Skipping test %s because of failed dependencies", test_name)
+        return client.submit(skip_test, state, test_name, test_configs[test_name])
+
+    return client.submit(test_runners[test_name], state=state)
+
+
+def schedule_tests(
+    client: Client,
+    test_configs: Dict[str, TestConfig],
+    test_runners: Dict[str, RunnerClosure],
+    test_dependencies: Dict[str, List[str]],
+    initial_state: dict,
+) -> Dict[str, Future]:
+    """
+    Runs tests as soon as their dependencies finish and waits for all of them to complete
+
+    Args:
+        client: Dask client to submit tests to
+        test_configs: Map of test names to test configs
+        test_runners: Map of test names to runner closures
+        test_dependencies: Map of test names to the names of the tests they depend on
+        initial_state: State loaded at the start of the run
+
+    Returns:
+        Finished future of each test
+    """
+    # Initialize to None so tests are only submitted once
+    test_statuses: Dict[str, Optional[Future]] = {
+        test_name: None for test_name in test_runners
+    }
+    test_dependents = get_test_dependents(test_dependencies)
+    future_test_names: Dict[str, str] = {}
+    running_tests = as_completed()
+
+    def launch_ready_tests(test_names: Iterable[str]):
+        for test_name in test_names:
+            if test_is_ready(test_name, test_statuses, test_dependencies):
+                test_future = submit_test(
+                    client,
+                    test_name,
+                    test_configs,
+                    test_runners,
+                    test_dependencies,
+                    test_statuses,
+                    initial_state,
+                )
+
+                test_statuses[test_name] = test_future
+                future_test_names[test_future.key] = test_name
+                running_tests.add(test_future)
+
+    launch_ready_tests(test_statuses)
+
+    # Launch dependent tests as soon as the last of their dependencies finishes
+    for finished_test in running_tests:
+        finished_test_name = future_test_names[finished_test.key]
+
+        LOGGER.debug("Test %s finished", finished_test_name)
+        launch_ready_tests(test_dependents[finished_test_name])
+
+    if not all_tests_finished(test_statuses):
+        unscheduled_tests = [
+            test_name for test_name in test_statuses if not test_statuses[test_name]
+        ]
+
+        raise ValidationError(
+            f"Unable to schedule tests {unscheduled_tests}, check for circular dependencies"
+        )
+
+    return test_statuses
+
+
 def run_tests(
     tests_folder: str = TESTS_FOLDER,
     initial_state_file: str = INITIAL_STATE_FILE,
@@ -71,97 +256,60 @@ def run_tests(
         run_id = f"cicada-2-run-{str(uuid.uuid4())[:8]}"
 
     LOGGER.info("Starting run %s", run_id)
-    test_configs, test_runners, test_dependencies = load_tests_tree(
-        tests_folder, tasks_type, run_id
-    )
+    runner_pool = create_runner_pool(tasks_type)
 
-    if initial_state_file:
-        with open(initial_state_file) as initial_state_fp:
-            initial_state = json.load(initial_state_fp)
-    else:
-        initial_state = {}
+    # Pooled runners outlive their tests, so they are stopped even if the run fails
+    try:
+        test_configs, test_runners, test_dependencies = load_tests_tree(
+            tests_folder, tasks_type, run_id, runner_pool
+        )
 
-    client = Client(processes=False)
-    # Initialize to None to prevent stopping on first run
-    test_statuses: Dict[str, Future] = {test_name: None for test_name in test_runners}
+        if initial_state_file:
+            with open(initial_state_file) as initial_state_fp:
+                initial_state = json.load(initial_state_fp)
+        else:
+            initial_state = {}
 
-    # Poll for jobs that can be launched based on completed test dependencies
-    while not all_tests_finished(test_statuses):
-        for test_name in test_statuses:
-            if test_is_ready(test_name, test_statuses, test_dependencies):
-                # TODO: move to function
-                # NOTE: possibly have globals in separate section
-                state = {**{"globals": {}}, **initial_state}
-                has_missing_dependencies = False
-
-                for test_dependency in test_dependencies[test_name]:
-                    # NOTE: dependencies may need ordering in future
-                    dependency_result = test_statuses[test_dependency].result()
-
-                    dependency_summary = dependency_result[test_dependency]["summary"]
-
-                    if not test_succeeded(dependency_summary):
-                        has_missing_dependencies = True
-                    else:
-                        state.update(dependency_result)
-
-                if has_missing_dependencies and not test_configs[test_name].get(
-                    "runIfFailedDependency", False
-                ):
-                    test_summary = TestSummary(
-                        description=test_configs[test_name].get("description"),
-                        error="skipped",
-                        remaining_asserts=[],
-                        completed_cycles=0,
-                        duration=0,
-                    )
-
-                    # pylint: disable=undefined-loop-variable
-                    test_statuses[test_name] = client.submit(
-                        lambda: {**state, **{test_name: {"summary": test_summary}}}
-                    )
-                else:
-                    test_statuses[test_name] = client.submit(
-                        test_runners[test_name], state=state
-                    )
-
-        # NOTE: Possibly launch tasks with wait on completed
-        time.sleep(1)
-
-    LOGGER.debug("test statuses: %s", test_statuses)
-
-    os.makedirs(reports_location, exist_ok=True)
-    final_state = {}
-    all_tests_succeeded = True
-
-    for test_name in sort_dependencies(test_dependencies):
-        final_test_state = test_statuses[test_name].result()
-
-        test_summary = final_test_state[test_name]["summary"]
-
-        all_tests_succeeded &= test_succeeded(test_summary)
+        client = Client(processes=False)
+        test_statuses = schedule_tests(
+            client, test_configs, test_runners, test_dependencies, initial_state
+        )
 
-        with open(
-            os.path.join(reports_location, f"state.{test_name}.json"), "w"
-        ) as final_test_state_fp:
-            json.dump(final_test_state, final_test_state_fp, indent=2)
+        LOGGER.debug("test statuses: %s", test_statuses)
 
-        final_state = {**final_state, **final_test_state}
+        os.makedirs(reports_location, exist_ok=True)
+        final_state = {}
+        all_tests_succeeded = True
 
-    report_string = render_report(final_state, run_id=run_id)
+        for test_name in sort_dependencies(test_dependencies):
+            final_test_state = test_statuses[test_name].result()
 
-    with open(os.path.join(reports_location, "report.md"), "w") as report_fp:
-        report_fp.write(report_string)
+            test_summary = final_test_state[test_name]["summary"]
 
-    with open(
-        os.path.join(reports_location, "state.final.json"), "w"
-    ) as final_state_fp:
-        json.dump(final_state, final_state_fp, indent=2)
+            all_tests_succeeded &= test_succeeded(test_summary)
 
-    LOGGER.debug("cleaning orphaned runners")
+            with open(
+                os.path.join(reports_location, f"state.{test_name}.json"), "w"
+            ) as final_test_state_fp:
+                json.dump(final_test_state, final_test_state_fp, indent=2)
 
-    if tasks_type == "docker":
-        clean_docker_containers(run_id)
+            final_state = {**final_state, **final_test_state}
+
+        report_string = render_report(final_state, run_id=run_id)
+
+        with open(os.path.join(reports_location, "report.md"), "w") as report_fp:
+            report_fp.write(report_string)
+
+        with open(
+            os.path.join(reports_location, "state.final.json"), "w"
+        ) as final_state_fp:
+            json.dump(final_state, final_state_fp, indent=2)
+    finally:
+        LOGGER.debug("cleaning orphaned runners")
+        runner_pool.close()
+
+        if tasks_type == "docker":
+            clean_docker_containers(run_id)
 
     LOGGER.info("Tests complete!")
 
@@ -3,11 +3,16 @@ from unittest.mock import patch
 from cicada2.engine import actions
 
 
+@patch("cicada2.engine.actions.get_action_stream_sender")
 @patch("cicada2.engine.actions.get_action_sender")
-def test_run_actions(get_action_sender_mock):
+def test_run_actions(get_action_sender_mock, get_action_stream_sender_mock):
     get_action_sender_mock.return_value.__enter__.return_value.return_value = {
         "foo": "bar"
     }
+    get_action_stream_sender_mock.return_value.__enter__.return_value.return_value = [
+        {"foo": "bar"},
+        {"foo": "bar"},
+    ]
 
     test_actions = [
         {
@@ -77,11 +82,12 @@ def test_run_actions_with_asserts_actual_override(get_action_sender_mock):
     assert actions_data["POST0"]["asserts"]["Assert0"][0]["passed"]
 
 
+@patch("cicada2.engine.actions.get_action_stream_sender")
 @patch("cicada2.engine.actions.get_action_sender")
 def test_run_actions_with_asserts_multiple_calls_versioned(
-    get_action_sender_mock,
+    _, get_action_stream_sender_mock
 ):
-    get_action_sender_mock.return_value.__enter__.return_value.side_effect = [
+    get_action_stream_sender_mock.return_value.__enter__.return_value.return_value = [
         {"foo": "bar"},
         {"fizz": "buzz"},
     ]
@@ -118,11 +124,12 @@ def test_run_actions_with_asserts_multiple_calls_versioned(
     assert actions_data["POST0"]["asserts"]["Assert1"][1]["passed"]
 
 
+@patch("cicada2.engine.actions.get_action_stream_sender")
 @patch("cicada2.engine.actions.get_action_sender")
 def test_run_actions_with_asserts_multiple_calls_versioned_keep_if_passed(
-    get_action_sender_mock,
+    _, get_action_stream_sender_mock
 ):
-    get_action_sender_mock.return_value.__enter__.return_value.side_effect = [
+    get_action_stream_sender_mock.return_value.__enter__.return_value.return_value = [
         {"foo": "bar"},
         {"fizz": "buzz"},
     ]
@@ -163,13 +170,16 @@ def test_run_actions_with_asserts_multiple_calls_versioned_keep_if_passed(
     assert not actions_data["POST0"]["asserts"]["Assert1"][0]["passed"]
 
 
+@patch("cicada2.engine.actions.get_action_stream_sender")
 @patch("cicada2.engine.actions.get_action_sender")
-def test_run_actions_errored_call(get_action_sender_mock):
-    get_action_sender_mock.return_value.__enter__.return_value.side_effect = [
+def test_run_actions_errored_call(
+    get_action_sender_mock, get_action_stream_sender_mock
+):
+    get_action_stream_sender_mock.return_value.__enter__.return_value.return_value = [
         {"foo": "bar"},
         {},
-        {},
     ]
+    get_action_sender_mock.return_value.__enter__.return_value.side_effect = [{}]
 
     test_actions = [
         {
@@ -189,11 +199,18 @@ def test_run_actions_errored_call(get_action_sender_mock):
     assert actions_data["X"]["results"] == [{}]
 
 
+@patch("cicada2.engine.actions.get_action_stream_sender")
 @patch("cicada2.engine.actions.get_action_sender")
-def test_run_actions_non_versioned(get_action_sender_mock):
+def test_run_actions_non_versioned(
+    get_action_sender_mock, get_action_stream_sender_mock
+):
     get_action_sender_mock.return_value.__enter__.return_value.return_value = {
         "foo": "bar"
     }
+    get_action_stream_sender_mock.return_value.__enter__.return_value.return_value = [
+        {"foo": "bar"},
+        {"foo": "bar"},
+    ]
 
     test_actions = [
         {
@@ -0,0 +1,185 @@
+import json
+import time
+from concurrent import futures
+from threading import Timer
+from unittest.mock import patch
+
+import grpc
+
+from cicada2.engine import messaging
+from cicada2.protos import runner_pb2, runner_pb2_grpc
+from cicada2.shared.encoding import (
+    SUPPORTED_ENCODINGS,
+    create_action_reply,
+    decode_params,
+)
+
+
+class HealthyRunnerServer(runner_pb2_grpc.RunnerServicer):
+    def Healthcheck(self, request, context):
+        return runner_pb2.HealthcheckReply(ready=True)
+
+
+class UnaryRunnerServer(HealthyRunnerServer):
+    def __init__(self):
+        self.executions = 0
+
+    def Action(self, request, context):
+        self.executions += 1
+        return runner_pb2.ActionReply(outputs=json.dumps({"n": self.executions}))
+
+
+class StreamingRunnerServer(UnaryRunnerServer):
+    def ActionStream(self, request, context):
+        for _ in range(request.executions):
+            self.executions += 1
+
+            if self.executions == 2:
+                yield runner_pb2.ActionReply(error="failed")
+            else:
+                yield runner_pb2.ActionReply(outputs=json.dumps({"n": self.executions}))
+
+
+class EncodingRunnerServer(runner_pb2_grpc.RunnerServicer):
+    def Action(self, request, context):
+        return create_action_reply(decode_params(request), request.encoding)
+
+    def Healthcheck(self, request, context):
+        return runner_pb2.HealthcheckReply(ready=True, encodings=SUPPORTED_ENCODINGS)
+
+
+def create_server(servicer=None):
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=1))
+    runner_pb2_grpc.add_RunnerServicer_to_server(
+        servicer or HealthyRunnerServer(), server
+    )
+    port = server.add_insecure_port("localhost:0")
+
+    return server, port
+
+
+def test_wait_for_runner_ready():
+    server, port = create_server()
+    # Start runner after engine begins waiting for it
+    start_timer = Timer(0.3, server.start)
+    start_timer.start()
+
+    try:
+        start = time.monotonic()
+
+        assert messaging.wait_for_runner_ready(f"localhost:{port}", timeout=10)
+        assert time.monotonic() - start < 2
+    finally:
+        start_timer.cancel()
+        messaging.close_channel(f"localhost:{port}")
+        server.stop(None)
+
+
+def test_wait_for_runner_ready_timeout():
+    server, port = create_server()
+    server.stop(None)
+
+    assert not messaging.wait_for_runner_ready(f"localhost:{port}", timeout=0.5)
+    messaging.close_channel(f"localhost:{port}")
+
+
+def test_get_channel_reused():
+    channel = messaging.get_channel("alpha:50051")
+
+    try:
+        assert messaging.get_channel("alpha:50051") is channel
+        assert messaging.get_channel("bravo:50051") is not channel
+    finally:
+        messaging.close_channel("alpha:50051")
+        messaging.close_channel("bravo:50051")
+
+
+def test_close_channel():
+    channel = messaging.get_channel("alpha:50051")
+    messaging.close_channel("alpha:50051")
+
+    assert "alpha:50051" not in messaging.CHANNELS
+    assert messaging.get_channel("alpha:50051") is not channel
+
+    messaging.close_channel("alpha:50051")
+    # Closing an unknown runner does nothing
+    messaging.close_channel("alpha:50051")
+
+
+def test_runner_healthcheck_reuses_channel():
+    server, port = create_server()
+    server.start()
+    runner_address = f"localhost:{port}"
+
+    try:
+        assert messaging.runner_healthcheck(runner_address)
+        channel = messaging.CHANNELS[runner_address]
+
+        assert messaging.runner_healthcheck(runner_address)
+        assert messaging.CHANNELS[runner_address] is channel
+    finally:
+        messaging.close_channel(runner_address)
+        server.stop(None)
+
+
+def test_action_stream_sender():
+    server, port = create_server(StreamingRunnerServer())
+    server.start()
+    runner_address = f"localhost:{port}"
+
+    try:
+        with messaging.get_action_stream_sender(runner_address) as stream_action:
+            results = list(stream_action({"type": "POST", "params": {}}, 3))
+
+        assert results == [{"n": 1}, None, {"n": 3}]
+        assert runner_address not in messaging.UNARY_ONLY_RUNNERS
+    finally:
+        messaging.close_channel(runner_address)
+        server.stop(None)
+
+
+def test_action_stream_sender_unary_fallback():
+    server, port = create_server(UnaryRunnerServer())
+    server.start()
+    runner_address = f"localhost:{port}"
+
+    try:
+        with messaging.get_action_stream_sender(runner_address) as stream_action:
+            results = list(stream_action({"type": "POST", "params": {}}, 3))
+
+        assert results == [{"n": 1}, {"n": 2}, {"n": 3}]
+        assert runner_address in messaging.UNARY_ONLY_RUNNERS
+    finally:
+        messaging.close_channel(runner_address)
+        server.stop(None)
+
+    assert runner_address not in messaging.UNARY_ONLY_RUNNERS
+
+
+def test_select_encoding():
+    with patch("cicada2.engine.messaging.RUNNER_ENCODING", "msgpack"):
+        assert messaging.select_encoding(SUPPORTED_ENCODINGS) == runner_pb2.MSGPACK
+        assert messaging.select_encoding([]) == runner_pb2.JSON
+
+    with patch("cicada2.engine.messaging.RUNNER_ENCODING", "json"):
+        assert messaging.select_encoding(SUPPORTED_ENCODINGS) == runner_pb2.JSON
+
+
+@patch("cicada2.engine.messaging.RUNNER_ENCODING", "msgpack")
+def test_action_sender_negotiated_encoding():
+    server, port = create_server(EncodingRunnerServer())
+    server.start()
+    runner_address = f"localhost:{port}"
+    action = {"type": "POST", "params": {"body": b"\x00", "foo": [1, 2]}}
+
+    try:
+        assert messaging.runner_healthcheck(runner_address)
+        assert messaging.RUNNER_ENCODINGS[runner_address] == runner_pb2.MSGPACK
+
+        with messaging.get_action_sender(runner_address) as send_action:
+            assert send_action(action) == action["params"]
+    finally:
+        messaging.close_channel(runner_address)
+        server.stop(None)
+
+    assert runner_address not in messaging.RUNNER_ENCODINGS
@@ -1,5 +1,7 @@
 # from cicada2.engine import state
 # from tempfile import template
+from unittest.mock import patch
+
 import pytest
 from cicada2.shared.errors import ValidationError
 from cicada2.engine import parsing
@@ -113,3 +115,95 @@ def test_render_section_invalid_template():
 
     with pytest.raises(ValidationError):
         parsing.render_section(section, state=state)
+
+
+def test_render_section_template_cache():
+    section = {"foo": "{{ state['bar'] }} cache test"}
+
+    parsing.compile_template.cache_clear()
+
+    assert parsing.render_section(section, state={"bar": 1}) == {"foo": "1 cache test"}
+    assert parsing.render_section(section, state={"bar": 2}) == {"foo": "2 cache test"}
+
+    cache_info = parsing.get_template_cache_info()
+
+    assert cache_info.hits == 1
+    assert cache_info.misses == 1
+
+
+def test_is_static_string():
+    assert parsing.is_static_string("http://api:8080/members")
+    assert not parsing.is_static_string("{{ state['foo'] }}")
+    assert not parsing.is_static_string("{% if true %}foo{% endif %}")
+    assert not parsing.is_static_string("8080")
+    assert not parsing.is_static_string("yes")
+    assert not parsing.is_static_string("foo: bar")
+
+
+def test_mark_static_sections():
+    section = {
+        "type": "POST",
+        "params": {
+            "url": "http://api:8080/members",
+            "headers": {"Content-Type": "application/json"},
+            "body": {"name": "{{ state['name'] }}", "age": 30},
+        },
+        "asserts": [{"type": "StatusCode", "params": {"expected": 200}}],
+        "outputs": [{"name": "id", "template": "value: 1"}],
+    }
+
+    marked_section = parsing.mark_static_sections(section)
+
+    assert marked_section == section
+    assert not isinstance(marked_section, parsing.StaticSection)
+    assert isinstance(marked_section["type"], parsing.StaticString)
+    assert isinstance(marked_section["params"]["headers"], parsing.StaticSection)
+    assert not isinstance(marked_section["params"]["body"], parsing.StaticSection)
+    assert isinstance(marked_section["asserts"][0], parsing.StaticSection)
+    assert not isinstance(marked_section["outputs"][0], parsing.StaticSection)
+
+
+def test_render_section_static_sections():
+    section = {
+        "url": "http://api:8080/members",
+        "port": "8080",
+        "headers": {"Content-Type": "application/json"},
+        "body": {"name": "{{ state['name'] }}", "enabled": "yes"},
+    }
+    state = {"name": "jeff"}
+
+    marked_section = parsing.mark_static_sections(section)
+    rendered_section = parsing.render_section(marked_section, state=state)
+
+    assert rendered_section == parsing.render_section(section, state=state)
+    assert rendered_section["port"] == 8080
+    assert rendered_section["body"] == {"name": "jeff", "enabled": True}
+    assert rendered_section["headers"] is marked_section["headers"]
+
+
+def test_compile_native_expression():
+    assert parsing.compile_native_expression("{{ 1 + 1 }}")() == 2
+    assert parsing.compile_native_expression(" {{- 'yes' -}} \n")() == "yes"
+    assert parsing.compile_native_expression("{{ foo }} {{ bar }}") is None
+    assert parsing.compile_native_expression("foo: {{ bar }}") is None
+    assert parsing.compile_native_expression("{% if true %}{{ 1 }}{% endif %}") is None
+
+
+@patch("cicada2.engine.parsing.TEMPLATE_MODE", "native")
+def test_render_section_native():
+    section = {
+        "body": "{{ state['body'] }}",
+        "answer": "{{ state['answer'] }}",
+        "missing": "{{ state['missing'] }}",
+        "block": "{% for i in state['ids'] %}- {{ i }}\n{% endfor %}",
+    }
+    state = {"body": {"id": "123", "tags": ["a"]}, "answer": "yes", "ids": [1, 2]}
+
+    rendered_section = parsing.render_section(section, state=state)
+
+    assert rendered_section == {
+        "body": {"id": "123", "tags": ["a"]},
+        "answer": "yes",
+        "missing": None,
+        "block": [1, 2],
+    }
@@ -1,6 +1,11 @@
-from unittest.mock import patch
+import time
+from threading import Barrier, Lock
+from unittest.mock import Mock, patch
+
+import pytest
 
 from cicada2.engine import runners
+from cicada2.shared.errors import ValidationError
 
 
 def test_config_to_runner_env():
@@ -11,19 +16,220 @@ def test_config_to_runner_env():
     assert env_config == {"RUNNER_FOO": "bar", "RUNNER_FIZZ": "buzz"}
 
 
-@patch("cicada2.engine.runners.runner_healthcheck")
-def test_runner_healthcheck_success(runner_healthcheck_mock):
+@patch("cicada2.engine.runners.get_healthcheck_sender")
+def test_runner_healthcheck_success(get_healthcheck_sender_mock):
+    runner_healthcheck_mock = get_healthcheck_sender_mock.return_value.__enter__()
     runner_healthcheck_mock.side_effect = [False, False, True]
 
     assert runners.container_is_healthy(
-        hostname="alpha", initial_wait_time=0, max_retries=3
+        hostname="alpha", initial_wait_time=0, max_retries=3, mode="backoff"
     )
+    get_healthcheck_sender_mock.assert_called_once_with("alpha")
 
 
-@patch("cicada2.engine.runners.runner_healthcheck")
-def test_runner_healthcheck_failure(runner_healthcheck_mock):
+@patch("cicada2.engine.runners.get_healthcheck_sender")
+def test_runner_healthcheck_failure(get_healthcheck_sender_mock):
+    runner_healthcheck_mock = get_healthcheck_sender_mock.return_value.__enter__()
     runner_healthcheck_mock.return_value = False
 
     assert not runners.container_is_healthy(
-        hostname="alpha", initial_wait_time=0, max_retries=3
+        hostname="alpha", initial_wait_time=0, max_retries=3, mode="backoff"
     )
+
+
+@patch("cicada2.engine.runners.wait_for_runner_ready")
+def test_runner_healthcheck_watch(wait_for_runner_ready_mock):
+    wait_for_runner_ready_mock.return_value = True
+
+    assert runners.container_is_healthy(hostname="alpha", mode="watch", timeout=5)
+    wait_for_runner_ready_mock.assert_called_once_with("alpha", 5)
+
+
+def test_runner_healthcheck_invalid_mode():
+    with pytest.raises(ValidationError):
+        runners.container_is_healthy(hostname="alpha", mode="foo")
+
+
+def create_test_pool(max_size=10, idle_ttl=60):
+    created_runners = []
+    removed_runners = []
+
+    def create_runner(image, env_map, run_id, volumes=None):
+        runner = f"{image}-{len(created_runners)}"
+        created_runners.append(runner)
+        return runner
+
+    pool = runners.RunnerPool(
+        create_runner,
+        removed_runners.append,
+        lambda runner: f"{runner}:50051",
+        max_size=max_size,
+        idle_ttl=idle_ttl,
+    )
+
+    return pool, created_runners, removed_runners
+
+
+@patch("cicada2.engine.runners.runner_healthcheck")
+def test_runner_pool_reuses_runner(runner_healthcheck_mock):
+    runner_healthcheck_mock.return_value = True
+    pool, created_runners, removed_runners = create_test_pool()
+
+    runner = pool.lease_runner("alpha", {"RUNNER_FOO": "bar"}, "run")
+    pool.release_runner(runner)
+
+    assert pool.lease_runner("alpha", {"RUNNER_FOO": "bar"}, "run") == runner
+    assert created_runners == ["alpha-0"]
+    assert removed_runners == []
+
+
+@patch("cicada2.engine.runners.runner_healthcheck")
+def test_runner_pool_different_config(runner_healthcheck_mock):
+    runner_healthcheck_mock.return_value = True
+    pool, created_runners, _ = create_test_pool()
+
+    runner = pool.lease_runner("alpha", {"RUNNER_FOO": "bar"}, "run")
+    pool.release_runner(runner)
+
+    pool.lease_runner("alpha", {"RUNNER_FOO": "baz"}, "run")
+    pool.lease_runner(
+        "alpha",
+        {"RUNNER_FOO": "bar"},
+        "run",
+        volumes=[{"source": "/foo", "destination": "/bar"}],
+    )
+
+    assert created_runners == ["alpha-0", "alpha-1", "alpha-2"]
+
+
+@patch("cicada2.engine.runners.runner_healthcheck")
+def test_runner_pool_unhealthy_runner(runner_healthcheck_mock):
+    runner_healthcheck_mock.return_value = False
+    pool, created_runners, removed_runners = create_test_pool()
+
+    runner = pool.lease_runner("alpha", {}, "run")
+    pool.release_runner(runner)
+
+    assert pool.lease_runner("alpha", {}, "run") == "alpha-1"
+    assert created_runners == ["alpha-0", "alpha-1"]
+    assert removed_runners == ["alpha-0"]
+
+
+def test_runner_pool_max_size():
+    pool, _, removed_runners = create_test_pool(max_size=1)
+
+    runner_a = pool.lease_runner("alpha", {}, "run")
+    runner_b = pool.lease_runner("alpha", {}, "run")
+
+    pool.release_runner(runner_a)
+    pool.release_runner(runner_b)
+
+    assert removed_runners == [runner_a]
+
+
+def test_runner_pool_disabled():
+    pool, _, removed_runners = create_test_pool(max_size=0)
+
+    runner = pool.lease_runner("alpha", {}, "run")
+    pool.release_runner(runner)
+
+    assert removed_runners == [runner]
+
+
+def test_runner_pool_idle_ttl():
+    pool, created_runners, removed_runners = create_test_pool(idle_ttl=-1)
+
+    runner = pool.lease_runner("alpha", {}, "run")
+    pool.release_runner(runner)
+
+    assert removed_runners == [runner]
+    assert pool.lease_runner("alpha", {}, "run") == "alpha-1"
+    assert created_runners == ["alpha-0", "alpha-1"]
+
+
+def test_runner_pool_reaps_idle_runners():
+    pool, _, removed_runners = create_test_pool(idle_ttl=0.05)
+
+    runner = pool.lease_runner("alpha", {}, "run")
+    pool.release_runner(runner)
+
+    # Removed without another lease or release
+    for _ in range(100):
+        if removed_runners:
+            break
+
+        time.sleep(0.01)
+
+    assert removed_runners == [runner]
+    assert pool.idle_runners == []
+
+
+def test_runner_pool_close():
+    pool, _, removed_runners = create_test_pool()
+
+    runner_a = pool.lease_runner("alpha", {}, "run")
+    runner_b = pool.lease_runner("bravo", {}, "run")
+
+    pool.release_runner(runner_a)
+    pool.release_runner(runner_b)
+    pool.close()
+
+    assert removed_runners == [runner_a, runner_b]
+    assert pool.reap_timer is None
+
+
+def test_create_runners():
+    created_runners, runner_startup_times = runners.create_runners(
+        lambda image, env_map, run_id, volumes=None: f"{image}-runner",
+        Mock(),
+        "alpha",
+        {},
+        "run",
+        runner_count=3,
+    )
+
+    assert created_runners == ["alpha-runner"] * 3
+    assert len(runner_startup_times) == 3
+
+
+def test_create_runners_concurrently():
+    barrier = Barrier(3, timeout=5)
+
+    def create_runner(image, env_map, run_id, volumes=None):
+        # Fails with BrokenBarrierError unless all 3 runners are created at once
+        barrier.wait()
+        return image
+
+    created_runners, _ = runners.create_runners(
+        create_runner, Mock(), "alpha", {}, "run", runner_count=3, max_concurrency=3
+    )
+
+    assert created_runners == ["alpha"] * 3
+
+
+def test_create_runners_partial_failure():
+    remove_runner_mock = Mock()
+    runner_results = iter(["runner-0", RuntimeError("foo"), "runner-2"])
+    lock = Lock()
+
+    def create_runner(image, env_map, run_id, volumes=None):
+        with lock:
+            result = next(runner_results)
+
+        if isinstance(result, Exception):
+            raise result
+
+        return result
+
+    with pytest.raises(RuntimeError, match="Unable to create 1 of 3 runners: foo"):
+        runners.create_runners(
+            create_runner,
+            remove_runner_mock,
+            "alpha",
+            {},
+            "run",
+            runner_count=3,
+            max_concurrency=1,
+        )
+
+    assert remove_runner_mock.call_count == 2
@@ -1,6 +1,10 @@
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
+
+import pytest
+from dask.distributed import Client
 
 from cicada2.engine import scheduling
+from cicada2.shared.errors import ValidationError
 
 
 def test_sort_dependencies():
@@ -104,3 +108,120 @@ def test_all_tests_finished_both_done():
     test_statuses = {"A": mock_a, "B": mock_b}
 
     assert scheduling.all_tests_finished(test_statuses)
+
+
+def test_get_test_dependents():
+    dependency_map = {"A": [], "B": ["A"], "C": ["A", "B"]}
+
+    test_dependents = scheduling.get_test_dependents(dependency_map)
+
+    assert test_dependents == {"A": ["B", "C"], "B": ["C"], "C": []}
+
+
+def test_create_test_state():
+    dependency_map = {"A": [], "B": [], "C": ["A", "B"]}
+
+    mock_a = Mock()
+    mock_a.result.return_value = {
+        "A": {"summary": {"error": None, "remaining_asserts": []}}
+    }
+
+    mock_b = Mock()
+    mock_b.result.return_value = {
+        "B": {"summary": {"error": "failed", "remaining_asserts": []}}
+    }
+
+    test_statuses = {"A": mock_a, "B": mock_b, "C": None}
+
+    state, has_failed_dependencies = scheduling.create_test_state(
+        "C", test_statuses, dependency_map, {"foo": "bar"}
+    )
+
+    assert state == {
+        "globals": {},
+        "foo": "bar",
+        "A": {"summary": {"error": None, "remaining_asserts": []}},
+    }
+    assert has_failed_dependencies
+
+
+def test_skip_test():
+    state = scheduling.skip_test({"globals": {}}, "A", {"description": "foo"})
+
+    assert state["A"]["summary"]["error"] == "skipped"
+    assert state["A"]["summary"]["description"] == "foo"
+
+
+def test_schedule_tests():
+    def create_runner(test_name, error=None):
+        def runner(state):
+            return {
+                **state,
+                test_name: {
+                    "summary": {"error": error, "remaining_asserts": [], "ran": True}
+                },
+            }
+
+        return runner
+
+    test_configs = {
+        "A": {"name": "A"},
+        "B": {"name": "B"},
+        "C": {"name": "C"},
+        "D": {"name": "D", "runIfFailedDependency": True},
+    }
+    test_runners = {
+        "A": create_runner("A"),
+        "B": create_runner("B", error="failed"),
+        "C": create_runner("C"),
+        "D": create_runner("D"),
+    }
+    test_dependencies = {"A": [], "B": ["A"], "C": ["B"], "D": ["A", "B"]}
+
+    client = Client(processes=False)
+
+    try:
+        test_statuses = scheduling.schedule_tests(
+            client, test_configs, test_runners, test_dependencies, {}
+        )
+
+        assert scheduling.all_tests_finished(test_statuses)
+        assert "A" in test_statuses["B"].result()
+        assert test_statuses["C"].result()["C"]["summary"]["error"] == "skipped"
+        assert test_statuses["D"].result()["D"]["summary"]["ran"]
+        assert "B" not in test_statuses["D"].result()
+    finally:
+        client.close()
+
+
+def test_schedule_tests_circular_dependencies():
+    test_dependencies = {"A": ["B"], "B": ["A"]}
+
+    client = Client(processes=False)
+
+    try:
+        with pytest.raises(ValidationError):
+            scheduling.schedule_tests(
+                client,
+                {"A": {}, "B": {}},
+                {"A": Mock(), "B": Mock()},
+                test_dependencies,
+                {},
+            )
+    finally:
+        client.close()
+
+
+@patch("cicada2.engine.scheduling.clean_docker_containers")
+@patch("cicada2.engine.scheduling.load_tests_tree")
+@patch("cicada2.engine.scheduling.create_runner_pool")
+def test_run_tests_closes_pool_on_error(
+    create_runner_pool_mock, load_tests_tree_mock, clean_docker_containers_mock
+):
+    load_tests_tree_mock.side_effect = ValidationError("Invalid test")
+
+    with pytest.raises(ValidationError):
+        scheduling.run_tests(tasks_type="docker", run_id="run")
+
+    create_runner_pool_mock.return_value.close.assert_called_once()
+    clean_docker_containers_mock.assert_called_once_with("run")
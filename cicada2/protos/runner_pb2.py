@@ -2,6 +2,7 @@
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
 # source: cicada2/protos/runner.proto
 
+from google.protobuf.internal import enum_type_wrapper
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import message as _message
 from google.protobuf import reflection as _reflection
@@ -20,10 +21,44 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   syntax='proto3',
   serialized_options=None,
   create_key=_descriptor._internal_create_key,
-  serialized_pb=b'\n\x1b\x63icada2/protos/runner.proto\x12\x08\x63icada_2\x1a\x1bgoogle/protobuf/empty.proto\"-\n\rActionRequest\x12\x0c\n\x04type\x18\x01 \x01(\t\x12\x0e\n\x06params\x18\x02 \x01(\t\"\x1e\n\x0b\x41\x63tionReply\x12\x0f\n\x07outputs\x18\x01 \x01(\t\"-\n\rAssertRequest\x12\x0c\n\x04type\x18\x01 \x01(\t\x12\x0e\n\x06params\x18\x02 \x01(\t\"T\n\x0b\x41ssertReply\x12\x0e\n\x06passed\x18\x01 \x01(\x08\x12\x0e\n\x06\x61\x63tual\x18\x02 \x01(\t\x12\x10\n\x08\x65xpected\x18\x03 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x04 \x01(\t\"!\n\x10HealthcheckReply\x12\r\n\x05ready\x18\x01 \x01(\x08\x32\xbf\x01\n\x06Runner\x12\x38\n\x06\x41\x63tion\x12\x17.cicada_2.ActionRequest\x1a\x15.cicada_2.ActionReply\x12\x38\n\x06\x41ssert\x12\x17.cicada_2.AssertRequest\x1a\x15.cicada_2.AssertReply\x12\x41\n\x0bHealthcheck\x12\x16.google.protobuf.Empty\x1a\x1a.cicada_2.HealthcheckReplyb\x06proto3'
+  serialized_pb=b'\n\x1b\x63icada2/protos/runner.proto\x12\x08\x63icada_2\x1a\x1bgoogle/protobuf/empty.proto\"k\n\rActionRequest\x12\x0c\n\x04type\x18\x01 \x01(\t\x12\x0e\n\x06params\x18\x02 \x01(\t\x12$\n\x08\x65ncoding\x18\x03 \x01(\x0e\x32\x12.cicada_2.Encoding\x12\x16\n\x0e\x65ncoded_params\x18\x04 \x01(\x0c\"\xa9\x01\n\x13\x41\x63tionStreamRequest\x12\x0c\n\x04type\x18\x01 \x01(\t\x12\x0e\n\x06params\x18\x02 \x01(\t\x12\x12\n\nexecutions\x18\x03 \x01(\x05\x12\"\n\x1aseconds_between_executions\x18\x04 \x01(\x01\x12$\n\x08\x65ncoding\x18\x05 \x01(\x0e\x32\x12.cicada_2.Encoding\x12\x16\n\x0e\x65ncoded_params\x18\x06 \x01(\x0c\"l\n\x0b\x41\x63tionReply\x12\x0f\n\x07outputs\x18\x01 \x01(\t\x12\r\n\x05\x65rror\x18\x02 \x01(\t\x12$\n\x08\x65ncoding\x18\x03 \x01(\x0e\x32\x12.cicada_2.Encoding\x12\x17\n\x0f\x65ncoded_outputs\x18\x04 \x01(\x0c\"k\n\rAssertRequest\x12\x0c\n\x04type\x18\x01 \x01(\t\x12\x0e\n\x06params\x18\x02 \x01(\t\x12$\n\x08\x65ncoding\x18\x03 \x01(\x0e\x32\x12.cicada_2.Encoding\x12\x16\n\x0e\x65ncoded_params\x18\x04 \x01(\x0c\"T\n\x0b\x41ssertReply\x12\x0e\n\x06passed\x18\x01 \x01(\x08\x12\x0e\n\x06\x61\x63tual\x18\x02 \x01(\t\x12\x10\n\x08\x65xpected\x18\x03 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x04 \x01(\t\"H\n\x10HealthcheckReply\x12\r\n\x05ready\x18\x01 \x01(\x08\x12%\n\tencodings\x18\x02 \x03(\x0e\x32\x12.cicada_2.Encoding*-\n\x08\x45ncoding\x12\x08\n\x04JSON\x10\x00\x12\n\n\x06STRUCT\x10\x01\x12\x0b\n\x07MSGPACK\x10\x02\x32\x87\x02\n\x06Runner\x12\x38\n\x06\x41\x63tion\x12\x17.cicada_2.ActionRequest\x1a\x15.cicada_2.ActionReply\x12\x46\n\x0c\x41\x63tionStream\x12\x1d.cicada_2.ActionStreamRequest\x1a\x15.cicada_2.ActionReply0\x01\x12\x38\n\x06\x41ssert\x12\x17.cicada_2.AssertRequest\x1a\x15.cicada_2.AssertReply\x12\x41\n\x0bHealthcheck\x12\x16.google.protobuf.Empty\x1a\x1a.cicada_2.HealthcheckReplyb\x06proto3'
   ,
   dependencies=[google_dot_protobuf_dot_empty__pb2.DESCRIPTOR,])
 
+_ENCODING = _descriptor.EnumDescriptor(
+  name='Encoding',
+  full_name='cicada_2.Encoding',
+  filename=None,
+  file=DESCRIPTOR,
+  create_key=_descriptor._internal_create_key,
+  values=[
+    _descriptor.EnumValueDescriptor(
+      name='JSON', index=0, number=0,
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
+    _descriptor.EnumValueDescriptor(
+      name='STRUCT', index=1, number=1,
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
+    _descriptor.EnumValueDescriptor(
+      name='MSGPACK', index=2, number=2,
+      serialized_options=None,
+      type=None,
+      create_key=_descriptor._internal_create_key),
+  ],
+  containing_type=None,
+  serialized_options=None,
+  serialized_start=730,
+  serialized_end=775,
+)
+_sym_db.RegisterEnumDescriptor(_ENCODING)
+
+Encoding = enum_type_wrapper.EnumTypeWrapper(_ENCODING)
+JSON = 0
+STRUCT = 1
+MSGPACK = 2
 
 
 
@@ -49,6 +84,20 @@ _ACTIONREQUEST = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='encoding', full_name='cicada_2.ActionRequest.encoding', index=2,
+      number=3, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='encoded_params', full_name='cicada_2.ActionRequest.encoded_params', index=3,
+      number=4, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"",
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -62,7 +111,74 @@ _ACTIONREQUEST = _descriptor.Descriptor(
   oneofs=[
   ],
   serialized_start=70,
-  serialized_end=115,
+  serialized_end=177,
+)
+
+
+_ACTIONSTREAMREQUEST = _descriptor.Descriptor(
+  name='ActionStreamRequest',
+  full_name='cicada_2.ActionStreamRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='type', full_name='cicada_2.ActionStreamRequest.type', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='params', full_name='cicada_2.ActionStreamRequest.params', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='executions', full_name='cicada_2.ActionStreamRequest.executions', index=2,
+      number=3, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='seconds_between_executions', full_name='cicada_2.ActionStreamRequest.seconds_between_executions', index=3,
+      number=4, type=1, cpp_type=5, label=1,
+      has_default_value=False, default_value=float(0),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='encoding', full_name='cicada_2.ActionStreamRequest.encoding', index=4,
+      number=5, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='encoded_params', full_name='cicada_2.ActionStreamRequest.encoded_params', index=5,
+      number=6, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"",
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=180,
+  serialized_end=349,
 )
 
 
@@ -81,6 +197,27 @@ _ACTIONREPLY = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='error', full_name='cicada_2.ActionReply.error', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='encoding', full_name='cicada_2.ActionReply.encoding', index=2,
+      number=3, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='encoded_outputs', full_name='cicada_2.ActionReply.encoded_outputs', index=3,
+      number=4, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"",
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -93,8 +230,8 @@ _ACTIONREPLY = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=117,
-  serialized_end=147,
+  serialized_start=351,
+  serialized_end=459,
 )
 
 
@@ -120,6 +257,20 @@ _ASSERTREQUEST = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='encoding', full_name='cicada_2.AssertRequest.encoding', index=2,
+      number=3, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='encoded_params', full_name='cicada_2.AssertRequest.encoded_params', index=3,
+      number=4, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"",
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -132,8 +283,8 @@ _ASSERTREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=149,
-  serialized_end=194,
+  serialized_start=461,
+  serialized_end=568,
 )
 
 
@@ -185,8 +336,8 @@ _ASSERTREPLY = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=196,
-  serialized_end=280,
+  serialized_start=570,
+  serialized_end=654,
 )
 
 
@@ -205,6 +356,13 @@ _HEALTHCHECKREPLY = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='encodings', full_name='cicada_2.HealthcheckReply.encodings', index=1,
+      number=2, type=14, cpp_type=8, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -217,15 +375,22 @@ _HEALTHCHECKREPLY = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=282,
-  serialized_end=315,
+  serialized_start=656,
+  serialized_end=728,
 )
 
+_ACTIONREQUEST.fields_by_name['encoding'].enum_type = _ENCODING
+_ACTIONSTREAMREQUEST.fields_by_name['encoding'].enum_type = _ENCODING
+_ACTIONREPLY.fields_by_name['encoding'].enum_type = _ENCODING
+_ASSERTREQUEST.fields_by_name['encoding'].enum_type = _ENCODING
+_HEALTHCHECKREPLY.fields_by_name['encodings'].enum_type = _ENCODING
 DESCRIPTOR.message_types_by_name['ActionRequest'] = _ACTIONREQUEST
+DESCRIPTOR.message_types_by_name['ActionStreamRequest'] = _ACTIONSTREAMREQUEST
 DESCRIPTOR.message_types_by_name['ActionReply'] = _ACTIONREPLY
 DESCRIPTOR.message_types_by_name['AssertRequest'] = _ASSERTREQUEST
 DESCRIPTOR.message_types_by_name['AssertReply'] = _ASSERTREPLY
 DESCRIPTOR.message_types_by_name['HealthcheckReply'] = _HEALTHCHECKREPLY
+DESCRIPTOR.enum_types_by_name['Encoding'] = _ENCODING
 _sym_db.RegisterFileDescriptor(DESCRIPTOR)
 
 ActionRequest = _reflection.GeneratedProtocolMessageType('ActionRequest', (_message.Message,), {
@@ -235,6 +400,13 @@ ActionRequest = _reflection.GeneratedProtocolMessageType('ActionRequest', (_mess
   })
 _sym_db.RegisterMessage(ActionRequest)
 
+ActionStreamRequest = _reflection.GeneratedProtocolMessageType('ActionStreamRequest', (_message.Message,), {
+  'DESCRIPTOR' : _ACTIONSTREAMREQUEST,
+  '__module__' : 'cicada2.protos.runner_pb2'
+  # @@protoc_insertion_point(class_scope:cicada_2.ActionStreamRequest)
+  })
+_sym_db.RegisterMessage(ActionStreamRequest)
+
 ActionReply = _reflection.GeneratedProtocolMessageType('ActionReply', (_message.Message,), {
   'DESCRIPTOR' : _ACTIONREPLY,
   '__module__' : 'cicada2.protos.runner_pb2'
@@ -272,8 +444,8 @@ _RUNNER = _descriptor.ServiceDescriptor(
   index=0,
   serialized_options=None,
   create_key=_descriptor._internal_create_key,
-  serialized_start=318,
-  serialized_end=509,
+  serialized_start=778,
+  serialized_end=1041,
   methods=[
   _descriptor.MethodDescriptor(
     name='Action',
@@ -285,10 +457,20 @@ _RUNNER = _descriptor.ServiceDescriptor(
     serialized_options=None,
     create_key=_descriptor._internal_create_key,
   ),
+  _descriptor.MethodDescriptor(
+    name='ActionStream',
+    full_name='cicada_2.Runner.ActionStream',
+    index=1,
+    containing_service=None,
+    input_type=_ACTIONSTREAMREQUEST,
+    output_type=_ACTIONREPLY,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
   _descriptor.MethodDescriptor(
     name='Assert',
     full_name='cicada_2.Runner.Assert',
-    index=1,
+    index=2,
     containing_service=None,
     input_type=_ASSERTREQUEST,
     output_type=_ASSERTREPLY,
@@ -298,7 +480,7 @@ _RUNNER = _descriptor.ServiceDescriptor(
   _descriptor.MethodDescriptor(
     name='Healthcheck',
     full_name='cicada_2.Runner.Healthcheck',
-    index=2,
+    index=3,
     containing_service=None,
     input_type=google_dot_protobuf_dot_empty__pb2._EMPTY,
     output_type=_HEALTHCHECKREPLY,
@@ -20,6 +20,11 @@ class RunnerStub(object):
                 request_serializer=cicada2_dot_protos_dot_runner__pb2.ActionRequest.SerializeToString,
                 response_deserializer=cicada2_dot_protos_dot_runner__pb2.ActionReply.FromString,
                 )
+        self.ActionStream = channel.unary_stream(
+                '/cicada_2.Runner/ActionStream',
+                request_serializer=cicada2_dot_protos_dot_runner__pb2.ActionStreamRequest.SerializeToString,
+                response_deserializer=cicada2_dot_protos_dot_runner__pb2.ActionReply.FromString,
+                )
         self.Assert = channel.unary_unary(
                 '/cicada_2.Runner/Assert',
                 request_serializer=cicada2_dot_protos_dot_runner__pb2.AssertRequest.SerializeToString,
@@ -41,6 +46,12 @@ class RunnerServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ActionStream(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def Assert(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -61,6 +72,11 @@ def add_RunnerServicer_to_server(servicer, server):
                     request_deserializer=cicada2_dot_protos_dot_runner__pb2.ActionRequest.FromString,
                     response_serializer=cicada2_dot_protos_dot_runner__pb2.ActionReply.SerializeToString,
             ),
+            'ActionStream': grpc.unary_stream_rpc_method_handler(
+                    servicer.ActionStream,
+                    request_deserializer=cicada2_dot_protos_dot_runner__pb2.ActionStreamRequest.FromString,
+                    response_serializer=cicada2_dot_protos_dot_runner__pb2.ActionReply.SerializeToString,
+            ),
             'Assert': grpc.unary_unary_rpc_method_handler(
                     servicer.Assert,
                     request_deserializer=cicada2_dot_protos_dot_runner__pb2.AssertRequest.FromString,
@@ -97,6 +113,22 @@ class Runner(object):
             options, channel_credentials,
             call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def ActionStream(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/cicada_2.Runner/ActionStream',
+            cicada2_dot_protos_dot_runner__pb2.ActionStreamRequest.SerializeToString,
+            cicada2_dot_protos_dot_runner__pb2.ActionReply.FromString,
+            options, channel_credentials,
+            call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def Assert(request,
             target,
@@ -1,16 +1,24 @@
+import atexit
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from os import getenv
 from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional
+from string import Template
+from threading import Lock
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Tuple, Union
 from typing_extensions import TypedDict
 
-from kafka import KafkaConsumer, KafkaProducer
+from kafka import KafkaConsumer, KafkaProducer, TopicPartition, codec
+from kafka.consumer.fetcher import ConsumerRecord
 from kafka.errors import KafkaError
 
 from cicada2.shared.asserts import assert_dicts
-from cicada2.shared.types import AssertResult
+from cicada2.shared.types import AssertResult, LatencyStats
 from cicada2.shared.logs import get_logger
-from cicada2.shared.util import get_runtime_ms
+from cicada2.shared.util import get_latency_stats, get_runtime_ms
 
 
 LOGGER = get_logger("kafka-runner")
@@ -20,6 +28,9 @@ class KafkaMessage(TypedDict):
     topic: Optional[str]
     key: Optional[str]
     value: str
+    partition: Optional[int]
+    offset: Optional[int]
+    timestamp: Optional[int]
 
 
 class ActionParams(TypedDict):
@@ -29,6 +40,9 @@ class ActionParams(TypedDict):
     key: Optional[str]
     messages: Optional[List[KafkaMessage]]
     offset: Optional[str]
+    resume: Optional[bool]
+    group_id: Optional[str]
+    parallelism: Optional[int]
 
 
 class ActionResponse(TypedDict):
@@ -38,6 +52,26 @@ class ActionResponse(TypedDict):
     runtime: int
 
 
+class SendBulkParams(TypedDict):
+    topic: str
+    count: Optional[int]
+    key: Optional[str]
+    value: Optional[Any]
+    file: Optional[str]
+    linger_ms: Optional[int]
+    batch_size: Optional[int]
+    compression_type: Optional[str]
+    acks: Optional[Union[int, str]]
+
+
+class SendBulkResponse(TypedDict):
+    messages_sent: int
+    errors: List[str]
+    runtime: float
+    messages_per_second: float
+    ack_latency: Optional[LatencyStats]
+
+
 class AssertParams(TypedDict):
     actionParams: ActionParams
     expected: KafkaMessage
@@ -55,57 +89,418 @@ def extract_auth_parameters() -> Dict[str, str]:
     }
 
 
-@contextmanager
-def configure_consumer(topic: str, offset: str) -> KafkaMessage:
-    bootstrap_servers = [
-        server.strip() for server in getenv("RUNNER_SERVERS").split(",")
-    ]
+def get_bootstrap_servers() -> List[str]:
+    return [server.strip() for server in getenv("RUNNER_SERVERS").split(",")]
+
+
+def create_consumer(
+    topic: str,
+    offset: str,
+    group_id: Optional[str] = None,
+    partitions: Optional[Tuple[int, ...]] = None,
+) -> KafkaConsumer:
     key_encoding = getenv("RUNNER_KEYENCODING", "utf-8")
     value_encoding = getenv("RUNNER_VALUEENCODING", "utf-8")
 
     try:
         consumer = KafkaConsumer(
-            topic,
-            bootstrap_servers=bootstrap_servers,
+            bootstrap_servers=get_bootstrap_servers(),
             key_deserializer=lambda k: k.decode(key_encoding) if k else k,
             value_deserializer=lambda v: v.decode(value_encoding) if v else v,
             auto_offset_reset=offset,
+            group_id=group_id,
+            # Offsets are committed after each action instead
+            enable_auto_commit=False,
             **extract_auth_parameters(),
         )
     except KafkaError as err:
         raise RuntimeError(f"Unable to create kafka consumer: {err}")
 
-    try:
-        yield consumer
-    finally:
-        consumer.close()
+    if partitions is None:
+        consumer.subscribe([topic])
+    else:
+        consumer.assign([TopicPartition(topic, partition) for partition in partitions])
 
+    return consumer
 
-@contextmanager
-def configure_producer() -> KafkaProducer:
-    bootstrap_servers = [
-        server.strip() for server in getenv("RUNNER_SERVERS").split(",")
-    ]
+
+def create_producer(**settings) -> KafkaProducer:
     key_encoding = getenv("RUNNER_KEYENCODING", "utf-8")
     value_encoding = getenv("RUNNER_VALUEENCODING", "utf-8")
 
     try:
-        producer = KafkaProducer(
-            bootstrap_servers=bootstrap_servers,
+        return KafkaProducer(
+            bootstrap_servers=get_bootstrap_servers(),
             key_serializer=lambda k: k.encode(key_encoding) if k else k,
             value_serializer=lambda v: v.encode(value_encoding) if v else v,
             **extract_auth_parameters(),
+            **settings,
         )
     except KafkaError as err:
         raise RuntimeError(f"Unable to create kafka producer: {err}")
 
+
+# Clients are created on first use and kept for the life of the runner, so bootstrapping and fetching metadata is
+# only done once instead of for every action. Encodings are runner config, so topic, offset, group, assigned
+# partitions and whether it resumes identify a consumer
+ProducerKey = Tuple[Tuple[str, Any], ...]
+PRODUCERS: Dict[ProducerKey, KafkaProducer] = {}
+PRODUCERS_LOCK = Lock()
+ConsumerKey = Tuple[str, str, Optional[str], Optional[Tuple[int, ...]], bool]
+CONSUMERS: Dict[ConsumerKey, KafkaConsumer] = {}
+# Consumers are not thread safe, so each one is only used by one action at a time
+CONSUMER_LOCKS: Dict[ConsumerKey, Lock] = {}
+CONSUMERS_LOCK = Lock()
+
+
+@contextmanager
+def configure_consumer(
+    topic: str,
+    offset: str,
+    group_id: Optional[str] = None,
+    resume: bool = False,
+    partitions: Optional[Tuple[int, ...]] = None,
+) -> Iterator[KafkaConsumer]:
+    """
+    Gets the runner's consumer for a topic, positioned at the offset policy like a newly created consumer unless
+    resuming. The consumer is closed and replaced on next use if it raises a KafkaError
+
+    Args:
+        topic: Topic to consume
+        offset: Where to start reading, earliest or latest, if there is no previous position
+        group_id: Consumer group to join and commit offsets to after use, always resumes if set
+        resume: Continue from where the consumer was last used instead of the offset policy
+        partitions: Partitions of topic to assign to the consumer, subscribes to every partition if None
+
+    Returns:
+        Consumer of topic
+    """
+    resume = resume or group_id is not None
+    # Resumed consumers are kept apart so reads that start from the offset policy never move their position
+    key = (topic, offset, group_id, partitions, resume)
+
+    with CONSUMERS_LOCK:
+        consumer_lock = CONSUMER_LOCKS.setdefault(key, Lock())
+
+    with consumer_lock:
+        consumer = CONSUMERS.get(key)
+
+        if consumer is None:
+            consumer = CONSUMERS[key] = create_consumer(
+                topic, offset, group_id, partitions
+            )
+        elif consumer.assignment() and not resume:
+            # Partitions are assigned on first poll, before that the consumer is already at its offset policy
+            if offset == "latest":
+                consumer.seek_to_end()
+            else:
+                consumer.seek_to_beginning()
+
+        try:
+            yield consumer
+
+            if group_id is not None and consumer.assignment():
+                consumer.commit()
+        except KafkaError as err:
+            del CONSUMERS[key]
+            consumer.close()
+
+            raise RuntimeError(f"Kafka consumer failed: {err}")
+
+
+def configure_action_consumer(
+    params: ActionParams, partitions: Optional[Tuple[int, ...]] = None
+) -> ContextManager[KafkaConsumer]:
+    assert "topic" in params, "Must specify topic in action params"
+
+    return configure_consumer(
+        params["topic"],
+        params.get("offset", "earliest"),
+        group_id=params.get("group_id"),
+        resume=params.get("resume", False),
+        partitions=partitions,
+    )
+
+
+@contextmanager
+def configure_producer(settings: Optional[dict] = None) -> Iterator[KafkaProducer]:
+    """
+    Gets the runner's producer for a set of producer settings. Producers are thread safe, so one is shared by every
+    action using the same settings. The producer is closed and replaced on next use if it raises a KafkaError
+
+    Args:
+        settings: KafkaProducer keyword arguments such as linger_ms, defaults used if None
+
+    Returns:
+        Producer
+    """
+    settings = settings or {}
+    key = tuple(sorted(settings.items()))
+
+    with PRODUCERS_LOCK:
+        producer = PRODUCERS.get(key)
+
+        if producer is None:
+            producer = PRODUCERS[key] = create_producer(**settings)
+
     try:
         yield producer
-    finally:
+    except KafkaError as err:
+        with PRODUCERS_LOCK:
+            if PRODUCERS.get(key) is producer:
+                del PRODUCERS[key]
+
         producer.close()
 
+        raise RuntimeError(f"Kafka producer failed: {err}")
+
+
+def close_clients():
+    """
+    Flushes and closes the runner's producers and consumers
+    """
+    with PRODUCERS_LOCK:
+        for producer in PRODUCERS.values():
+            producer.close()
+
+        PRODUCERS.clear()
+
+    with CONSUMERS_LOCK:
+        for key, consumer in list(CONSUMERS.items()):
+            with CONSUMER_LOCKS[key]:
+                consumer.close()
+                CONSUMERS.pop(key, None)
+
+
+atexit.register(close_clients)
+
+
+def record_to_message(topic: str, record: ConsumerRecord) -> KafkaMessage:
+    return KafkaMessage(
+        topic=topic,
+        key=record.key,
+        value=record.value,
+        partition=record.partition,
+        offset=record.offset,
+        timestamp=record.timestamp,
+    )
+
+
+def receive(consumer: KafkaConsumer, params: ActionParams) -> List[KafkaMessage]:
+    records = consumer.poll(
+        timeout_ms=params.get("timeout_ms", 5000),
+        max_records=params.get("max_records"),
+    )
+
+    return [
+        record_to_message(params["topic"], record)
+        for partition_records in records.values()
+        for record in partition_records
+    ]
+
+
+def receive_partitions(
+    params: ActionParams, partitions: Tuple[int, ...]
+) -> List[KafkaMessage]:
+    with configure_action_consumer(params, partitions) as consumer:
+        return receive(consumer, params)
+
+
+def receive_parallel(params: ActionParams) -> List[KafkaMessage]:
+    """
+    Splits the topic's partitions between parallelism consumers that poll at the same time, so many partitions are
+    not drained through a single consumer
+
+    Args:
+        params: Receive params, where timeout_ms and max_records apply to each consumer
+
+    Returns:
+        Messages from every partition, ordered by timestamp, then partition and offset
+    """
+    with configure_action_consumer(params) as consumer:
+        partitions = sorted(consumer.partitions_for_topic(params["topic"]) or [])
+
+    if not partitions:
+        raise RuntimeError(f"No partitions found for topic {params['topic']}")
+
+    parallelism = min(params["parallelism"], len(partitions))
+    partition_groups = [tuple(partitions[i::parallelism]) for i in range(parallelism)]
+
+    with ThreadPoolExecutor(max_workers=parallelism) as executor:
+        partition_messages = executor.map(
+            partial(receive_partitions, params), partition_groups
+        )
+
+    return sorted(
+        (message for messages in partition_messages for message in messages),
+        key=lambda message: (
+            message["timestamp"],
+            message["partition"],
+            message["offset"],
+        ),
+    )
+
+
+# Producer asserts the codec library can be imported, so check it up front instead of after connecting
+COMPRESSION_CHECKS = {
+    "gzip": codec.has_gzip,
+    "snappy": codec.has_snappy,
+    "lz4": codec.has_lz4,
+}
+COMPRESSION_TYPES = [None, *COMPRESSION_CHECKS]
+ACKS = [0, 1, -1, "all"]
+PRODUCER_SETTINGS = ["linger_ms", "batch_size", "compression_type", "acks"]
+
 
-def run_action(action_type: str, params: ActionParams) -> ActionResponse:
+def send_bulk_params_problems(params: SendBulkParams) -> List[str]:
+    problems = []
+
+    if "topic" not in params:
+        problems.append("Missing 'topic' in action params")
+
+    if ("count" in params) == ("file" in params):
+        problems.append("Must specify one of 'count' or 'file' in action params")
+
+    if "file" in params and not params["file"].endswith(".jsonl"):
+        problems.append("'file' must be a .jsonl file")
+
+    compression_type = params.get("compression_type")
+
+    if compression_type not in COMPRESSION_TYPES:
+        problems.append(f"'compression_type' must be one of {COMPRESSION_TYPES[1:]}")
+    elif compression_type is not None and not COMPRESSION_CHECKS[compression_type]():
+        problems.append(
+            f"Library for '{compression_type}' compression is not installed in runner"
+        )
+
+    if params.get("acks", 1) not in ACKS:
+        problems.append(f"'acks' must be one of {ACKS}")
+
+    return problems
+
+
+def stringify_message_value(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+
+    return json.dumps(value)
+
+
+def generate_messages(params: SendBulkParams) -> Iterator[KafkaMessage]:
+    """
+    Creates messages from the key and value templates, substituting $index with the number of the message
+
+    Args:
+        params: Templates and number of messages
+
+    Returns:
+        Messages to send
+    """
+    key_template = Template(params.get("key") or "")
+    value_template = Template(stringify_message_value(params.get("value")) or "")
+
+    for index in range(params["count"]):
+        yield KafkaMessage(
+            topic=params["topic"],
+            key=key_template.safe_substitute(index=index) or None,
+            value=value_template.safe_substitute(index=index) or None,
+        )
+
+
+def read_messages_file(path: str, topic: str) -> Iterator[KafkaMessage]:
+    """
+    Reads messages from a JSONL file one line at a time
+
+    Args:
+        path: Path to file in runner
+        topic: Topic for messages that do not specify one
+
+    Returns:
+        Messages in file
+    """
+    try:
+        messages_file = open(path)
+    except OSError as err:
+        raise ValueError(f"Unable to open messages file: {err}")
+
+    with messages_file:
+        for line in messages_file:
+            if line.strip():
+                message = json.loads(line)
+
+                yield KafkaMessage(
+                    topic=message.get("topic") or topic,
+                    key=stringify_message_value(message.get("key")),
+                    value=stringify_message_value(message.get("value")),
+                )
+
+
+def run_send_bulk(params: SendBulkParams) -> SendBulkResponse:
+    """
+    Produces messages created in the runner instead of sent in the action params, so large numbers of messages do
+    not have to be sent from the engine
+
+    Args:
+        params: Messages to create and producer settings
+
+    Returns:
+        Messages sent, send rate and latency between sending each message and the broker acknowledging its batch
+    """
+    params_problems = send_bulk_params_problems(params)
+
+    if params_problems:
+        raise ValueError(f"Params invalid: {', '.join(params_problems)}")
+
+    if "file" in params:
+        messages = read_messages_file(params["file"], params["topic"])
+    else:
+        messages = generate_messages(params)
+
+    settings = {
+        setting: params[setting] for setting in PRODUCER_SETTINGS if setting in params
+    }
+    messages_sent = 0
+    errors = []
+    ack_latencies = []
+
+    with configure_producer(settings) as producer:
+        start = time.perf_counter()
+
+        for message in messages:
+            sent_at = time.perf_counter()
+
+            def callback(_, sent_at=sent_at):
+                # Called from the producer's I/O thread once the message's batch is acknowledged
+                ack_latencies.append((time.perf_counter() - sent_at) * 1000)
+
+            def errback(err):
+                LOGGER.warning("Error sending message: %s", err)
+                errors.append(str(err))
+
+            producer.send(
+                topic=message["topic"], key=message["key"], value=message["value"]
+            ).add_callback(callback).add_errback(errback)
+            messages_sent += 1
+
+        producer.flush()
+        runtime = time.perf_counter() - start
+
+    messages_sent -= len(errors)
+
+    return SendBulkResponse(
+        messages_sent=messages_sent,
+        errors=errors,
+        runtime=runtime * 1000,
+        messages_per_second=messages_sent / runtime if runtime else 0,
+        ack_latency=get_latency_stats(ack_latencies),
+    )
+
+
+def run_action(
+    action_type: str, params: Union[ActionParams, SendBulkParams]
+) -> Union[ActionResponse, SendBulkResponse]:
+    if action_type == "SendBulk":
+        return run_send_bulk(params)
 
     if action_type == "Send":
         with configure_producer() as producer:
@@ -137,50 +532,131 @@ def run_action(action_type: str, params: ActionParams) -> ActionResponse:
                 runtime=get_runtime_ms(start, end),
             )
     elif action_type == "Receive":
-        assert "topic" in params, "Must specify topic in action params"
+        start = datetime.now()
 
-        with configure_consumer(
-            params["topic"], params.get("offset", "earliest")
-        ) as consumer:
-            start = datetime.now()
+        if params.get("parallelism", 1) > 1:
+            received_messages = receive_parallel(params)
+        else:
+            with configure_action_consumer(params) as consumer:
+                received_messages = receive(consumer, params)
 
-            received_messages = consumer.poll(
-                timeout_ms=params.get("timeout_ms", 5000),
-                max_records=params.get("max_records"),
-            )
-
-            end = datetime.now()
+        end = datetime.now()
 
-            return ActionResponse(
-                messages_sent=None,
-                messages_received=[
-                    KafkaMessage(topic=params["topic"], key=msg.key, value=msg.value)
-                    for msg_list in received_messages.values()
-                    for msg in msg_list
-                ],
-                errors=None,
-                runtime=get_runtime_ms(start, end),
-            )
+        return ActionResponse(
+            messages_sent=None,
+            messages_received=received_messages,
+            errors=None,
+            runtime=get_runtime_ms(start, end),
+        )
     else:
         raise ValueError(f"Action type {action_type} is invalid")
 
 
+def rewind_unscanned(
+    consumer: KafkaConsumer,
+    records: Dict[TopicPartition, List[ConsumerRecord]],
+    last_record: ConsumerRecord,
+):
+    """
+    Seeks back to the first polled record of each partition that was not checked, so consumers that resume are not
+    moved past them. Records are checked in the order poll returned them
+
+    Args:
+        consumer: Consumer records were polled with
+        records: Result of poll
+        last_record: Last record checked
+    """
+    found = False
+
+    for partition, partition_records in records.items():
+        if found:
+            consumer.seek(partition, partition_records[0].offset)
+            continue
+
+        for i, record in enumerate(partition_records):
+            if record is last_record:
+                found = True
+
+                if i + 1 < len(partition_records):
+                    consumer.seek(partition, partition_records[i + 1].offset)
+
+                break
+
+
+def find_message(
+    consumer: KafkaConsumer,
+    topic: str,
+    expected: KafkaMessage,
+    timeout_ms: int,
+    max_records: Optional[int] = None,
+) -> Tuple[Optional[KafkaMessage], int]:
+    """
+    Polls until a message matching the expected one is received, checking each message as it arrives instead of
+    waiting for the full timeout
+
+    Args:
+        consumer: Consumer to poll with
+        topic: Topic consumer is subscribed to
+        expected: Fields the message must contain
+        timeout_ms: Milliseconds to poll for before giving up
+        max_records: Messages to check before giving up, unlimited if None
+
+    Returns:
+        Matching message or None and the number of messages checked
+    """
+    deadline = time.monotonic() + timeout_ms / 1000
+    scanned = 0
+
+    while max_records is None or scanned < max_records:
+        remaining_ms = int((deadline - time.monotonic()) * 1000)
+
+        if remaining_ms <= 0:
+            break
+
+        # Poll returns as soon as any records are fetched
+        records = consumer.poll(
+            timeout_ms=remaining_ms,
+            max_records=max_records - scanned if max_records is not None else None,
+        )
+
+        for partition_records in records.values():
+            for record in partition_records:
+                scanned += 1
+                message = KafkaMessage(topic=topic, key=record.key, value=record.value)
+                matches, _ = assert_dicts(expected, message)
+
+                if matches:
+                    rewind_unscanned(consumer, records, record)
+
+                    return message, scanned
+
+    return None, scanned
+
+
 def run_assert(assert_type: str, params: AssertParams) -> AssertResult:
 
     if assert_type == "FindMessage":
-        messages = run_action("Receive", params["actionParams"])
-
-        for message in messages["messages_received"]:
-            if assert_dicts(params["expected"], message):
-                return AssertResult(
-                    actual=str(message),
-                    expected=str(params["expected"]),
-                    passed=True,
-                    description="passed",
-                )
+        action_params = params["actionParams"]
+
+        with configure_action_consumer(action_params) as consumer:
+            message, scanned = find_message(
+                consumer,
+                action_params["topic"],
+                params["expected"],
+                timeout_ms=action_params.get("timeout_ms", 5000),
+                max_records=action_params.get("max_records"),
+            )
+
+        if message is not None:
+            return AssertResult(
+                actual=str(message),
+                expected=str(params["expected"]),
+                passed=True,
+                description="passed",
+            )
 
         return AssertResult(
-            actual=None,
+            actual=f"{scanned} messages scanned",
             expected=str(params["expected"]),
             passed=False,
             description=f"No message found matching {params['expected']}",
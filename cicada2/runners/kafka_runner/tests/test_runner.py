@@ -0,0 +1,403 @@
+import time
+from unittest.mock import Mock, call, patch
+
+import pytest
+from kafka import TopicPartition
+from kafka.errors import KafkaTimeoutError
+
+from cicada2.runners.kafka_runner import runner
+
+
+@pytest.fixture
+def kafka_clients():
+    with patch.dict(
+        "cicada2.runners.kafka_runner.runner.PRODUCERS", clear=True
+    ), patch.dict("cicada2.runners.kafka_runner.runner.CONSUMERS", clear=True), patch(
+        "cicada2.runners.kafka_runner.runner.create_producer"
+    ) as create_producer, patch(
+        "cicada2.runners.kafka_runner.runner.create_consumer"
+    ) as create_consumer:
+        create_consumer.side_effect = lambda topic, offset, group_id, partitions: Mock()
+        yield create_producer, create_consumer
+
+
+def test_producer_reused(kafka_clients):
+    create_producer, _ = kafka_clients
+
+    for _ in range(3):
+        runner.run_action("Send", {"topic": "foo", "messages": [{"value": "bar"}]})
+
+    create_producer.assert_called_once()
+    assert create_producer.return_value.send.call_count == 3
+
+
+def test_producer_replaced_after_error(kafka_clients):
+    create_producer, _ = kafka_clients
+    producer = create_producer.return_value
+    producer.flush.side_effect = KafkaTimeoutError()
+
+    with pytest.raises(RuntimeError):
+        runner.run_action("Send", {"topic": "foo", "messages": [{"value": "bar"}]})
+
+    producer.close.assert_called_once()
+    assert runner.PRODUCERS == {}
+
+
+def test_consumer_reused_per_topic_and_offset(kafka_clients):
+    _, create_consumer = kafka_clients
+
+    with runner.configure_consumer("foo", "earliest") as first_consumer:
+        first_consumer.assignment.return_value = {"partition"}
+
+    with runner.configure_consumer("foo", "earliest") as consumer:
+        assert consumer is first_consumer
+
+    with runner.configure_consumer("foo", "latest") as latest_consumer:
+        assert latest_consumer is not first_consumer
+
+    assert create_consumer.call_count == 2
+    # Reused consumer starts from the offset policy again like a new consumer would
+    first_consumer.seek_to_beginning.assert_called_once()
+
+
+def test_consumer_replaced_after_error(kafka_clients):
+    _, create_consumer = kafka_clients
+
+    with pytest.raises(RuntimeError):
+        with runner.configure_consumer("foo", "earliest") as consumer:
+            raise KafkaTimeoutError()
+
+    consumer.close.assert_called_once()
+
+    with runner.configure_consumer("foo", "earliest") as new_consumer:
+        assert new_consumer is not consumer
+
+
+def test_consumer_resume(kafka_clients):
+    with runner.configure_consumer("foo", "earliest", resume=True) as consumer:
+        consumer.assignment.return_value = {"partition"}
+
+    with runner.configure_consumer("foo", "earliest", resume=True):
+        pass
+
+    consumer.seek_to_beginning.assert_not_called()
+    consumer.commit.assert_not_called()
+
+
+class TopicConsumer:
+    # Reads messages from a fixed topic, tracking its position like a real consumer
+    def __init__(self, values):
+        self.values = values
+        self.position = 0
+
+    def assignment(self):
+        return {"partition"}
+
+    def seek_to_beginning(self):
+        self.position = 0
+
+    def poll(self, timeout_ms, max_records):
+        values = self.values[self.position : self.position + max_records]
+        self.position += len(values)
+
+        return {
+            "partition": [
+                Mock(key=None, value=value, partition=0, offset=0, timestamp=0)
+                for value in values
+            ]
+        }
+
+
+def test_consumer_resume_not_moved_by_other_reads(kafka_clients):
+    _, create_consumer = kafka_clients
+    create_consumer.side_effect = lambda topic, offset, group_id, partitions: (
+        TopicConsumer(["a", "b", "c", "d"])
+    )
+
+    def receive(max_records, **params):
+        result = runner.run_action(
+            "Receive", {"topic": "foo", "max_records": max_records, **params}
+        )
+
+        return [message["value"] for message in result["messages_received"]]
+
+    assert receive(1, resume=True) == ["a"]
+    assert receive(3) == ["a", "b", "c"]
+    assert receive(3) == ["a", "b", "c"]
+    assert receive(1, resume=True) == ["b"]
+    assert receive(2, resume=True) == ["c", "d"]
+
+
+def test_consumer_group(kafka_clients):
+    _, create_consumer = kafka_clients
+
+    for _ in range(2):
+        with runner.configure_action_consumer(
+            {"topic": "foo", "group_id": "test"}
+        ) as consumer:
+            consumer.assignment.return_value = {"partition"}
+
+    create_consumer.assert_called_once_with("foo", "earliest", "test", None)
+    # Group consumers always resume from their committed position
+    consumer.seek_to_beginning.assert_not_called()
+    assert consumer.commit.call_count == 2
+
+
+def test_close_clients(kafka_clients):
+    create_producer, _ = kafka_clients
+
+    with runner.configure_producer():
+        pass
+
+    with runner.configure_consumer("foo", "earliest") as consumer:
+        pass
+
+    runner.close_clients()
+
+    create_producer.return_value.close.assert_called_once()
+    consumer.close.assert_called_once()
+    assert runner.PRODUCERS == {}
+    assert runner.CONSUMERS == {}
+
+
+class AckedFuture:
+    def __init__(self, error=None):
+        self.error = error
+
+    def add_callback(self, callback):
+        if self.error is None:
+            callback(Mock())
+
+        return self
+
+    def add_errback(self, errback):
+        if self.error is not None:
+            errback(self.error)
+
+        return self
+
+
+def test_send_bulk_params_problems():
+    problems = runner.send_bulk_params_problems(
+        {"count": 10, "file": "messages.txt", "compression_type": "bz2", "acks": 2}
+    )
+
+    assert problems == [
+        "Missing 'topic' in action params",
+        "Must specify one of 'count' or 'file' in action params",
+        "'file' must be a .jsonl file",
+        "'compression_type' must be one of ['gzip', 'snappy', 'lz4']",
+        "'acks' must be one of [0, 1, -1, 'all']",
+    ]
+
+
+def test_send_bulk_params_problems_codec_missing():
+    with patch.dict(runner.COMPRESSION_CHECKS, {"snappy": lambda: False}):
+        problems = runner.send_bulk_params_problems(
+            {"topic": "foo", "count": 10, "compression_type": "snappy"}
+        )
+
+    assert problems == ["Library for 'snappy' compression is not installed in runner"]
+
+
+def test_generate_messages():
+    messages = runner.generate_messages(
+        {"topic": "foo", "count": 2, "key": "key-$index", "value": {"id": "$index"}}
+    )
+
+    assert list(messages) == [
+        {"topic": "foo", "key": "key-0", "value": '{"id": "0"}'},
+        {"topic": "foo", "key": "key-1", "value": '{"id": "1"}'},
+    ]
+
+
+def test_read_messages_file(tmp_path):
+    messages_file = tmp_path / "messages.jsonl"
+    messages_file.write_text(
+        '{"key": "a", "value": "b"}\n\n{"topic": "bar", "value": {"c": 1}}\n'
+    )
+
+    messages = runner.read_messages_file(str(messages_file), "foo")
+
+    assert list(messages) == [
+        {"topic": "foo", "key": "a", "value": "b"},
+        {"topic": "bar", "key": None, "value": '{"c": 1}'},
+    ]
+
+
+def test_run_send_bulk(kafka_clients):
+    create_producer, _ = kafka_clients
+    producer = create_producer.return_value
+    producer.send.side_effect = lambda topic, key, value: AckedFuture(
+        Exception("Failed") if value == "message-3" else None
+    )
+
+    result = runner.run_action(
+        "SendBulk",
+        {
+            "topic": "foo",
+            "count": 100,
+            "value": "message-$index",
+            "linger_ms": 50,
+            "compression_type": "gzip",
+        },
+    )
+
+    create_producer.assert_called_once_with(compression_type="gzip", linger_ms=50)
+    producer.flush.assert_called_once()
+    assert result["messages_sent"] == 99
+    assert result["errors"] == ["Failed"]
+    assert result["messages_per_second"] > 0
+    assert result["ack_latency"]["max"] >= result["ack_latency"]["min"]
+
+
+def poll_batches(*batches):
+    # Each poll returns the next batch of records, then nothing once they run out
+    records = iter(batches)
+
+    def poll(timeout_ms, max_records):
+        batch = next(records, [])[:max_records]
+
+        if not batch:
+            time.sleep(timeout_ms / 1000)
+            return {}
+
+        return {"partition": [Mock(key=key, value=value) for key, value in batch]}
+
+    return poll
+
+
+def test_find_message_stops_on_match():
+    consumer = Mock()
+    consumer.poll.side_effect = poll_batches(
+        [("a", "1"), ("b", "2")], [("c", "3"), ("d", "4")], [("e", "5")]
+    )
+
+    start = time.monotonic()
+    message, scanned = runner.find_message(
+        consumer, "foo", {"key": "c"}, timeout_ms=5000
+    )
+
+    assert message == {"topic": "foo", "key": "c", "value": "3"}
+    assert scanned == 3
+    assert consumer.poll.call_count == 2
+    assert time.monotonic() - start < 1
+
+
+def test_find_message_not_found():
+    consumer = Mock()
+    consumer.poll.side_effect = poll_batches([("a", "1")])
+
+    message, scanned = runner.find_message(consumer, "foo", {"key": "z"}, timeout_ms=50)
+
+    assert message is None
+    assert scanned == 1
+
+
+def test_find_message_max_records():
+    consumer = Mock()
+    consumer.poll.side_effect = poll_batches([("a", "1"), ("b", "2"), ("c", "3")])
+
+    message, scanned = runner.find_message(
+        consumer, "foo", {"key": "c"}, timeout_ms=5000, max_records=2
+    )
+
+    assert message is None
+    assert scanned == 2
+
+
+def test_run_assert_find_message_not_found(kafka_clients):
+    _, create_consumer = kafka_clients
+    create_consumer.side_effect = None
+    create_consumer.return_value.poll.side_effect = poll_batches([("a", "1")])
+
+    result = runner.run_assert(
+        "FindMessage",
+        {"actionParams": {"topic": "foo", "timeout_ms": 50}, "expected": {"key": "b"}},
+    )
+
+    assert not result["passed"]
+    assert result["actual"] == "1 messages scanned"
+
+
+def test_find_message_rewinds_unscanned_records():
+    records = {
+        "partition-0": [
+            Mock(key=key, value="", offset=i) for i, key in enumerate("abc")
+        ],
+        "partition-1": [Mock(key="d", value="", offset=7)],
+    }
+    consumer = Mock()
+    consumer.poll.return_value = records
+
+    message, _ = runner.find_message(consumer, "foo", {"key": "b"}, timeout_ms=5000)
+
+    assert message["key"] == "b"
+    assert consumer.seek.call_args_list == [
+        call("partition-0", 2),
+        call("partition-1", 7),
+    ]
+
+
+def test_receive_parallel(kafka_clients):
+    _, create_consumer = kafka_clients
+    partition_consumers = {}
+
+    def create_partition_consumer(topic, offset, group_id, partitions):
+        consumer = Mock()
+        consumer.partitions_for_topic.return_value = {0, 1, 2, 3, 4}
+        # Later messages have lower partition numbers, so merging has to reorder them
+        consumer.poll.return_value = {
+            partition: [
+                Mock(
+                    key=None,
+                    value=f"{partition}-{offset}",
+                    partition=partition,
+                    offset=offset,
+                    timestamp=(5 - partition) * 10 + offset,
+                )
+                for offset in range(2)
+            ]
+            for partition in partitions or []
+        }
+        partition_consumers[partitions] = consumer
+
+        return consumer
+
+    create_consumer.side_effect = create_partition_consumer
+
+    result = runner.run_action("Receive", {"topic": "foo", "parallelism": 2})
+
+    assert set(partition_consumers) == {None, (0, 2, 4), (1, 3)}
+    assert [message["value"] for message in result["messages_received"]] == [
+        "4-0",
+        "4-1",
+        "3-0",
+        "3-1",
+        "2-0",
+        "2-1",
+        "1-0",
+        "1-1",
+        "0-0",
+        "0-1",
+    ]
+    assert result["messages_received"][0] == {
+        "topic": "foo",
+        "key": None,
+        "value": "4-0",
+        "partition": 4,
+        "offset": 0,
+        "timestamp": 10,
+    }
+
+
+@patch.dict("os.environ", {"RUNNER_SERVERS": "kafka:9092"})
+@patch("cicada2.runners.kafka_runner.runner.KafkaConsumer")
+def test_create_consumer_partitions(kafka_consumer):
+    subscribed_consumer = runner.create_consumer("foo", "earliest")
+    subscribed_consumer.subscribe.assert_called_once_with(["foo"])
+
+    assigned_consumer = runner.create_consumer("foo", "earliest", partitions=(0, 2))
+    assigned_consumer.assign.assert_called_once_with(
+        [TopicPartition("foo", 0), TopicPartition("foo", 2)]
+    )
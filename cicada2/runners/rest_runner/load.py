@@ -0,0 +1,161 @@
+import asyncio
+import time
+from collections import Counter
+from itertools import count
+from typing import Dict, List, Optional
+from typing_extensions import TypedDict
+
+import aiohttp
+
+from cicada2.shared.types import LatencyStats
+from cicada2.shared.util import get_latency_stats
+
+
+class LoadParams(TypedDict):
+    method: Optional[str]
+    url: str
+    headers: Optional[Dict[str, str]]
+    queryParams: Optional[Dict[str, str]]
+    body: Optional[dict]
+    username: Optional[str]
+    password: Optional[str]
+    requests: Optional[int]
+    duration: Optional[float]
+    concurrency: Optional[int]
+    rps: Optional[float]
+    timeout: Optional[float]
+
+
+class LoadResult(TypedDict):
+    requests: int
+    status_codes: Dict[str, int]
+    errors: Dict[str, int]
+    latency: Optional[LatencyStats]
+    rps: float
+    runtime: float
+
+
+METHODS = ["GET", "DELETE", "POST", "PATCH", "PUT"]
+# Seconds before a request is counted as an error, so a hung connection can not block the action forever
+DEFAULT_TIMEOUT = 300
+
+
+def load_params_problems(params: LoadParams) -> List[str]:
+    problems = []
+
+    if "url" not in params:
+        problems.append('Missing "url" in action params')
+
+    if "requests" not in params and "duration" not in params:
+        problems.append('Must specify "requests" or "duration" in action params')
+
+    if params.get("method", "GET") not in METHODS:
+        problems.append(f"Method must be one of {METHODS}")
+
+    if params.get("concurrency", 1) < 1:
+        problems.append('"concurrency" must be at least 1')
+
+    return problems
+
+
+def stringify_values(mapping: Optional[dict]) -> Optional[Dict[str, str]]:
+    # aiohttp only accepts strings in headers and query params
+    if mapping is None:
+        return None
+
+    return {key: str(value) for key, value in mapping.items()}
+
+
+async def run_load(params: LoadParams) -> LoadResult:
+    """
+    Sends requests from concurrent workers until the request count or duration is reached
+
+    Args:
+        params: Request to send and how much load to generate
+
+    Returns:
+        Aggregate stats of responses
+    """
+    max_requests = params.get("requests")
+    duration = params.get("duration")
+    concurrency = params.get("concurrency", 1)
+    rps = params.get("rps")
+
+    username = params.get("username")
+    password = params.get("password")
+
+    if username and password:
+        auth = aiohttp.BasicAuth(username, password)
+    else:
+        auth = None
+
+    request_kwargs = {
+        "method": params.get("method", "GET"),
+        "url": params["url"],
+        "headers": stringify_values(params.get("headers")),
+        "params": stringify_values(params.get("queryParams")),
+        "json": params.get("body"),
+    }
+
+    status_codes: Counter = Counter()
+    errors: Counter = Counter()
+    latencies: List[float] = []
+    request_indexes = count()
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    end = start + duration if duration is not None else None
+
+    async def send_requests(session: aiohttp.ClientSession):
+        while True:
+            index = next(request_indexes)
+
+            if max_requests is not None and index >= max_requests:
+                return
+
+            if rps:
+                # Spread requests evenly to hold the target rate across all workers
+                await asyncio.sleep(max(start + index / rps - loop.time(), 0))
+
+            if end is not None and loop.time() >= end:
+                return
+
+            request_start = time.perf_counter()
+
+            try:
+                async with session.request(**request_kwargs) as response:
+                    await response.read()
+
+                latencies.append((time.perf_counter() - request_start) * 1000)
+                status_codes[str(response.status)] += 1
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                errors[type(err).__name__] += 1
+
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=concurrency),
+        timeout=aiohttp.ClientTimeout(total=params.get("timeout", DEFAULT_TIMEOUT)),
+        auth=auth,
+    ) as session:
+        await asyncio.gather(*[send_requests(session) for _ in range(concurrency)])
+
+    runtime = loop.time() - start
+    total_requests = sum(status_codes.values()) + sum(errors.values())
+
+    return {
+        "requests": total_requests,
+        "status_codes": dict(status_codes),
+        "errors": dict(errors),
+        "latency": get_latency_stats(latencies),
+        "rps": total_requests / runtime if runtime else 0,
+        "runtime": runtime * 1000,
+    }
+
+
+def run_load_action(params: LoadParams) -> LoadResult:
+    params_problems = load_params_problems(params)
+
+    if params_problems:
+        raise ValueError(f"Params invalid: {', '.join(params_problems)}")
+
+    # Runner functions are called from worker threads without an event loop
+    return asyncio.run(run_load(params))
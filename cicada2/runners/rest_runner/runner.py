@@ -1,15 +1,25 @@
+import hashlib
+import json
+from http.cookiejar import DefaultCookiePolicy
 from json import JSONDecodeError
-from datetime import datetime
+from os import getenv
+from threading import Lock, local
+from time import perf_counter_ns
 from typing import Dict, List, Optional, Tuple, Union
 from typing_extensions import TypedDict
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 from requests.exceptions import BaseHTTPError
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
 
+from cicada2.runners.rest_runner.load import LoadParams, LoadResult, run_load_action
 from cicada2.shared.asserts import assert_dicts
 from cicada2.shared.types import AssertResult
-from cicada2.shared.util import get_runtime_ms
+from cicada2.shared.util import get_elapsed_ms
 
 
 class ActionParams(TypedDict):
@@ -19,6 +29,8 @@ class ActionParams(TypedDict):
     body: Optional[dict]
     username: Optional[str]
     password: Optional[str]
+    bodyMode: Optional[str]
+    maxBodySize: Optional[int]
 
 
 class RequestParams(TypedDict):
@@ -29,12 +41,24 @@ class RequestParams(TypedDict):
     auth: HTTPBasicAuth
 
 
+class Timings(TypedDict):
+    connect: float
+    tls: float
+    ttfb: float
+    download: float
+    parse: float
+
+
 class ActionResponse(TypedDict):
     status_code: int
     headers: Dict[str, str]
     body: dict
     text: str
-    runtime: int
+    length: int
+    truncated: bool
+    hash: Optional[str]
+    runtime: float
+    timings: Timings
 
 
 class AssertParams(TypedDict):
@@ -44,6 +68,120 @@ class AssertParams(TypedDict):
     allRequired: Optional[bool]
 
 
+BODY_MODES = ["both", "json", "text", "hash"]
+CHUNK_SIZE = 64 * 1024
+
+SESSION: Optional[requests.Session] = None
+SESSION_LOCK = Lock()
+
+# Nanoseconds spent opening connections during the current thread's request
+CONNECTION_TIMINGS = local()
+
+
+def reset_connection_timings():
+    CONNECTION_TIMINGS.connect_ns = 0
+    CONNECTION_TIMINGS.tls_ns = 0
+
+
+class TimedHTTPConnection(HTTPConnection):
+    def _new_conn(self):
+        start = perf_counter_ns()
+        conn = super()._new_conn()
+        CONNECTION_TIMINGS.connect_ns += perf_counter_ns() - start
+
+        return conn
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+    def _new_conn(self):
+        start = perf_counter_ns()
+        conn = super()._new_conn()
+        CONNECTION_TIMINGS.connect_ns += perf_counter_ns() - start
+
+        return conn
+
+    def connect(self):
+        # connect opens the socket with _new_conn, anything after that is the TLS handshake
+        start = perf_counter_ns()
+        connect_ns = CONNECTION_TIMINGS.connect_ns
+        super().connect()
+        CONNECTION_TIMINGS.tls_ns += (
+            perf_counter_ns() - start - (CONNECTION_TIMINGS.connect_ns - connect_ns)
+        )
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that records time spent connecting and in TLS handshakes for new connections
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+
+def create_session() -> requests.Session:
+    """
+    Creates a session with a connection pool per host, configured from the runner's config
+
+    Returns:
+        Session to make requests with
+    """
+    status_codes = getenv("RUNNER_RETRYSTATUSCODES", "")
+
+    retries = Retry(
+        total=int(getenv("RUNNER_RETRIES", "0")),
+        backoff_factor=float(getenv("RUNNER_RETRYBACKOFF", "0")),
+        status_forcelist=[
+            int(status_code) for status_code in status_codes.split(",") if status_code
+        ],
+        # Return the last response instead of raising once retries run out
+        raise_on_status=False,
+    )
+    pool_size = int(getenv("RUNNER_POOLSIZE", "10"))
+    adapter = TimedHTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries
+    )
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # Cookies from one response must not authenticate later actions, which may belong to other tests
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    if getenv("RUNNER_KEEPALIVE", "true").lower() not in ["true", "y", "yes"]:
+        session.headers["Connection"] = "close"
+
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Gets the session shared by every action and assert, so connections are kept alive and reused between calls
+
+    Returns:
+        Session to make requests with
+    """
+    global SESSION
+
+    with SESSION_LOCK:
+        if SESSION is None:
+            SESSION = create_session()
+
+        return SESSION
+
+
 def parse_action_params(params: ActionParams) -> RequestParams:
     url = params["url"]
     headers = params.get("headers")
@@ -67,15 +205,72 @@ def parse_action_params(params: ActionParams) -> RequestParams:
     }
 
 
-def parse_response_body(response: requests.Response) -> Tuple[str, dict]:
-    try:
-        return response.text, response.json()
-    except JSONDecodeError:
-        # Cannot load JSON from text
-        return response.text, {}
-    except AttributeError:
-        # Response text is empty
-        return "", {}
+def get_max_body_size(params: ActionParams) -> Optional[int]:
+    max_body_size = params.get("maxBodySize", getenv("RUNNER_MAXBODYSIZE"))
+
+    if max_body_size is None:
+        return None
+
+    return int(max_body_size)
+
+
+def read_response_content(
+    response: requests.Response, max_body_size: Optional[int], hash_only: bool
+) -> Tuple[bytes, int, bool, Optional[str]]:
+    """
+    Downloads a response body in chunks, keeping at most max_body_size bytes
+
+    Args:
+        response: Response requested with stream=True
+        max_body_size: Bytes to keep before the rest of the body is discarded, unlimited if None
+        hash_only: Only hash the body instead of keeping it
+
+    Returns:
+        Body content, body length, if the body was truncated and SHA-256 hex digest if hash_only
+    """
+    chunks = []
+    length = 0
+    digest = hashlib.sha256() if hash_only else None
+
+    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+        if hash_only:
+            digest.update(chunk)
+            length += len(chunk)
+            continue
+
+        if max_body_size is not None and length + len(chunk) > max_body_size:
+            chunks.append(chunk[: max_body_size - length])
+            # Stop downloading, the connection can not be reused with unread data
+            response.close()
+
+            return b"".join(chunks), max_body_size, True, None
+
+        chunks.append(chunk)
+        length += len(chunk)
+
+    if hash_only:
+        return b"", length, False, digest.hexdigest()
+
+    return b"".join(chunks), length, False, None
+
+
+def parse_response_body(
+    content: bytes, encoding: Optional[str], body_mode: str = "both"
+) -> Tuple[str, dict]:
+    text = ""
+    body = {}
+
+    if body_mode in ["both", "text"]:
+        text = content.decode(encoding or "utf-8", errors="replace")
+
+    if body_mode in ["both", "json"] and content:
+        try:
+            body = json.loads(content)
+        except (JSONDecodeError, UnicodeDecodeError):
+            # Cannot load JSON from content
+            pass
+
+    return text, body
 
 
 def action_params_problems(params: ActionParams) -> List[str]:
@@ -84,10 +279,18 @@ def action_params_problems(params: ActionParams) -> List[str]:
     if "url" not in params:
         problems.append('Missing "url" in action params')
 
+    if params.get("bodyMode", "both") not in BODY_MODES:
+        problems.append(f'"bodyMode" must be one of {BODY_MODES}')
+
     return problems
 
 
-def run_action(action_type: str, params: ActionParams) -> ActionResponse:
+def run_action(
+    action_type: str, params: Union[ActionParams, LoadParams]
+) -> Union[ActionResponse, LoadResult]:
+    if action_type == "Load":
+        return run_load_action(params)
+
     params_problems = action_params_problems(params)
 
     if params_problems:
@@ -102,24 +305,48 @@ def run_action(action_type: str, params: ActionParams) -> ActionResponse:
 
     # TODO: unit test for errors raised
 
+    if action_type not in ["GET", "DELETE", "POST", "PATCH", "PUT"]:
+        raise ValueError(f"Action type {action_type} is invalid")
+
+    body_mode = params.get("bodyMode", "both")
+    reset_connection_timings()
+
     try:
-        if action_type in ["GET", "DELETE", "POST", "PATCH", "PUT"]:
-            start = datetime.now()
-            response = requests.request(method=action_type, **request_params)
-            end = datetime.now()
-        else:
-            raise ValueError(f"Action type {action_type} is invalid")
+        start = perf_counter_ns()
+        # Returns once headers are received so the body download can be timed separately
+        response = get_session().request(
+            method=action_type, stream=True, **request_params
+        )
+        headers_received = perf_counter_ns()
+        content, length, truncated, digest = read_response_content(
+            response, get_max_body_size(params), body_mode == "hash"
+        )
+        downloaded = perf_counter_ns()
     except BaseHTTPError as e:
         raise RuntimeError(f"Request failed: {e}")
 
-    text, body = parse_response_body(response)
+    text, body = parse_response_body(content, response.encoding, body_mode)
+    parsed = perf_counter_ns()
+
+    connect_ms = CONNECTION_TIMINGS.connect_ns / 1e6
+    tls_ms = CONNECTION_TIMINGS.tls_ns / 1e6
 
     return {
         "status_code": response.status_code,
         "headers": dict(response.headers),
         "body": body,
         "text": text,
-        "runtime": get_runtime_ms(start, end),
+        "length": length,
+        "truncated": truncated,
+        "hash": digest,
+        "runtime": get_elapsed_ms(start, downloaded),
+        "timings": {
+            "connect": connect_ms,
+            "tls": tls_ms,
+            "ttfb": get_elapsed_ms(start, headers_received) - connect_ms - tls_ms,
+            "download": get_elapsed_ms(headers_received, downloaded),
+            "parse": get_elapsed_ms(downloaded, parsed),
+        },
     }
 
 
@@ -174,6 +401,23 @@ def run_assert(assert_type: str, params: AssertParams) -> AssertResult:
             description = f"expected status code {expected}, got {actual}"
         else:
             description = "passed"
+    elif assert_type == "Timing":
+        actual = {"runtime": action_response["runtime"], **action_response["timings"]}
+        unknown_phases = [phase for phase in expected if phase not in actual]
+
+        if unknown_phases:
+            raise ValueError(
+                f"Unknown timing phases {unknown_phases}, must be one of {list(actual)}"
+            )
+
+        slow_phases = [
+            f"{phase} took {actual[phase]:.3f} ms, expected at most {max_ms} ms"
+            for phase, max_ms in expected.items()
+            if actual[phase] > max_ms
+        ]
+
+        passed = not slow_phases
+        description = ", ".join(slow_phases) if slow_phases else "passed"
     else:
         raise ValueError(f"Assert type {assert_type} is invalid")
 
@@ -0,0 +1,99 @@
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from unittest.mock import patch
+
+import pytest
+
+from cicada2.runners.rest_runner import load, runner
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith("/slow"):
+            time.sleep(1)
+
+        status_code = 500 if self.path.startswith("/error") else 200
+
+        self.send_response(status_code)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("localhost", 0), Handler)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f"http://localhost:{server.server_port}"
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_load_params_problems():
+    problems = load.load_params_problems({"method": "HEAD", "concurrency": 0})
+
+    assert problems == [
+        'Missing "url" in action params',
+        'Must specify "requests" or "duration" in action params',
+        f"Method must be one of {load.METHODS}",
+        '"concurrency" must be at least 1',
+    ]
+
+
+def test_run_load_action_invalid():
+    with pytest.raises(ValueError):
+        runner.run_action("Load", {"url": "http://xyz.com"})
+
+
+def test_run_load_requests(server_url):
+    result = runner.run_action(
+        "Load", {"url": f"{server_url}/", "requests": 50, "concurrency": 5}
+    )
+
+    assert result["requests"] == 50
+    assert result["status_codes"] == {"200": 50}
+    assert result["errors"] == {}
+    assert result["latency"]["min"] <= result["latency"]["p50"]
+    assert result["latency"]["p99"] <= result["latency"]["max"]
+
+
+def test_run_load_status_codes_and_errors(server_url):
+    result = runner.run_action(
+        "Load", {"url": f"{server_url}/error", "requests": 10, "concurrency": 2}
+    )
+    unreachable_result = runner.run_action(
+        "Load", {"url": "http://localhost:1", "requests": 3}
+    )
+
+    assert result["status_codes"] == {"500": 10}
+    assert unreachable_result["requests"] == 3
+    assert sum(unreachable_result["errors"].values()) == 3
+    assert unreachable_result["latency"] is None
+
+
+@patch("cicada2.runners.rest_runner.load.DEFAULT_TIMEOUT", 0.1)
+def test_run_load_default_timeout(server_url):
+    result = runner.run_action("Load", {"url": f"{server_url}/slow", "requests": 1})
+
+    assert result["errors"] == {"TimeoutError": 1}
+    assert result["runtime"] < 1000
+
+
+def test_run_load_duration_rps(server_url):
+    start = time.monotonic()
+    result = runner.run_action(
+        "Load",
+        {"url": f"{server_url}/", "duration": 0.5, "rps": 40, "concurrency": 4},
+    )
+    runtime = time.monotonic() - start
+
+    assert 0.5 <= runtime < 1.5
+    # Requests are spaced at 40 per second for half a second
+    assert 15 <= result["requests"] <= 21
@@ -1,11 +1,46 @@
+import hashlib
 import json
-from unittest.mock import Mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from unittest.mock import Mock, patch
 
+import pytest
 from requests.auth import HTTPBasicAuth
 
 from cicada2.runners.rest_runner import runner
 
 
+class JSONHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", "14")
+        self.end_headers()
+        self.wfile.write(b'{"foo": "bar"}')
+
+    def log_message(self, *args):
+        pass
+
+
+class CookieHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({"cookie": self.headers.get("Cookie")}).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", "session=abc123; Path=/")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
 def test_parse_action_params_auth():
     params = {"url": "xyz.com", "username": "foo", "password": "bar"}
 
@@ -25,16 +60,72 @@ def test_parse_action_params_auth_missing():
 def test_parse_response_body_successful():
     response_body = {"foo": "bar"}
 
-    response = Mock()
-    response.text = json.dumps(response_body)
-    response.json.return_value = response_body
-
-    text, body = runner.parse_response_body(response)
+    text, body = runner.parse_response_body(
+        json.dumps(response_body).encode("utf-8"), None
+    )
 
     assert text == json.dumps(body)
     assert body == response_body
 
 
+def test_parse_response_body_modes():
+    content = b'{"foo": "bar"}'
+
+    assert runner.parse_response_body(content, None, "json") == ("", {"foo": "bar"})
+    assert runner.parse_response_body(content, None, "text") == ('{"foo": "bar"}', {})
+    assert runner.parse_response_body(content, None, "hash") == ("", {})
+
+
+def test_parse_response_body_not_json():
+    text, body = runner.parse_response_body(b"<html></html>", "ISO-8859-1")
+
+    assert text == "<html></html>"
+    assert body == {}
+
+
+def test_read_response_content():
+    response = Mock()
+    response.iter_content.return_value = [b"abc", b"def", b"ghi"]
+
+    assert runner.read_response_content(response, None, False) == (
+        b"abcdefghi",
+        9,
+        False,
+        None,
+    )
+    assert runner.read_response_content(response, 9, False) == (
+        b"abcdefghi",
+        9,
+        False,
+        None,
+    )
+    response.close.assert_not_called()
+
+
+def test_read_response_content_truncated():
+    response = Mock()
+    response.iter_content.return_value = [b"abc", b"def", b"ghi"]
+
+    content, length, truncated, _ = runner.read_response_content(response, 5, False)
+
+    assert content == b"abcde"
+    assert length == 5
+    assert truncated
+    response.close.assert_called_once()
+
+
+def test_read_response_content_hash_only():
+    response = Mock()
+    response.iter_content.return_value = [b"abc", b"def"]
+
+    content, length, truncated, digest = runner.read_response_content(response, 2, True)
+
+    assert content == b""
+    assert length == 6
+    assert not truncated
+    assert digest == hashlib.sha256(b"abcdef").hexdigest()
+
+
 def test_action_params_problems_successful():
     params = {"url": "xyz.com"}
 
@@ -49,6 +140,14 @@ def test_action_params_problems_no_url():
     assert problems == ['Missing "url" in action params']
 
 
+def test_action_params_problems_body_mode():
+    problems = runner.action_params_problems(
+        params={"url": "xyz.com", "bodyMode": "xml"}
+    )
+
+    assert problems == [f'"bodyMode" must be one of {runner.BODY_MODES}']
+
+
 def test_assert_dicts_passed_all_required():
     test_dict = {"foo": "bar"}
 
@@ -120,3 +219,163 @@ def test_assert_params_problems_no_action_params():
         "Missing 'actionParams' in assert params",
         'Missing "url" in action params',
     ]
+
+
+@patch.dict(
+    "os.environ",
+    {
+        "RUNNER_POOLSIZE": "25",
+        "RUNNER_RETRIES": "3",
+        "RUNNER_RETRYSTATUSCODES": "502,503",
+        "RUNNER_KEEPALIVE": "false",
+    },
+)
+def test_create_session():
+    session = runner.create_session()
+    adapter = session.get_adapter("https://xyz.com")
+
+    assert adapter._pool_maxsize == 25
+    assert adapter.max_retries.total == 3
+    assert adapter.max_retries.status_forcelist == [502, 503]
+    assert session.headers["Connection"] == "close"
+
+
+def test_create_session_defaults():
+    session = runner.create_session()
+    adapter = session.get_adapter("http://xyz.com")
+
+    assert adapter._pool_maxsize == 10
+    assert adapter.max_retries.total == 0
+    assert session.headers.get("Connection") != "close"
+
+
+@patch("cicada2.runners.rest_runner.runner.SESSION", None)
+def test_get_session_reused():
+    assert runner.get_session() is runner.get_session()
+
+
+@patch("cicada2.runners.rest_runner.runner.get_session")
+def test_run_action_uses_session(get_session_mock):
+    session_mock = get_session_mock.return_value
+    session_mock.request.return_value.status_code = 200
+    session_mock.request.return_value.headers = {"Content-Type": "application/json"}
+    session_mock.request.return_value.iter_content.return_value = [b'{"foo": "bar"}']
+    session_mock.request.return_value.encoding = None
+
+    response = runner.run_action("GET", {"url": "http://xyz.com"})
+
+    session_mock.request.assert_called_once_with(
+        method="GET",
+        stream=True,
+        url="http://xyz.com",
+        headers=None,
+        json=None,
+        params=None,
+        auth=None,
+    )
+    assert response["status_code"] == 200
+    assert response["body"] == {"foo": "bar"}
+
+
+def test_run_action_timings():
+    server = ThreadingHTTPServer(("localhost", 0), JSONHandler)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://localhost:{server.server_port}"
+
+    try:
+        with patch("cicada2.runners.rest_runner.runner.SESSION", None):
+            first_response = runner.run_action("GET", {"url": url})
+            second_response = runner.run_action("GET", {"url": url})
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    timings = first_response["timings"]
+
+    assert first_response["body"] == {"foo": "bar"}
+    assert timings["connect"] > 0
+    assert timings["tls"] == 0
+    assert first_response["runtime"] == pytest.approx(
+        timings["connect"] + timings["tls"] + timings["ttfb"] + timings["download"]
+    )
+    # Second request reuses the kept alive connection
+    assert second_response["timings"]["connect"] == 0
+
+
+def test_run_action_cookies_not_kept():
+    server = ThreadingHTTPServer(("localhost", 0), CookieHandler)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://localhost:{server.server_port}"
+
+    try:
+        with patch("cicada2.runners.rest_runner.runner.SESSION", None):
+            first_response = runner.run_action("GET", {"url": url})
+            second_response = runner.run_action("GET", {"url": url})
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert "session=abc123" in first_response["headers"]["Set-Cookie"]
+    assert second_response["body"] == {"cookie": None}
+
+
+def test_run_action_body_mode_and_max_size():
+    server = ThreadingHTTPServer(("localhost", 0), JSONHandler)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://localhost:{server.server_port}"
+
+    try:
+        with patch("cicada2.runners.rest_runner.runner.SESSION", None):
+            hash_response = runner.run_action("GET", {"url": url, "bodyMode": "hash"})
+            truncated_response = runner.run_action(
+                "GET", {"url": url, "maxBodySize": 5}
+            )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert hash_response["body"] == {}
+    assert hash_response["text"] == ""
+    assert hash_response["length"] == 14
+    assert hash_response["hash"] == hashlib.sha256(b'{"foo": "bar"}').hexdigest()
+    assert truncated_response["truncated"]
+    assert truncated_response["text"] == '{"foo'
+    assert truncated_response["body"] == {}
+
+
+@patch("cicada2.runners.rest_runner.runner.run_action")
+def test_run_assert_timing(run_action_mock):
+    run_action_mock.return_value = {
+        "runtime": 120,
+        "timings": {"connect": 0, "tls": 0, "ttfb": 100, "download": 20, "parse": 1},
+    }
+    params = {
+        "method": "GET",
+        "actionParams": {"url": "xyz.com"},
+        "expected": {"ttfb": 50, "runtime": 200},
+    }
+
+    result = runner.run_assert("Timing", params)
+
+    assert not result["passed"]
+    assert result["description"] == "ttfb took 100.000 ms, expected at most 50 ms"
+
+    params["expected"] = {"ttfb": 150}
+
+    assert runner.run_assert("Timing", params)["passed"]
+
+
+@patch("cicada2.runners.rest_runner.runner.run_action")
+def test_run_assert_timing_unknown_phase(run_action_mock):
+    run_action_mock.return_value = {"runtime": 120, "timings": {"ttfb": 100}}
+    params = {
+        "method": "GET",
+        "actionParams": {"url": "xyz.com"},
+        "expected": {"dns": 50},
+    }
+
+    with pytest.raises(ValueError):
+        runner.run_assert("Timing", params)
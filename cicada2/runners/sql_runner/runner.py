@@ -1,22 +1,79 @@
+import csv
+import hashlib
+import io
+import json
+import re
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import chain, islice
 from os import getenv
-from typing import Any, List, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from uuid import uuid4
 from typing_extensions import TypedDict
 
-from sqlalchemy import create_engine, engine
+from sqlalchemy import create_engine, engine, text
+from sqlalchemy.sql.elements import TextClause
+from sqlalchemy.util import LRUCache
 
 from cicada2.shared.asserts import assert_dicts
+from cicada2.shared.logs import get_logger
 from cicada2.shared.types import AssertResult
 
 
+LOGGER = get_logger("sql-runner")
+
+
 Rows = List[dict]
 
 
 class ActionParams(TypedDict):
     query: str
+    maxRows: Optional[int]
+    batchSize: Optional[int]
+    resultMode: Optional[str]
 
 
 class ActionResult(TypedDict):
     rows: Rows
+    count: int
+    truncated: bool
+    digest: Optional[str]
+
+
+class Statement(TypedDict):
+    query: str
+    params: Optional[Union[dict, List[dict]]]
+
+
+class TransactionParams(TypedDict):
+    statements: List[Statement]
+
+
+class StatementResult(TypedDict):
+    rows: Rows
+    rowcount: int
+
+
+class TransactionResult(TypedDict):
+    results: List[StatementResult]
+    runtime: float
+
+
+class BulkInsertParams(TypedDict):
+    table: str
+    rows: Optional[Rows]
+    file: Optional[str]
+    columns: Optional[List[str]]
+    batchSize: Optional[int]
+    copy: Optional[bool]
+
+
+class BulkInsertResult(TypedDict):
+    inserted: int
+    runtime: float
+    rows_per_second: float
 
 
 class ExpectedAssertData(TypedDict):
@@ -27,13 +84,43 @@ class AssertParams(TypedDict):
     method: str
     actionParams: ActionParams
     expected: ExpectedAssertData
+    ordered: Optional[bool]
+    pushdown: Optional[bool]
 
 
 ENGINE: Any = None
+POOL_WARMED = False
+
+
+def get_pool_size() -> int:
+    return int(getenv("RUNNER_POOLSIZE", "5"))
+
+
+def get_pool_options(url: str) -> dict:
+    """
+    Gets connection pool settings for create_engine from the runner's config
+
+    Args:
+        url: Database URL engine is created with
+
+    Returns:
+        Keyword arguments for create_engine
+    """
+    options = {
+        "pool_pre_ping": getenv("RUNNER_POOLPREPING", "true").lower()
+        in ["true", "y", "yes"],
+        "pool_recycle": int(getenv("RUNNER_POOLRECYCLE", "-1")),
+    }
+
+    # SQLite engines do not use a QueuePool, which is the only pool with a size
+    if not url.startswith("sqlite"):
+        options["pool_size"] = get_pool_size()
+        options["max_overflow"] = int(getenv("RUNNER_MAXOVERFLOW", "10"))
+
+    return options
 
 
 def get_engine() -> engine:
-    # TODO: validate connection works, possibly in healthcheck
     global ENGINE
 
     if ENGINE is not None:
@@ -43,7 +130,7 @@ def get_engine() -> engine:
 
     if connection_string is not None:
         # NOTE: maybe expect connection string in JDBC format
-        ENGINE = create_engine(connection_string)
+        ENGINE = create_engine(connection_string, **get_pool_options(connection_string))
         return ENGINE
 
     # TODO: support for mysql, possibly sqllite
@@ -72,60 +159,704 @@ def get_engine() -> engine:
         * database
         """
 
-    ENGINE = create_engine(f"{driver}://{username}:{password}@{host}:{port}/{database}")
+    url = f"{driver}://{username}:{password}@{host}:{port}/{database}"
+    ENGINE = create_engine(url, **get_pool_options(url))
     return ENGINE
 
 
-def run_action(action_type: str, params: ActionParams) -> ActionResult:
-    # TODO: param validation
-    # TODO: Error catching
-    if action_type == "SQLQuery":
+def warm_pool():
+    """
+    Opens pool size connections at once and returns them to the pool, so the first actions do not wait on connecting
+    """
+    sql_engine = get_engine()
+    connections = []
+
+    try:
+        for _ in range(get_pool_size()):
+            connections.append(sql_engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+def healthcheck() -> bool:
+    """
+    Warms the connection pool the first time the database is reachable. The runner is reported as ready either way,
+    so a database that starts after the runner only fails the actions that use it
+
+    Returns:
+        If runner is ready
+    """
+    global POOL_WARMED
+
+    if not POOL_WARMED:
+        try:
+            warm_pool()
+            POOL_WARMED = True
+        except Exception as err:
+            LOGGER.warning("Unable to warm connection pool: %s", err)
+
+    return True
+
+
+RESULT_MODES = ["rows", "count", "digest"]
+DEFAULT_BATCH_SIZE = 1000
+
+# Same check SQLAlchemy uses to decide if a textual statement can use a server side cursor
+SELECT_PATTERN = re.compile(r"\s*SELECT", re.I)
+
+
+class QueryRows:
+    """
+    Iterates over the rows of a query in batches, using a server side cursor for SELECT statements so the full
+    result is never loaded into memory. The query is run each time the object is iterated over
+
+    Args:
+        query: SQL query string
+        batch_size: Rows to fetch from the database at a time
+        max_rows: Rows to read before stopping, unlimited if None
+    """
+
+    def __init__(
+        self,
+        query: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_rows: Optional[int] = None,
+    ):
+        self.query = query
+        self.batch_size = batch_size
+        self.max_rows = max_rows
+        self.rows_read = 0
+        self.truncated = False
+
+    def __iter__(self) -> Iterator[dict]:
+        self.rows_read = 0
+        self.truncated = False
+
         with get_engine().connect() as connection:
-            query = params["query"]
-            result = connection.execute(query)
+            if SELECT_PATTERN.match(self.query):
+                connection = connection.execution_options(stream_results=True)
+
+            result = connection.execute(self.query)
+
+            if not result.returns_rows:
+                return
+
+            try:
+                while True:
+                    batch = result.fetchmany(self.batch_size)
+
+                    if not batch:
+                        return
+
+                    for row in batch:
+                        if (
+                            self.max_rows is not None
+                            and self.rows_read >= self.max_rows
+                        ):
+                            self.truncated = True
+                            return
+
+                        self.rows_read += 1
+                        # item[0] is column name
+                        # item[1] is column value
+                        # row.items() is list of tuples for the row
+                        yield {item[0]: item[1] for item in row.items()}
+            finally:
+                result.close()
+
+
+def action_params_problems(params: ActionParams) -> List[str]:
+    problems = []
+
+    if "query" not in params:
+        problems.append("Missing 'query' in action params")
+
+    if params.get("resultMode", "rows") not in RESULT_MODES:
+        problems.append(f"'resultMode' must be one of {RESULT_MODES}")
+
+    if params.get("batchSize", DEFAULT_BATCH_SIZE) < 1:
+        problems.append("'batchSize' must be at least 1")
+
+    return problems
+
+
+def get_query_rows(params: ActionParams) -> QueryRows:
+    return QueryRows(
+        query=params["query"],
+        batch_size=params.get("batchSize", DEFAULT_BATCH_SIZE),
+        max_rows=params.get("maxRows"),
+    )
+
+
+def get_rows_digest(rows: Iterable[dict]) -> str:
+    """
+    Hashes rows in order without keeping them in memory
+
+    Args:
+        rows: Rows to hash
+
+    Returns:
+        SHA-256 hex digest of rows
+    """
+    digest = hashlib.sha256()
+
+    for row in rows:
+        digest.update(json.dumps(row, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(b"\n")
+
+    return digest.hexdigest()
+
+
+def bulk_insert_params_problems(params: BulkInsertParams) -> List[str]:
+    problems = []
+
+    if "table" not in params:
+        problems.append("Missing 'table' in action params")
+
+    if ("rows" in params) == ("file" in params):
+        problems.append("Must specify one of 'rows' or 'file' in action params")
+
+    if "file" in params and not params["file"].endswith((".csv", ".jsonl")):
+        problems.append("'file' must be a .csv or .jsonl file")
+
+    if params.get("batchSize", DEFAULT_BATCH_SIZE) < 1:
+        problems.append("'batchSize' must be at least 1")
+
+    return problems
+
+
+def read_rows_file(path: str) -> Iterator[dict]:
+    """
+    Reads rows from a CSV file with a header or a JSONL file one row at a time
+
+    Args:
+        path: Path to file in runner
+
+    Returns:
+        Rows in file. Empty CSV values are returned as None
+    """
+    try:
+        rows_file = open(path, newline="")
+    except OSError as err:
+        raise ValueError(f"Unable to open rows file: {err}")
+
+    with rows_file:
+        if path.endswith(".csv"):
+            for row in csv.DictReader(rows_file):
+                yield {
+                    key: value if value != "" else None for key, value in row.items()
+                }
+        else:
+            for line in rows_file:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def get_batches(rows: Iterable[dict], batch_size: int) -> Iterator[List[dict]]:
+    rows_iterator = iter(rows)
+
+    while True:
+        batch = list(islice(rows_iterator, batch_size))
+
+        if not batch:
+            return
+
+        yield batch
+
+
+def prepare_value(value: Any) -> Any:
+    # JSON values are inserted as JSON strings
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+
+    return value
+
+
+def format_copy_value(value: Any) -> str:
+    # In COPY's CSV format, an unquoted empty value is NULL and a quoted one is an empty string
+    value = prepare_value(value)
+
+    if value is None:
+        return ""
+
+    if isinstance(value, bool):
+        return "true" if value else "false"
+
+    if isinstance(value, (int, float)):
+        return str(value)
+
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def copy_batch(
+    connection: engine.Connection, table: str, columns: List[str], batch: Rows
+):
+    """
+    Loads rows with PostgreSQL's COPY, which is much faster than inserting them one statement at a time
+
+    Args:
+        connection: Connection with open transaction
+        table: Quoted table name
+        columns: Quoted column names
+        batch: Rows to load
+    """
+    buffer = io.StringIO()
+
+    for row in batch:
+        buffer.write(
+            ",".join(format_copy_value(row.get(column)) for column in columns) + "\n"
+        )
+
+    buffer.seek(0)
+
+    cursor = connection.connection.cursor()
+
+    try:
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def run_bulk_insert(params: BulkInsertParams) -> BulkInsertResult:
+    """
+    Inserts rows in batches within a single transaction, using COPY for PostgreSQL and executemany for other
+    databases
+
+    Args:
+        params: Table and rows to insert
+
+    Returns:
+        Rows inserted and insert rate
+    """
+    params_problems = bulk_insert_params_problems(params)
+
+    if params_problems:
+        raise ValueError(f"Params invalid: {', '.join(params_problems)}")
+
+    if "file" in params:
+        rows = read_rows_file(params["file"])
     else:
+        rows = params["rows"]
+
+    batches = get_batches(rows, params.get("batchSize", DEFAULT_BATCH_SIZE))
+    first_batch = next(batches, [])
+    columns = params.get("columns") or (list(first_batch[0]) if first_batch else [])
+
+    inserted = 0
+    start = time.perf_counter()
+
+    with get_engine().connect() as connection, connection.begin():
+        preparer = connection.dialect.identifier_preparer
+        table = ".".join(preparer.quote(part) for part in params["table"].split("."))
+        quoted_columns = [preparer.quote(column) for column in columns]
+        column_set = set(columns)
+        use_copy = (
+            params.get("copy", True)
+            and connection.dialect.name == "postgresql"
+            and connection.dialect.driver == "psycopg2"
+        )
+        insert_statement = text(
+            f"INSERT INTO {table} ({', '.join(quoted_columns)}) "
+            f"VALUES ({', '.join(f':p{i}' for i in range(len(columns)))})"
+        )
+
+        for batch in chain([first_batch], batches) if first_batch else []:
+            for row in batch:
+                if not column_set.issuperset(row):
+                    raise ValueError(
+                        f"Row {row} has columns not in {columns}, no rows were inserted"
+                    )
+
+            if use_copy:
+                copy_batch(connection, table, quoted_columns, batch)
+            else:
+                connection.execute(
+                    insert_statement,
+                    [
+                        {
+                            f"p{i}": prepare_value(row.get(column))
+                            for i, column in enumerate(columns)
+                        }
+                        for row in batch
+                    ],
+                )
+
+            inserted += len(batch)
+
+    runtime = time.perf_counter() - start
+
+    return {
+        "inserted": inserted,
+        "runtime": runtime * 1000,
+        "rows_per_second": inserted / runtime if runtime else 0,
+    }
+
+
+# Compiled forms of transaction statements, shared between actions so repeated statements are only compiled once
+COMPILED_CACHE = LRUCache(100)
+
+
+@lru_cache(maxsize=100)
+def get_statement(query: str) -> TextClause:
+    return text(query)
+
+
+def transaction_params_problems(params: TransactionParams) -> List[str]:
+    problems = []
+
+    if not params.get("statements"):
+        problems.append("Missing 'statements' in action params")
+
+    for i, statement in enumerate(params.get("statements", [])):
+        if not isinstance(statement, dict) or "query" not in statement:
+            problems.append(f"Missing 'query' in statement {i}")
+
+    return problems
+
+
+def run_transaction(params: TransactionParams) -> TransactionResult:
+    """
+    Runs statements in order on one connection in a single transaction, which is rolled back if any statement fails
+
+    Args:
+        params: Statements with bind params. A list of params runs the statement once per item with executemany
+
+    Returns:
+        Rows returned and rows affected by each statement
+    """
+    params_problems = transaction_params_problems(params)
+
+    if params_problems:
+        raise ValueError(f"Params invalid: {', '.join(params_problems)}")
+
+    results = []
+    start = time.perf_counter()
+
+    with get_engine().connect() as connection, connection.begin():
+        connection = connection.execution_options(compiled_cache=COMPILED_CACHE)
+
+        for statement in params["statements"]:
+            bind_params = statement.get("params")
+            result = connection.execute(
+                get_statement(statement["query"]),
+                *([bind_params] if bind_params is not None else []),
+            )
+
+            try:
+                results.append(
+                    {
+                        "rows": [dict(row.items()) for row in result]
+                        if result.returns_rows
+                        else [],
+                        "rowcount": result.rowcount,
+                    }
+                )
+            finally:
+                result.close()
+
+    return {"results": results, "runtime": (time.perf_counter() - start) * 1000}
+
+
+def run_action(
+    action_type: str,
+    params: Union[ActionParams, BulkInsertParams, TransactionParams],
+) -> Union[ActionResult, BulkInsertResult, TransactionResult]:
+    # TODO: Error catching
+    if action_type == "BulkInsert":
+        return run_bulk_insert(params)
+
+    if action_type == "SQLTransaction":
+        return run_transaction(params)
+
+    if action_type != "SQLQuery":
         raise ValueError(f"Action type {action_type} is invalid")
 
-    if result.returns_rows:
-        # item[0] is column name
-        # item[1] is column value
-        # row.items() is list of tuples for the row
-        rows = [{item[0]: item[1] for item in row.items()} for row in result]
+    params_problems = action_params_problems(params)
+
+    if params_problems:
+        raise ValueError(f"Params invalid: {', '.join(params_problems)}")
+
+    result_mode = params.get("resultMode", "rows")
+    query_rows = get_query_rows(params)
+    rows = []
+    digest = None
+
+    if result_mode == "rows":
+        rows = list(query_rows)
+    elif result_mode == "digest":
+        digest = get_rows_digest(query_rows)
     else:
-        rows = []
+        for _ in query_rows:
+            pass
+
+    return {
+        "rows": rows,
+        "count": query_rows.rows_read,
+        "truncated": query_rows.truncated,
+        "digest": digest,
+    }
+
+
+# Lookups of (column names, column values) with the unmatched expected row IDs they index, and unhashable row IDs
+Candidates = Tuple[List[Tuple[Tuple[tuple, tuple], Set[int]]], List[int]]
+
+
+class RowIndex:
+    """
+    Index of expected rows, grouped by the columns each row specifies and keyed by the values of those columns, so
+    actual rows are matched by hash lookup instead of being compared with every expected row. Rows with values that
+    can not be hashed (such as JSON columns) are compared with assert_dicts instead
+
+    Each expected row is matched by at most one actual row. An actual row can match expected rows with different
+    columns, so when every row it matches is taken, the rows already matched are reassigned along an augmenting path
+    if possible. The number of rows matched is then always the most possible for the rows seen so far
+
+    Args:
+        expected_rows: Rows to find
+        exact: Actual rows must have exactly the same columns as the expected row instead of a superset
+    """
+
+    def __init__(self, expected_rows: List[dict], exact: bool = False):
+        self.exact = exact
+        self.expected_rows = expected_rows
+        # Sorted column names -> column values -> IDs of expected rows not matched yet
+        self.indexes: Dict[Tuple[str, ...], Dict[tuple, Set[int]]] = {}
+        # Rows with the same columns and values are interchangeable, so matched IDs are only kept to reassign them
+        self.matched_ids: Dict[Tuple[tuple, tuple], Set[int]] = {}
+        self.unhashable_ids: List[int] = []
+        # Expected row ID -> actual row ID, and the reverse
+        self.owners: Dict[int, int] = {}
+        self.assignments: Dict[int, int] = {}
+        # Matched actual row ID -> expected rows the actual row matches
+        self.candidates: Dict[int, Candidates] = {}
+        self.actual_count = 0
+        self.remaining = len(expected_rows)
+
+        for expected_id, expected_row in enumerate(expected_rows):
+            columns = tuple(sorted(expected_row))
+            key = tuple(expected_row[column] for column in columns)
+
+            try:
+                self.indexes.setdefault(columns, {}).setdefault(key, set()).add(
+                    expected_id
+                )
+            except TypeError:
+                self.unhashable_ids.append(expected_id)
+
+        # Actual rows can only match expected rows with different columns when not exact and the columns vary.
+        # Otherwise every row an actual row matches is interchangeable and reassigning can never help
+        self.can_reassign = (
+            not exact and len(self.indexes) + bool(self.unhashable_ids) > 1
+        )
+
+    def get_candidates(self, actual_row: dict) -> Candidates:
+        """
+        Finds the expected rows an actual row matches
+
+        Args:
+            actual_row: Row returned by query
 
-    return {"rows": rows}
+        Returns:
+            Column names and values with the unmatched row IDs they index, and IDs of unhashable rows
+        """
+        if self.exact:
+            columns_to_check = [tuple(sorted(actual_row))]
+        else:
+            columns_to_check = self.indexes
+
+        lookups = []
+
+        for columns in columns_to_check:
+            index = self.indexes.get(columns)
+
+            if not index or not all(column in actual_row for column in columns):
+                continue
+
+            key = tuple(actual_row[column] for column in columns)
+
+            try:
+                unmatched = index.get(key)
+            except TypeError:
+                continue
+
+            if unmatched is not None:
+                lookups.append(((columns, key), unmatched))
+
+        unhashable_ids = [
+            expected_id
+            for expected_id in self.unhashable_ids
+            if assert_dicts(
+                self.expected_rows[expected_id], actual_row, all_required=self.exact
+            )[0]
+        ]
+
+        return lookups, unhashable_ids
+
+    def take_unmatched(self, candidates: Candidates) -> Optional[int]:
+        lookups, unhashable_ids = candidates
+
+        for lookup_key, unmatched in lookups:
+            if unmatched:
+                expected_id = unmatched.pop()
+
+                if self.can_reassign:
+                    self.matched_ids.setdefault(lookup_key, set()).add(expected_id)
+
+                return expected_id
+
+        for expected_id in unhashable_ids:
+            if expected_id not in self.owners:
+                return expected_id
+
+        return None
+
+    def matched_candidates(self, candidates: Candidates) -> Iterator[int]:
+        lookups, unhashable_ids = candidates
+
+        for lookup_key, _ in lookups:
+            yield from self.matched_ids.get(lookup_key, ())
+
+        yield from (
+            expected_id for expected_id in unhashable_ids if expected_id in self.owners
+        )
+
+    def assign(self, actual_id: int, expected_id: int) -> Optional[int]:
+        previous_id = self.assignments.get(actual_id)
+        self.owners[expected_id] = actual_id
+        self.assignments[actual_id] = expected_id
+
+        return previous_id
+
+    def reassign(self, actual_id: int, candidates: Candidates) -> bool:
+        """
+        Searches breadth first for an augmenting path from the actual row through rows that are already matched to
+        an unmatched expected row, and shifts each actual row on the path to the next expected row
+
+        Args:
+            actual_id: ID of actual row that has no unmatched candidates
+            candidates: Candidates of actual row
+
+        Returns:
+            If a path was found
+        """
+        parents: Dict[int, int] = {}
+        queue = deque()
+
+        for matched_id in self.matched_candidates(candidates):
+            parents[matched_id] = actual_id
+            queue.append(self.owners[matched_id])
+
+        while queue:
+            current_id = queue.popleft()
+            expected_id = self.take_unmatched(self.candidates[current_id])
+
+            if expected_id is not None:
+                while current_id != actual_id:
+                    expected_id = self.assign(current_id, expected_id)
+                    current_id = parents[expected_id]
+
+                self.assign(actual_id, expected_id)
+
+                return True
+
+            for matched_id in self.matched_candidates(self.candidates[current_id]):
+                if matched_id not in parents:
+                    parents[matched_id] = current_id
+                    queue.append(self.owners[matched_id])
+
+        return False
+
+    def match(self, actual_row: dict) -> bool:
+        """
+        Matches the actual row with an expected row, reassigning previously matched actual rows if needed
+
+        Args:
+            actual_row: Row returned by query
+
+        Returns:
+            If one more expected row is matched
+        """
+        actual_id = self.actual_count
+        self.actual_count += 1
+        candidates = self.get_candidates(actual_row)
+        expected_id = self.take_unmatched(candidates)
+
+        if not self.can_reassign:
+            if expected_id is None:
+                return False
+
+            self.owners[expected_id] = actual_id
+        else:
+            if expected_id is not None:
+                self.assign(actual_id, expected_id)
+            elif not self.reassign(actual_id, candidates):
+                return False
+
+            # Only matched actual rows are reassigned, so only their candidates are kept
+            self.candidates[actual_id] = candidates
+
+        self.remaining -= 1
+
+        return True
+
+    def remaining_rows(self) -> List[dict]:
+        return [
+            expected_row
+            for expected_id, expected_row in enumerate(self.expected_rows)
+            if expected_id not in self.owners
+        ]
 
 
 def contains_rows(
-    expected_rows: List[dict], actual_rows: List[dict]
+    expected_rows: List[dict], actual_rows: Iterable[dict]
 ) -> Tuple[bool, str]:
-    remaining_rows = expected_rows[:]
+    row_index = RowIndex(expected_rows)
 
-    for actual_row in actual_rows:
-        for i, expected_row in enumerate(remaining_rows):
-            row_matches, _ = assert_dicts(expected_row, actual_row, all_required=False)
+    if row_index.remaining:
+        for actual_row in actual_rows:
+            row_index.match(actual_row)
 
-            if row_matches:
-                del remaining_rows[i]
+            if not row_index.remaining:
+                # Stop reading streamed rows once everything is found
+                break
 
-    if not remaining_rows:
+    if not row_index.remaining:
         passed = True
         description = "passed"
     else:
         passed = False
         # NOTE: may need better formatting
-        description = f"The following rows did not match any returned: {remaining_rows}"
+        description = f"The following rows did not match any returned: {row_index.remaining_rows()}"
 
     return passed, description
 
 
-def equals_rows(expected_rows: List[dict], actual_rows: List[dict]) -> Tuple[bool, str]:
+def equals_rows(
+    expected_rows: List[dict], actual_rows: List[dict], ordered: bool = True
+) -> Tuple[bool, str]:
     if len(expected_rows) != len(actual_rows):
         description = f"Expected {len(expected_rows)} rows, got {len(actual_rows)}"
 
         return False, description
 
+    if not ordered:
+        row_index = RowIndex(expected_rows, exact=True)
+        unexpected_rows = [
+            actual_row for actual_row in actual_rows if not row_index.match(actual_row)
+        ]
+
+        if unexpected_rows:
+            return (
+                False,
+                f"Expected rows {row_index.remaining_rows()}, got {unexpected_rows}",
+            )
+
+        return True, "passed"
+
     for expected_row, actual_row in zip(expected_rows, actual_rows):
         row_matches, description = assert_dicts(
             expected_row, actual_row, all_required=True
@@ -152,33 +883,235 @@ def assert_params_problems(params: AssertParams) -> List[str]:
     return problems
 
 
+# Mismatched rows to transfer back from the database when an assert is pushed down
+MAX_PUSHDOWN_MISMATCHES = 100
+
+
+def validate_assert_action(params: AssertParams):
+    if params["method"] != "SQLQuery":
+        raise ValueError(f"Action type {params['method']} is invalid")
+
+    params_problems = action_params_problems(params["actionParams"])
+
+    if params_problems:
+        raise ValueError(f"Params invalid: {', '.join(params_problems)}")
+
+
+def get_except_operator(dialect_name: str) -> str:
+    # EXCEPT ALL keeps duplicate rows, databases without it compare distinct rows
+    if dialect_name in ["postgresql", "mysql"]:
+        return "EXCEPT ALL"
+
+    return "EXCEPT"
+
+
+@contextmanager
+def expected_rows_table(
+    connection: engine.Connection,
+    query: str,
+    expected_rows: List[dict],
+    columns: Optional[List[str]] = None,
+) -> Iterator[Tuple[str, List[str]]]:
+    """
+    Loads expected rows into a temporary table with the same column types as the query's results
+
+    Args:
+        connection: Connection to create table with
+        query: Query to copy column types from
+        expected_rows: Rows to insert
+        columns: Columns of query to create, every column if None
+
+    Returns:
+        Quoted table name and names of the columns in the table
+    """
+    preparer = connection.dialect.identifier_preparer
+    table = preparer.quote(f"cicada_expected_{uuid4().hex[:12]}")
+
+    if columns is None:
+        selected_columns = "*"
+    else:
+        selected_columns = ", ".join(preparer.quote(column) for column in columns)
+
+    connection.execute(
+        f"CREATE TEMPORARY TABLE {table} AS "
+        f"SELECT {selected_columns} FROM ({query}) actual WHERE 1 = 0"
+    )
+
+    try:
+        empty_result = connection.execute(f"SELECT * FROM {table}")
+        table_columns = list(empty_result.keys())
+        empty_result.close()
+
+        for expected_row in expected_rows:
+            extra_columns = set(expected_row) - set(table_columns)
+
+            if extra_columns:
+                raise ValueError(
+                    f"Expected row {expected_row} has columns not returned by query: {sorted(extra_columns)}"
+                )
+
+        if expected_rows:
+            quoted_columns = ", ".join(
+                preparer.quote(column) for column in table_columns
+            )
+            bind_params = ", ".join(f":p{i}" for i in range(len(table_columns)))
+
+            connection.execute(
+                text(f"INSERT INTO {table} ({quoted_columns}) VALUES ({bind_params})"),
+                [
+                    {
+                        f"p{i}": expected_row.get(column)
+                        for i, column in enumerate(table_columns)
+                    }
+                    for expected_row in expected_rows
+                ],
+            )
+
+        yield table, table_columns
+    finally:
+        connection.execute(f"DROP TABLE {table}")
+
+
+def fetch_difference(
+    connection: engine.Connection, left: str, right: str, columns: List[str]
+) -> List[dict]:
+    """
+    Gets rows from the left source that are not in the right source, computed by the database
+
+    Args:
+        connection: Connection to query with
+        left: Table or parenthesized subquery with alias
+        right: Table or parenthesized subquery with alias
+        columns: Columns to compare
+
+    Returns:
+        Up to MAX_PUSHDOWN_MISMATCHES rows
+    """
+    preparer = connection.dialect.identifier_preparer
+    selected_columns = ", ".join(preparer.quote(column) for column in columns)
+    except_operator = get_except_operator(connection.dialect.name)
+
+    result = connection.execute(
+        f"SELECT {selected_columns} FROM {left} "
+        f"{except_operator} SELECT {selected_columns} FROM {right}"
+    )
+
+    try:
+        return [dict(row.items()) for row in result.fetchmany(MAX_PUSHDOWN_MISMATCHES)]
+    finally:
+        result.close()
+
+
+def run_pushdown_assert(assert_type: str, params: AssertParams) -> AssertResult:
+    """
+    Runs ContainsRows or EqualsRows by loading the expected rows into the database and querying for the difference
+    with EXCEPT, so only mismatched rows are transferred to the runner
+
+    Args:
+        assert_type: ContainsRows or EqualsRows
+        params: Assert params
+
+    Returns:
+        Result of assert
+    """
+    validate_assert_action(params)
+
+    if assert_type == "EqualsRows" and params.get("ordered") is True:
+        raise ValueError("EqualsRows can not check order when pushdown is enabled")
+
+    expected_rows = params["expected"].get("rows", [])
+    query = params["actionParams"]["query"].strip().rstrip(";")
+    actual_source = f"({query}) actual"
+
+    missing_rows = []
+    unexpected_rows = []
+
+    with get_engine().connect() as connection, connection.begin():
+        if assert_type == "ContainsRows":
+            # Expected rows only need to match the columns they specify
+            rows_by_columns: Dict[Tuple[str, ...], List[dict]] = {}
+
+            for expected_row in expected_rows:
+                rows_by_columns.setdefault(tuple(sorted(expected_row)), []).append(
+                    expected_row
+                )
+
+            for columns, rows in rows_by_columns.items():
+                with expected_rows_table(connection, query, rows, list(columns)) as (
+                    table,
+                    table_columns,
+                ):
+                    missing_rows.extend(
+                        fetch_difference(
+                            connection, table, actual_source, table_columns
+                        )
+                    )
+        elif assert_type == "EqualsRows":
+            with expected_rows_table(connection, query, expected_rows) as (
+                table,
+                table_columns,
+            ):
+                missing_rows = fetch_difference(
+                    connection, table, actual_source, table_columns
+                )
+                unexpected_rows = fetch_difference(
+                    connection, actual_source, table, table_columns
+                )
+        else:
+            raise ValueError(f"Assert type {assert_type} is invalid")
+
+    passed = not missing_rows and not unexpected_rows
+
+    if passed:
+        description = "passed"
+    elif assert_type == "ContainsRows":
+        description = f"The following rows did not match any returned: {missing_rows}"
+    else:
+        description = f"Expected rows {missing_rows}, got {unexpected_rows}"
+
+    return AssertResult(
+        passed=passed,
+        expected=str(expected_rows),
+        actual=f"{len(missing_rows)} missing rows, {len(unexpected_rows)} unexpected rows",
+        description=description,
+    )
+
+
 def run_assert(assert_type: str, params: AssertParams) -> AssertResult:
     params_problems = assert_params_problems(params)
 
     if params_problems:
         raise ValueError(f"Params invalid: {', '.join(params_problems)}")
 
-    action_response = run_action(params["method"], params["actionParams"])
+    if params.get("pushdown", False):
+        return run_pushdown_assert(assert_type, params)
+
     expected = params["expected"]
 
     if assert_type == "ContainsRows":
+        validate_assert_action(params)
+
         # NOTE: possibly validate that expected/action response has rows
         expected_rows = expected.get("rows", [])
-        actual_rows = action_response.get("rows", [])
+        # Rows are checked as they are streamed instead of loading the whole result
+        query_rows = get_query_rows(params["actionParams"])
 
-        passed, description = contains_rows(expected_rows, actual_rows)
+        passed, description = contains_rows(expected_rows, query_rows)
 
         return AssertResult(
             passed=passed,
             expected=str(expected_rows),
-            actual=str(actual_rows),
+            actual=f"{query_rows.rows_read} rows scanned",
             description=description,
         )
     elif assert_type == "EqualsRows":
+        action_response = run_action(params["method"], params["actionParams"])
         expected_rows = expected.get("rows", [])
         actual_rows = action_response.get("rows", [])
 
-        passed, description = equals_rows(expected_rows, actual_rows)
+        passed, description = equals_rows(
+            expected_rows, actual_rows, ordered=params.get("ordered", True)
+        )
 
         return AssertResult(
             passed=passed,
@@ -1,3 +1,11 @@
+import random
+from itertools import permutations
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+
 from cicada2.runners.sql_runner import runner
 
 
@@ -104,3 +112,484 @@ def test_equals_rows_failed():
         description
         == "Expected {'foo': 'alpha', 'fizz': 'bravo'}, got {'foo': 'bar', 'fizz': 'buzz'}"
     )
+
+
+@pytest.fixture
+def sqlite_engine():
+    engine = create_engine("sqlite://")
+    engine.execute("CREATE TABLE members (id INTEGER, name TEXT)")
+    engine.execute(
+        "INSERT INTO members VALUES "
+        + ", ".join(f"({i}, 'member-{i}')" for i in range(2500))
+    )
+
+    with patch("cicada2.runners.sql_runner.runner.ENGINE", engine):
+        yield engine
+
+
+def test_run_action_rows(sqlite_engine):
+    result = runner.run_action(
+        "SQLQuery", {"query": "SELECT * FROM members", "batchSize": 100}
+    )
+
+    assert len(result["rows"]) == 2500
+    assert result["rows"][0] == {"id": 0, "name": "member-0"}
+    assert result["count"] == 2500
+    assert not result["truncated"]
+
+
+def test_run_action_max_rows(sqlite_engine):
+    result = runner.run_action(
+        "SQLQuery", {"query": "SELECT * FROM members", "maxRows": 10}
+    )
+
+    assert len(result["rows"]) == 10
+    assert result["truncated"]
+
+
+def test_run_action_count(sqlite_engine):
+    result = runner.run_action(
+        "SQLQuery", {"query": "SELECT * FROM members", "resultMode": "count"}
+    )
+
+    assert result["rows"] == []
+    assert result["count"] == 2500
+
+
+def test_run_action_digest(sqlite_engine):
+    query = "SELECT * FROM members ORDER BY id"
+    result = runner.run_action("SQLQuery", {"query": query, "resultMode": "digest"})
+    rows = runner.run_action("SQLQuery", {"query": query})["rows"]
+
+    assert result["digest"] == runner.get_rows_digest(rows)
+    assert result["count"] == 2500
+
+
+def test_run_action_no_rows(sqlite_engine):
+    result = runner.run_action(
+        "SQLQuery", {"query": "UPDATE members SET name = 'foo' WHERE id = 1"}
+    )
+
+    assert result["rows"] == []
+    assert (
+        sqlite_engine.execute("SELECT name FROM members WHERE id = 1").scalar() == "foo"
+    )
+
+
+def test_run_action_invalid_params():
+    with pytest.raises(ValueError):
+        runner.run_action("SQLQuery", {"query": "SELECT 1", "resultMode": "all"})
+
+
+def test_run_assert_contains_rows_streamed(sqlite_engine):
+    result = runner.run_assert(
+        "ContainsRows",
+        {
+            "method": "SQLQuery",
+            "actionParams": {"query": "SELECT * FROM members ORDER BY id"},
+            "expected": {"rows": [{"id": 5}, {"name": "member-10"}]},
+        },
+    )
+
+    assert result["passed"]
+    # Stops reading once all expected rows are found
+    assert result["actual"] == "11 rows scanned"
+
+
+def test_contains_rows_duplicates():
+    expected_rows = [{"foo": "bar"}, {"foo": "bar"}]
+
+    passed, description = runner.contains_rows(expected_rows, [{"foo": "bar"}])
+
+    assert not passed
+    assert (
+        description == "The following rows did not match any returned: [{'foo': 'bar'}]"
+    )
+
+    passed, _ = runner.contains_rows(
+        expected_rows, [{"foo": "bar", "id": 1}, {"foo": "bar", "id": 2}]
+    )
+
+    assert passed
+
+
+def test_contains_rows_mixed_columns():
+    expected_rows = [{"foo": "bar"}, {"fizz": "buzz"}, {"foo": "alpha", "fizz": 1}]
+
+    actual_rows = [
+        {"foo": "alpha", "fizz": 1},
+        {"foo": "bar", "fizz": 2},
+        {"foo": "bravo", "fizz": "buzz"},
+    ]
+
+    passed, description = runner.contains_rows(expected_rows, actual_rows)
+
+    assert passed
+    assert description == "passed"
+
+
+def test_contains_rows_unhashable():
+    expected_rows = [{"tags": ["foo", "bar"]}, {"data": {"foo": "bar"}}]
+
+    actual_rows = [
+        {"id": 1, "tags": ["foo", "bar"]},
+        {"id": 2, "data": {"foo": "bar", "fizz": "buzz"}},
+    ]
+
+    passed, _ = runner.contains_rows(expected_rows, actual_rows)
+
+    assert passed
+
+
+def test_row_index_overlapping_columns():
+    row_index = runner.RowIndex([{"a": 1}, {"a": 1, "b": 2}])
+
+    assert [row_index.match(row) for row in [{"a": 1, "b": 2}, {"a": 1, "b": 3}]] == [
+        True,
+        True,
+    ]
+    assert row_index.remaining == 0
+
+
+def test_row_index_reassigns_same_size_columns():
+    # Both actual rows match the first expected row, so the first match has to be moved
+    row_index = runner.RowIndex([{"a": 1, "b": 2}, {"a": 1, "c": 3}])
+
+    assert row_index.match({"a": 1, "b": 2, "c": 3})
+    assert row_index.match({"a": 1, "b": 2, "c": 4})
+    assert row_index.remaining == 0
+    assert row_index.remaining_rows() == []
+
+
+def test_row_index_matches_most_possible():
+    rand = random.Random(0)
+
+    for _ in range(200):
+        expected_rows = [
+            {
+                column: rand.randint(0, 1)
+                for column in rand.sample("abc", rand.randint(1, 3))
+            }
+            for _ in range(rand.randint(1, 5))
+        ]
+        actual_rows = [
+            {column: rand.randint(0, 1) for column in "abc"}
+            for _ in range(rand.randint(0, 5))
+        ]
+        row_index = runner.RowIndex(expected_rows)
+        matched = sum(row_index.match(actual_row) for actual_row in actual_rows)
+
+        # Brute force the largest matching of actual rows to distinct expected rows
+        most_possible = max(
+            sum(
+                all(actual_rows[i].get(k) == v for k, v in expected_rows[j].items())
+                for i, j in enumerate(assignment)
+                if j is not None
+            )
+            for assignment in permutations(
+                list(range(len(expected_rows))) + [None] * len(actual_rows),
+                len(actual_rows),
+            )
+        )
+
+        assert matched == most_possible
+        assert row_index.remaining == len(expected_rows) - matched
+
+
+def test_equals_rows_unordered():
+    expected_rows = [{"foo": "bar", "fizz": "buzz"}, {"foo": "alpha", "fizz": "bravo"}]
+
+    actual_rows = [{"foo": "alpha", "fizz": "bravo"}, {"foo": "bar", "fizz": "buzz"}]
+
+    passed, description = runner.equals_rows(expected_rows, actual_rows, ordered=False)
+
+    assert passed
+    assert description == "passed"
+
+
+def test_equals_rows_unordered_failed():
+    expected_rows = [{"foo": "bar"}, {"foo": "bar"}]
+
+    actual_rows = [{"foo": "bar"}, {"foo": "bar", "fizz": "buzz"}]
+
+    passed, description = runner.equals_rows(expected_rows, actual_rows, ordered=False)
+
+    assert not passed
+    assert (
+        description
+        == "Expected rows [{'foo': 'bar'}], got [{'foo': 'bar', 'fizz': 'buzz'}]"
+    )
+
+
+def test_get_except_operator():
+    assert runner.get_except_operator("postgresql") == "EXCEPT ALL"
+    assert runner.get_except_operator("sqlite") == "EXCEPT"
+
+
+def test_run_assert_contains_rows_pushdown(sqlite_engine):
+    params = {
+        "method": "SQLQuery",
+        "actionParams": {"query": "SELECT * FROM members;"},
+        "expected": {
+            "rows": [{"id": 5}, {"id": 6, "name": "member-6"}, {"name": "member-7"}]
+        },
+        "pushdown": True,
+    }
+
+    result = runner.run_assert("ContainsRows", params)
+
+    assert result["passed"]
+    assert result["actual"] == "0 missing rows, 0 unexpected rows"
+
+    params["expected"]["rows"].append({"id": 5000, "name": "member-5000"})
+    result = runner.run_assert("ContainsRows", params)
+
+    assert not result["passed"]
+    assert (
+        result["description"]
+        == "The following rows did not match any returned: [{'id': 5000, 'name': 'member-5000'}]"
+    )
+    # Temporary tables are dropped
+    assert (
+        sqlite_engine.execute("SELECT COUNT(*) FROM sqlite_temp_master").scalar() == 0
+    )
+
+
+def test_run_assert_equals_rows_pushdown(sqlite_engine):
+    params = {
+        "method": "SQLQuery",
+        "actionParams": {"query": "SELECT * FROM members WHERE id < 3"},
+        "expected": {
+            "rows": [
+                {"id": 2, "name": "member-2"},
+                {"id": 1, "name": "member-1"},
+                {"id": 0, "name": "member-0"},
+            ]
+        },
+        "pushdown": True,
+    }
+
+    assert runner.run_assert("EqualsRows", params)["passed"]
+
+    params["expected"]["rows"][0] = {"id": 2, "name": "foo"}
+    result = runner.run_assert("EqualsRows", params)
+
+    assert not result["passed"]
+    assert (
+        result["description"]
+        == "Expected rows [{'id': 2, 'name': 'foo'}], got [{'id': 2, 'name': 'member-2'}]"
+    )
+
+
+def test_run_assert_pushdown_invalid(sqlite_engine):
+    params = {
+        "method": "SQLQuery",
+        "actionParams": {"query": "SELECT * FROM members"},
+        "expected": {"rows": [{"id": 1, "email": "foo@example.com"}]},
+        "pushdown": True,
+    }
+
+    with pytest.raises(ValueError):
+        runner.run_assert("EqualsRows", params)
+
+    with pytest.raises(ValueError):
+        runner.run_assert("EqualsRows", {**params, "ordered": True})
+
+
+def test_bulk_insert_params_problems():
+    problems = runner.bulk_insert_params_problems(
+        {"rows": [], "file": "rows.txt", "batchSize": 0}
+    )
+
+    assert problems == [
+        "Missing 'table' in action params",
+        "Must specify one of 'rows' or 'file' in action params",
+        "'file' must be a .csv or .jsonl file",
+        "'batchSize' must be at least 1",
+    ]
+
+
+def test_run_bulk_insert_rows(sqlite_engine):
+    rows = [{"id": i, "name": f"new-{i}"} for i in range(10_000, 10_250)]
+
+    result = runner.run_action(
+        "BulkInsert", {"table": "members", "rows": rows, "batchSize": 100}
+    )
+
+    assert result["inserted"] == 250
+    assert result["rows_per_second"] > 0
+    assert (
+        sqlite_engine.execute("SELECT COUNT(*) FROM members WHERE id >= 10000").scalar()
+        == 250
+    )
+
+
+def test_run_bulk_insert_files(sqlite_engine, tmp_path):
+    csv_file = tmp_path / "members.csv"
+    csv_file.write_text("id,name\n10000,csv-member\n10001,\n")
+    jsonl_file = tmp_path / "members.jsonl"
+    jsonl_file.write_text(
+        '{"id": 10002, "name": "jsonl-member"}\n\n{"id": 10003, "name": null}\n'
+    )
+
+    csv_result = runner.run_action(
+        "BulkInsert", {"table": "members", "file": str(csv_file)}
+    )
+    jsonl_result = runner.run_action(
+        "BulkInsert", {"table": "members", "file": str(jsonl_file)}
+    )
+
+    assert csv_result["inserted"] == 2
+    assert jsonl_result["inserted"] == 2
+    assert sqlite_engine.execute(
+        "SELECT id, name FROM members WHERE id >= 10000 ORDER BY id"
+    ).fetchall() == [
+        (10000, "csv-member"),
+        (10001, None),
+        (10002, "jsonl-member"),
+        (10003, None),
+    ]
+
+
+def test_run_bulk_insert_single_transaction(sqlite_engine):
+    rows = [{"id": 10_000, "name": "new"}, {"id": 10_001, "missing_column": "foo"}]
+
+    with pytest.raises(ValueError):
+        runner.run_action(
+            "BulkInsert", {"table": "members", "rows": rows, "batchSize": 1}
+        )
+
+    # First batch was rolled back when the second one failed
+    assert (
+        sqlite_engine.execute("SELECT COUNT(*) FROM members WHERE id >= 10000").scalar()
+        == 0
+    )
+
+
+def test_copy_batch():
+    connection = Mock()
+    cursor = connection.connection.cursor.return_value
+    copied = []
+    cursor.copy_expert.side_effect = lambda sql, buffer: copied.append(
+        (sql, buffer.read())
+    )
+
+    runner.copy_batch(
+        connection,
+        "members",
+        ["id", "name", "data"],
+        [{"id": 1, "name": "foo", "data": {"a": 1}}, {"id": 2, "name": None}],
+    )
+
+    assert copied == [
+        (
+            "COPY members (id, name, data) FROM STDIN WITH (FORMAT csv)",
+            '1,"foo","{""a"": 1}"\n2,,\n',
+        )
+    ]
+    cursor.close.assert_called_once()
+
+
+def test_get_pool_options():
+    with patch.dict(
+        "os.environ",
+        {
+            "RUNNER_POOLSIZE": "20",
+            "RUNNER_POOLRECYCLE": "300",
+            "RUNNER_POOLPREPING": "false",
+        },
+    ):
+        options = runner.get_pool_options("postgresql://user:pass@db:5432/db")
+        sqlite_options = runner.get_pool_options("sqlite://")
+
+    assert options == {
+        "pool_pre_ping": False,
+        "pool_recycle": 300,
+        "pool_size": 20,
+        "max_overflow": 10,
+    }
+    assert sqlite_options == {"pool_pre_ping": False, "pool_recycle": 300}
+
+
+def test_healthcheck_warms_pool_once():
+    with patch("cicada2.runners.sql_runner.runner.POOL_WARMED", False), patch(
+        "cicada2.runners.sql_runner.runner.ENGINE"
+    ) as engine, patch.dict("os.environ", {"RUNNER_POOLSIZE": "3"}):
+        assert runner.healthcheck()
+        assert runner.healthcheck()
+
+    assert engine.connect.call_count == 3
+    assert engine.connect.return_value.close.call_count == 3
+
+
+def test_healthcheck_database_unavailable():
+    with patch("cicada2.runners.sql_runner.runner.POOL_WARMED", False), patch(
+        "cicada2.runners.sql_runner.runner.ENGINE"
+    ) as engine:
+        engine.connect.side_effect = Exception("Connection refused")
+
+        assert runner.healthcheck()
+        assert not runner.POOL_WARMED
+
+
+def test_transaction_params_problems():
+    problems = runner.transaction_params_problems(
+        {"statements": [{"query": "SELECT 1"}, {"params": {}}]}
+    )
+
+    assert problems == ["Missing 'query' in statement 1"]
+    assert runner.transaction_params_problems({}) == [
+        "Missing 'statements' in action params"
+    ]
+
+
+def test_run_transaction(sqlite_engine):
+    result = runner.run_action(
+        "SQLTransaction",
+        {
+            "statements": [
+                {
+                    "query": "INSERT INTO members VALUES (:id, :name)",
+                    "params": [
+                        {"id": 10_000, "name": "foo"},
+                        {"id": 10_001, "name": "bar"},
+                    ],
+                },
+                {
+                    "query": "UPDATE members SET name = :name WHERE id = :id",
+                    "params": {"id": 10_001, "name": "baz"},
+                },
+                {"query": "SELECT * FROM members WHERE id >= 10000 ORDER BY id"},
+            ]
+        },
+    )
+
+    assert [
+        statement_result["rowcount"] for statement_result in result["results"][:2]
+    ] == [2, 1]
+    assert result["results"][0]["rows"] == []
+    assert result["results"][2]["rows"] == [
+        {"id": 10_000, "name": "foo"},
+        {"id": 10_001, "name": "baz"},
+    ]
+
+
+def test_run_transaction_rollback(sqlite_engine):
+    with pytest.raises(OperationalError):
+        runner.run_action(
+            "SQLTransaction",
+            {
+                "statements": [
+                    {
+                        "query": "INSERT INTO members VALUES (:id, :name)",
+                        "params": {"id": 10_000, "name": "foo"},
+                    },
+                    {"query": "INSERT INTO missing_table VALUES (1)"},
+                ]
+            },
+        )
+
+    assert (
+        sqlite_engine.execute("SELECT COUNT(*) FROM members WHERE id >= 10000").scalar()
+        == 0
+    )
@@ -0,0 +1,146 @@
+import json
+from typing import Any, List
+
+import msgpack
+from google.protobuf import json_format, struct_pb2
+
+from cicada2.protos import runner_pb2
+
+
+ENCODINGS = {
+    "json": runner_pb2.JSON,
+    "struct": runner_pb2.STRUCT,
+    "msgpack": runner_pb2.MSGPACK,
+}
+
+# Encodings besides JSON that runners advertise in healthchecks
+SUPPORTED_ENCODINGS: List[int] = [runner_pb2.STRUCT, runner_pb2.MSGPACK]
+
+
+def restore_ints(value: Any) -> Any:
+    """
+    Converts floats with integral values back to ints, since google.protobuf.Value stores every number as a double
+
+    Args:
+        value: Value decoded from a Struct
+
+    Returns:
+        Value with integral floats replaced by ints
+    """
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, dict):
+        return {key: restore_ints(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [restore_ints(item) for item in value]
+
+    return value
+
+
+def encode(value: Any, encoding: int) -> bytes:
+    """
+    Encodes a JSON compatible value into bytes
+
+    Args:
+        value: Value to encode
+        encoding: Encoding enum value from runner_pb2
+
+    Returns:
+        Encoded value
+    """
+    if encoding == runner_pb2.MSGPACK:
+        return msgpack.packb(value, use_bin_type=True)
+    if encoding == runner_pb2.STRUCT:
+        return json_format.ParseDict(value, struct_pb2.Value()).SerializeToString()
+
+    return json.dumps(value).encode("utf-8")
+
+
+def decode(data: bytes, encoding: int) -> Any:
+    """
+    Decodes bytes created by encode
+
+    Args:
+        data: Encoded value
+        encoding: Encoding enum value from runner_pb2
+
+    Returns:
+        Decoded value
+    """
+    if encoding == runner_pb2.MSGPACK:
+        return msgpack.unpackb(data, raw=False)
+    if encoding == runner_pb2.STRUCT:
+        value = struct_pb2.Value()
+        value.ParseFromString(data)
+
+        return restore_ints(json_format.MessageToDict(value))
+
+    return json.loads(data)
+
+
+def encode_params(params: Any, encoding: int) -> dict:
+    """
+    Creates the params fields of an action or assert request
+
+    Args:
+        params: Params of action or assert
+        encoding: Encoding enum value from runner_pb2
+
+    Returns:
+        Keyword arguments for request message
+    """
+    if encoding == runner_pb2.JSON:
+        return {"params": json.dumps(params)}
+
+    return {"encoding": encoding, "encoded_params": encode(params, encoding)}
+
+
+def decode_params(request) -> Any:
+    """
+    Gets params from an ActionRequest, ActionStreamRequest or AssertRequest
+
+    Args:
+        request: Request message sent by engine
+
+    Returns:
+        Decoded params
+    """
+    if request.encoding == runner_pb2.JSON:
+        return json.loads(request.params)
+
+    return decode(request.encoded_params, request.encoding)
+
+
+def create_action_reply(outputs: Any, encoding: int) -> runner_pb2.ActionReply:
+    """
+    Creates an ActionReply with outputs encoded the same way as the request
+
+    Args:
+        outputs: Outputs of action
+        encoding: Encoding enum value of request
+
+    Returns:
+        Reply to send to engine
+    """
+    if encoding == runner_pb2.JSON:
+        return runner_pb2.ActionReply(outputs=json.dumps(outputs))
+
+    return runner_pb2.ActionReply(
+        encoding=encoding, encoded_outputs=encode(outputs, encoding)
+    )
+
+
+def decode_action_reply(reply: runner_pb2.ActionReply) -> Any:
+    """
+    Gets outputs from an ActionReply
+
+    Args:
+        reply: Reply sent by runner
+
+    Returns:
+        Decoded outputs
+    """
+    if reply.encoding == runner_pb2.JSON:
+        return json.loads(reply.outputs)
+
+    return decode(reply.encoded_outputs, reply.encoding)
@@ -0,0 +1,214 @@
+import asyncio
+import signal
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from os import getenv
+from typing import Any, Callable, Optional
+
+import grpc
+
+from cicada2.protos import runner_pb2, runner_pb2_grpc
+from cicada2.shared.encoding import (
+    SUPPORTED_ENCODINGS,
+    create_action_reply,
+    decode_params,
+)
+from cicada2.shared.logs import get_logger
+
+
+LOGGER = get_logger("server")
+
+RUNNER_ADDRESS = "[::]:50051"
+
+
+def get_optional_int(env_var: str) -> Optional[int]:
+    value = getenv(env_var)
+
+    if value:
+        return int(value)
+
+    return None
+
+
+class RunnerServer(runner_pb2_grpc.RunnerServicer):
+    """
+    Serves a runner's actions and asserts with grpc.aio. The runner functions are blocking, so they are called in an
+    executor to keep the event loop free to accept other RPCs
+
+    Args:
+        run_action: Runner function taking action_type and params
+        run_assert: Runner function taking assert_type and params
+        executor: Executor to call runner functions in
+        healthcheck: Optional runner function returning if the runner is ready, such as after warming connections
+    """
+
+    def __init__(
+        self,
+        run_action: Callable[..., Any],
+        run_assert: Callable[..., dict],
+        executor: Executor,
+        healthcheck: Optional[Callable[[], bool]] = None,
+    ):
+        self.run_action = run_action
+        self.run_assert = run_assert
+        self.executor = executor
+        self.healthcheck = healthcheck
+
+    async def run_in_executor(self, fn: Callable, **kwargs):
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(self.executor, partial(fn, **kwargs))
+
+    async def Action(self, request, context):
+        try:
+            outputs = await self.run_in_executor(
+                self.run_action,
+                action_type=request.type,
+                params=decode_params(request),
+            )
+
+            return create_action_reply(outputs, request.encoding)
+        except ValueError as e:
+            await context.abort(code=grpc.StatusCode.INVALID_ARGUMENT, details=str(e))
+        except RuntimeError as e:
+            await context.abort(code=grpc.StatusCode.UNAVAILABLE, details=str(e))
+
+    async def ActionStream(self, request, context):
+        params = decode_params(request)
+
+        # Cancelled by grpc if the engine disconnects before the executions finish
+        for i in range(request.executions):
+            try:
+                outputs = await self.run_in_executor(
+                    self.run_action, action_type=request.type, params=params
+                )
+
+                yield create_action_reply(outputs, request.encoding)
+            except (ValueError, RuntimeError) as e:
+                yield runner_pb2.ActionReply(error=str(e))
+
+            if i != request.executions - 1:
+                await asyncio.sleep(request.seconds_between_executions)
+
+    async def Assert(self, request, context):
+        try:
+            result = await self.run_in_executor(
+                self.run_assert,
+                assert_type=request.type,
+                params=decode_params(request),
+            )
+
+            return runner_pb2.AssertReply(
+                passed=result["passed"],
+                expected=result.get("expected"),
+                actual=result.get("actual"),
+                description=result.get("description"),
+            )
+        except ValueError as e:
+            await context.abort(code=grpc.StatusCode.INVALID_ARGUMENT, details=str(e))
+        except RuntimeError as e:
+            await context.abort(code=grpc.StatusCode.UNAVAILABLE, details=str(e))
+
+    async def Healthcheck(self, request, context):
+        if self.healthcheck is None:
+            ready = True
+        else:
+            ready = await self.run_in_executor(self.healthcheck)
+
+        return runner_pb2.HealthcheckReply(ready=ready, encodings=SUPPORTED_ENCODINGS)
+
+
+def create_server(
+    run_action: Callable[..., Any],
+    run_assert: Callable[..., dict],
+    executor: Executor,
+    max_concurrent_rpcs: Optional[int] = None,
+    healthcheck: Optional[Callable[[], bool]] = None,
+) -> grpc.aio.Server:
+    """
+    Creates a grpc.aio server for a runner without starting it
+
+    Args:
+        run_action: Runner function taking action_type and params
+        run_assert: Runner function taking assert_type and params
+        executor: Executor to call runner functions in
+        max_concurrent_rpcs: RPCs to accept at once before rejecting with RESOURCE_EXHAUSTED, unlimited if None
+        healthcheck: Optional runner function returning if the runner is ready
+
+    Returns:
+        Runner server
+    """
+    server = grpc.aio.server(maximum_concurrent_rpcs=max_concurrent_rpcs)
+    runner_pb2_grpc.add_RunnerServicer_to_server(
+        RunnerServer(run_action, run_assert, executor, healthcheck), server
+    )
+
+    return server
+
+
+async def serve(
+    run_action: Callable[..., Any],
+    run_assert: Callable[..., dict],
+    address: str = RUNNER_ADDRESS,
+    max_workers: Optional[int] = None,
+    max_concurrent_rpcs: Optional[int] = None,
+    shutdown_grace: float = 5,
+    healthcheck: Optional[Callable[[], bool]] = None,
+):
+    """
+    Serves a runner until SIGTERM or SIGINT is received, then waits for running RPCs to finish
+
+    Args:
+        run_action: Runner function taking action_type and params
+        run_assert: Runner function taking assert_type and params
+        address: Address to listen on
+        max_workers: Threads to call runner functions in, uses ThreadPoolExecutor's default if None
+        max_concurrent_rpcs: RPCs to accept at once before rejecting with RESOURCE_EXHAUSTED, unlimited if None
+        shutdown_grace: Seconds to wait for running RPCs to finish before cancelling them
+        healthcheck: Optional runner function returning if the runner is ready
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    server = create_server(
+        run_action, run_assert, executor, max_concurrent_rpcs, healthcheck
+    )
+    server.add_insecure_port(address)
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    for sig in [signal.SIGTERM, signal.SIGINT]:
+        loop.add_signal_handler(sig, stop_event.set)
+
+    await server.start()
+    LOGGER.info("Runner listening on %s", address)
+
+    await stop_event.wait()
+
+    LOGGER.info("Shutting down runner")
+    await server.stop(shutdown_grace)
+    executor.shutdown(wait=True)
+
+
+def run_server(
+    run_action: Callable[..., Any],
+    run_assert: Callable[..., dict],
+    healthcheck: Optional[Callable[[], bool]] = None,
+):
+    """
+    Serves a runner using the server settings from the runner's config
+
+    Args:
+        run_action: Runner function taking action_type and params
+        run_assert: Runner function taking assert_type and params
+        healthcheck: Optional runner function returning if the runner is ready
+    """
+    asyncio.run(
+        serve(
+            run_action,
+            run_assert,
+            max_workers=get_optional_int("RUNNER_MAXWORKERS"),
+            max_concurrent_rpcs=get_optional_int("RUNNER_MAXCONCURRENTRPCS"),
+            shutdown_grace=float(getenv("RUNNER_SHUTDOWNGRACE", "5")),
+            healthcheck=healthcheck,
+        )
+    )
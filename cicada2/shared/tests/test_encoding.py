@@ -0,0 +1,63 @@
+from cicada2.protos import runner_pb2
+from cicada2.shared import encoding
+
+
+VALUE = {"foo": "bar", "list": [1, 2.5, True, None], "nested": {"fizz": "buzz"}}
+
+
+def test_encode_json():
+    encoded = encoding.encode(VALUE, runner_pb2.JSON)
+
+    assert encoding.decode(encoded, runner_pb2.JSON) == VALUE
+
+
+def test_encode_msgpack():
+    value = {**VALUE, "bytes": b"\x00\x01"}
+    encoded = encoding.encode(value, runner_pb2.MSGPACK)
+
+    assert encoding.decode(encoded, runner_pb2.MSGPACK) == value
+
+
+def test_encode_struct():
+    encoded = encoding.encode(VALUE, runner_pb2.STRUCT)
+
+    assert encoding.decode(encoded, runner_pb2.STRUCT) == VALUE
+
+
+def test_encode_struct_ints():
+    value = {"concurrency": 5, "nested": [{"batchSize": 100}], "rate": 2.5}
+    decoded = encoding.decode(
+        encoding.encode(value, runner_pb2.STRUCT), runner_pb2.STRUCT
+    )
+
+    assert decoded == value
+    assert type(decoded["concurrency"]) is int
+    assert type(decoded["nested"][0]["batchSize"]) is int
+    assert type(decoded["rate"]) is float
+
+
+def test_encode_params_json():
+    request = runner_pb2.ActionRequest(
+        type="POST", **encoding.encode_params(VALUE, runner_pb2.JSON)
+    )
+
+    assert request.encoding == runner_pb2.JSON
+    assert request.encoded_params == b""
+    assert encoding.decode_params(request) == VALUE
+
+
+def test_encode_params_msgpack():
+    request = runner_pb2.AssertRequest(
+        type="StatusCode", **encoding.encode_params(VALUE, runner_pb2.MSGPACK)
+    )
+
+    assert request.params == ""
+    assert encoding.decode_params(request) == VALUE
+
+
+def test_action_reply():
+    for reply_encoding in [runner_pb2.JSON, runner_pb2.STRUCT, runner_pb2.MSGPACK]:
+        reply = encoding.create_action_reply(VALUE, reply_encoding)
+
+        assert reply.encoding == reply_encoding
+        assert encoding.decode_action_reply(reply) == VALUE
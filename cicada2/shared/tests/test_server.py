@@ -0,0 +1,204 @@
+import asyncio
+import json
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import grpc
+from google.protobuf.empty_pb2 import Empty
+
+from cicada2.protos import runner_pb2, runner_pb2_grpc
+from cicada2.shared import server
+
+
+def run_action(action_type, params):
+    if action_type == "Invalid":
+        raise ValueError("Invalid action")
+
+    time.sleep(params.get("seconds", 0))
+
+    return {"type": action_type, "params": params}
+
+
+def run_assert(assert_type, params):
+    if assert_type == "Unavailable":
+        raise RuntimeError("Service unavailable")
+
+    return {"passed": params["passed"], "description": "passed"}
+
+
+def run_with_server(test_fn, max_workers=2, max_concurrent_rpcs=None, healthcheck=None):
+    async def run():
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        runner_server = server.create_server(
+            run_action, run_assert, executor, max_concurrent_rpcs, healthcheck
+        )
+        port = runner_server.add_insecure_port("localhost:0")
+        await runner_server.start()
+
+        try:
+            async with grpc.aio.insecure_channel(f"localhost:{port}") as channel:
+                return await test_fn(runner_pb2_grpc.RunnerStub(channel))
+        finally:
+            await runner_server.stop(None)
+            executor.shutdown()
+
+    return asyncio.run(run())
+
+
+def test_action():
+    async def test_fn(stub):
+        return await stub.Action(
+            runner_pb2.ActionRequest(type="GET", params=json.dumps({"foo": "bar"}))
+        )
+
+    response = run_with_server(test_fn)
+
+    assert json.loads(response.outputs) == {"type": "GET", "params": {"foo": "bar"}}
+
+
+def test_action_invalid():
+    async def test_fn(stub):
+        try:
+            await stub.Action(runner_pb2.ActionRequest(type="Invalid", params="{}"))
+        except grpc.aio.AioRpcError as err:
+            return err
+
+    err = run_with_server(test_fn)
+
+    assert err.code() == grpc.StatusCode.INVALID_ARGUMENT
+    assert err.details() == "Invalid action"
+
+
+def test_actions_run_concurrently():
+    async def test_fn(stub):
+        request = runner_pb2.ActionRequest(
+            type="GET", params=json.dumps({"seconds": 0.5})
+        )
+
+        start = time.monotonic()
+        await asyncio.gather(stub.Action(request), stub.Action(request))
+
+        return time.monotonic() - start
+
+    assert run_with_server(test_fn) < 0.9
+
+
+def test_action_stream():
+    async def test_fn(stub):
+        request = runner_pb2.ActionStreamRequest(
+            type="GET", params="{}", executions=3, seconds_between_executions=0.1
+        )
+
+        start = time.monotonic()
+        responses = [response async for response in stub.ActionStream(request)]
+
+        return responses, time.monotonic() - start
+
+    responses, runtime = run_with_server(test_fn)
+
+    assert len(responses) == 3
+    assert json.loads(responses[0].outputs) == {"type": "GET", "params": {}}
+    assert 0.2 <= runtime < 1
+
+
+def test_action_stream_error():
+    async def test_fn(stub):
+        request = runner_pb2.ActionStreamRequest(
+            type="Invalid", params="{}", executions=2
+        )
+
+        return [response async for response in stub.ActionStream(request)]
+
+    responses = run_with_server(test_fn)
+
+    assert [response.error for response in responses] == ["Invalid action"] * 2
+
+
+def test_assert():
+    async def test_fn(stub):
+        return await stub.Assert(
+            runner_pb2.AssertRequest(type="Equals", params=json.dumps({"passed": True}))
+        )
+
+    response = run_with_server(test_fn)
+
+    assert response.passed
+    assert response.description == "passed"
+
+
+def test_assert_unavailable():
+    async def test_fn(stub):
+        try:
+            await stub.Assert(runner_pb2.AssertRequest(type="Unavailable", params="{}"))
+        except grpc.aio.AioRpcError as err:
+            return err
+
+    err = run_with_server(test_fn)
+
+    assert err.code() == grpc.StatusCode.UNAVAILABLE
+
+
+def test_healthcheck():
+    async def test_fn(stub):
+        return await stub.Healthcheck(Empty())
+
+    response = run_with_server(test_fn)
+
+    assert response.ready
+    assert list(response.encodings) == server.SUPPORTED_ENCODINGS
+
+
+def test_healthcheck_runner_not_ready():
+    async def test_fn(stub):
+        return await stub.Healthcheck(Empty())
+
+    response = run_with_server(test_fn, healthcheck=lambda: False)
+
+    assert not response.ready
+
+
+def test_max_concurrent_rpcs():
+    async def test_fn(stub):
+        request = runner_pb2.ActionRequest(
+            type="GET", params=json.dumps({"seconds": 0.3})
+        )
+
+        return await asyncio.gather(
+            stub.Action(request), stub.Action(request), return_exceptions=True
+        )
+
+    responses = run_with_server(test_fn, max_concurrent_rpcs=1)
+    errors = [response for response in responses if isinstance(response, grpc.RpcError)]
+
+    assert len(errors) == 1
+    assert errors[0].code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+
+
+def test_serve_graceful_shutdown():
+    async def run():
+        serve_task = asyncio.ensure_future(
+            server.serve(run_action, run_assert, address="localhost:50151")
+        )
+        await asyncio.sleep(0.2)
+
+        async with grpc.aio.insecure_channel("localhost:50151") as channel:
+            stub = runner_pb2_grpc.RunnerStub(channel)
+            action_call = stub.Action(
+                runner_pb2.ActionRequest(
+                    type="GET", params=json.dumps({"seconds": 0.3})
+                )
+            )
+            await asyncio.sleep(0.1)
+
+            os.kill(os.getpid(), signal.SIGTERM)
+            response = await action_call
+
+        await asyncio.wait_for(serve_task, timeout=5)
+
+        return response
+
+    response = asyncio.run(run())
+
+    assert json.loads(response.outputs)["params"] == {"seconds": 0.3}
@@ -0,0 +1,20 @@
+from cicada2.shared import util
+
+
+def test_percentile():
+    values = list(range(1, 101))
+
+    assert util.percentile(values, 50) == 50
+    assert util.percentile(values, 99) == 99
+    assert util.percentile([5], 90) == 5
+
+
+def test_percentile_rounds_rank_up():
+    assert util.percentile([1, 2, 3, 4, 5], 50) == 3
+    assert util.percentile([1, 2, 3, 4, 5], 0) == 1
+    assert util.percentile(list(range(1, 151)), 99) == 149
+    assert util.percentile(list(range(1, 151)), 100) == 150
+
+
+def test_get_latency_stats_empty():
+    assert util.get_latency_stats([]) is None
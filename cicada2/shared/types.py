@@ -27,6 +27,15 @@ class AssertResult(TypedDict):
     description: Optional[str]
 
 
+class LatencyStats(TypedDict):
+    min: float
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+    max: float
+
+
 class Output(TypedDict):
     name: str
     # isGlobal: Optional[bool]
@@ -97,6 +106,7 @@ class TestSummary(TypedDict):
     error: Optional[str]
     duration: int
     filename: str
+    runner_startup_times: Optional[List[float]]
 
 
 class FileTestsConfig(TypedDict):
@@ -1,5 +1,55 @@
+import math
 from datetime import datetime
+from typing import List, Optional
+
+from cicada2.shared.types import LatencyStats
 
 
 def get_runtime_ms(start: datetime, end: datetime) -> int:
     return int((end - start).seconds * 1000 + (end - start).microseconds / 1000)
+
+
+def get_elapsed_ms(start_ns: int, end_ns: int) -> float:
+    """
+    Converts a pair of time.perf_counter_ns readings to milliseconds
+
+    Args:
+        start_ns: Reading at start
+        end_ns: Reading at end
+
+    Returns:
+        Milliseconds between readings
+    """
+    return (end_ns - start_ns) / 1e6
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """
+    Gets a percentile of sorted values using the nearest rank method
+
+    Args:
+        sorted_values: Values in ascending order
+        percent: Percentile from 0 to 100
+
+    Returns:
+        Value at percentile
+    """
+    rank = max(math.ceil(percent / 100 * len(sorted_values)), 1)
+
+    return sorted_values[rank - 1]
+
+
+def get_latency_stats(latencies: List[float]) -> Optional[LatencyStats]:
+    if not latencies:
+        return None
+
+    sorted_latencies = sorted(latencies)
+
+    return {
+        "min": sorted_latencies[0],
+        "mean": sum(sorted_latencies) / len(sorted_latencies),
+        "p50": percentile(sorted_latencies, 50),
+        "p90": percentile(sorted_latencies, 90),
+        "p99": percentile(sorted_latencies, 99),
+        "max": sorted_latencies[-1],
+    }